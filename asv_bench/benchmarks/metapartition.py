@@ -9,6 +9,7 @@ import numpy as np
 import pandas as pd
 
 from kartothek.core.common_metadata import make_meta
+from kartothek.core.urlencode import quote_array
 from kartothek.io_components.metapartition import MetaPartition
 
 from .config import AsvBenchmarkConfig
@@ -56,3 +57,52 @@ class TimeMetaPartition(AsvBenchmarkConfig):
             categories={"table": ["primary_key"]},
             date_as_object=False,
         )
+
+
+class TimePartitionOn(AsvBenchmarkConfig):
+    params = ([10 ** 5, 10 ** 6], [10, 1000])
+    param_names = ["num_rows", "num_partitions"]
+
+    def setup(self, num_rows, num_partitions):
+        df = pd.DataFrame(
+            {
+                "partition": np.arange(num_rows) % num_partitions,
+                "location": "Ünïcode/Lösung",
+                "value": np.arange(num_rows),
+            }
+        )
+        self.mp = MetaPartition(
+            label="base_label", data={"table": df}, metadata_version=4
+        )
+        self.values = df["partition"].values
+
+    def time_partition_on(self, num_rows, num_partitions):
+        self.mp.partition_on(["location", "partition"])
+
+    def time_quote_array(self, num_rows, num_partitions):
+        quote_array(self.values)
+
+
+class PeakMemMetaPartition(AsvBenchmarkConfig):
+    params = [10 ** 5, 10 ** 6]
+    param_names = ["num_partitions"]
+
+    def setup(self, num_partitions):
+        self.table_meta = {
+            "core": make_meta(pd.DataFrame({"P": [1], "value": [1.0]}), origin="core")
+        }
+        self.labels = ["P={}/part_{}".format(i % 100, i) for i in range(num_partitions)]
+
+    def peakmem_dispatch(self, num_partitions):
+        # Mimics the planning of a dataset, where all MetaPartitions share the
+        # dataset level metadata
+        self.mps = [
+            MetaPartition(
+                label=label,
+                files={"core": "uuid/core/{}.parquet".format(label)},
+                metadata_version=4,
+                table_meta=self.table_meta,
+                partition_keys=["P"],
+            )
+            for label in self.labels
+        ]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+# Write the benchmarking functions here.
+# See "Writing benchmarks" in the asv docs for more information.
+
+
+from kartothek.core.partition import LazyPartitions, Partition
+
+from .config import AsvBenchmarkConfig
+
+
+class PeakMemPartition(AsvBenchmarkConfig):
+    params = [10 ** 5, 10 ** 6]
+    param_names = ["num_partitions"]
+
+    def setup(self, num_partitions):
+        self.files = {
+            "P={}/part_{}".format(i % 100, i): {
+                "files": {"core": "uuid/core/P={}/part_{}.parquet".format(i % 100, i)}
+            }
+            for i in range(num_partitions)
+        }
+
+    def peakmem_partitions(self, num_partitions):
+        self.partitions = [
+            Partition(label, files=dct["files"]) for label, dct in self.files.items()
+        ]
+
+    def peakmem_lazy_partitions(self, num_partitions):
+        partitions = LazyPartitions(self.files)
+        self.partitions = [partitions[label] for label in partitions]
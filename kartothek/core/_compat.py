@@ -16,3 +16,9 @@ def load_json(buf, **kwargs):
         return simplejson.loads(buf.decode("utf-8"), **kwargs)
     else:
         return simplejson.loads(buf, **kwargs)
+
+
+try:
+    from collections.abc import Mapping, MutableMapping  # noqa: F401
+except ImportError:  # pragma: no cover
+    from collections import Mapping, MutableMapping  # noqa: F401
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers to issue independent I/O requests concurrently.
+
+Reading the metadata of a dataset requires a couple of small, independent requests
+(table schemas, external indices) whose runtime on object stores is dominated by
+latency. These are issued on a bounded thread pool. Listing the keys of large
+datasets is split into shards along the directory structure which are listed
+concurrently as well.
+
+The number of threads can be limited via ``MAX_CONCURRENT_REQUESTS``. Setting it to
+``1`` issues all requests sequentially in the calling thread.
+"""
+
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+KEY_DELIMITER = "/"
+
+MAX_CONCURRENT_REQUESTS = 8
+
+
+def map_concurrently(func, items, max_workers=None):
+    """
+    Apply ``func`` to all ``items`` on a bounded thread pool.
+
+    The results are returned in the order of ``items``. If calls fail, the
+    exception of the first failing item (in the order of ``items``) is raised,
+    independent of the order in which the calls finished.
+
+    Parameters
+    ----------
+    func: callable
+    items: Iterable
+    max_workers: int, optional
+        Maximum number of threads. Defaults to ``MAX_CONCURRENT_REQUESTS``.
+
+    Returns
+    -------
+    list
+    """
+    items = list(items)
+    if max_workers is None:
+        max_workers = MAX_CONCURRENT_REQUESTS
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(item) for item in items]
+
+    pool = ThreadPool(min(max_workers, len(items)))
+    try:
+        async_results = [pool.apply_async(func, (item,)) for item in items]
+        return [async_result.get() for async_result in async_results]
+    finally:
+        pool.terminate()
+
+
+def imap_concurrently(func, items, max_workers=None):
+    """
+    Lazy variant of :func:`map_concurrently`.
+
+    The results are yielded in the order of ``items`` as soon as they are available,
+    so the consumer can already process the first results while the remaining calls
+    are still running.
+    """
+    items = list(items)
+    if max_workers is None:
+        max_workers = MAX_CONCURRENT_REQUESTS
+    if len(items) <= 1 or max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    pool = ThreadPool(min(max_workers, len(items)))
+    try:
+        for result in pool.imap(func, items):
+            yield result
+    finally:
+        pool.terminate()
+
+
+def iter_prefetched(func, items, prefetch):
+    """
+    Lazily apply ``func`` to ``items`` while computing up to ``prefetch`` results ahead.
+
+    While the consumer processes a result, the calls for the next ``prefetch`` items
+    run in background threads. At most ``prefetch + 1`` results are held at any time
+    and ``items`` is only consumed as far as needed. The results are yielded in the
+    order of ``items`` and an exception is raised when its item is reached. If the
+    consumer stops early, no further calls are started.
+
+    Parameters
+    ----------
+    func: callable
+    items: Iterable
+    prefetch: int
+        Number of results to compute ahead. ``0`` disables prefetching.
+
+    Returns
+    -------
+    Iterator
+    """
+    if prefetch < 1:
+        for item in items:
+            yield func(item)
+        return
+
+    items = iter(items)
+    pool = ThreadPool(prefetch)
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.apply_async(func, (item,)))
+            if len(pending) > prefetch:
+                break
+        while pending:
+            yield pending.popleft().get()
+            for item in items:
+                pending.append(pool.apply_async(func, (item,)))
+                break
+    finally:
+        pool.terminate()
+
+
+def iter_keys_sharded(store, prefixes, depth=1, max_workers=None):
+    """
+    Iterate over all keys below the given directory prefixes.
+
+    Every prefix is split into shards by descending ``depth`` levels of the directory
+    structure (using ``store.iter_prefixes``). The shards are then listed
+    concurrently. Stores which do not support ``iter_prefixes`` are listed per prefix.
+
+    Parameters
+    ----------
+    store: simplekv.KeyValueStore
+    prefixes: Iterable[str]
+        Prefixes ending with ``/``.
+    depth: int
+        Number of directory levels below the prefixes which are used to shard the
+        listing.
+    max_workers: int, optional
+        Maximum number of concurrent requests.
+
+    Returns
+    -------
+    Iterator[str]
+        The keys in sorted order.
+    """
+    shards = sorted(prefixes)
+    if not hasattr(store, "iter_prefixes"):
+        depth = 0
+
+    def _expand(shard):
+        if not shard.endswith(KEY_DELIMITER):
+            return [shard]
+        return sorted(store.iter_prefixes(KEY_DELIMITER, prefix=shard))
+
+    def _list(shard):
+        if not shard.endswith(KEY_DELIMITER):
+            return [shard]
+        return sorted(store.iter_keys(prefix=shard))
+
+    for _ in range(depth):
+        expanded = map_concurrently(_expand, shards, max_workers=max_workers)
+        shards = [shard for sub_shards in expanded for shard in sub_shards]
+
+    # The shards do not overlap and are sorted, so sorting within every shard results
+    # in an overall sorted output.
+    for keys in imap_concurrently(_list, shards, max_workers=max_workers):
+        for key in keys:
+            yield key
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only commit log for the dataset metadata.
+
+Datasets which opt into the commit log (see ``checkpoint_interval``) are stored as
+a regular metadata snapshot plus small commit files. Every update writes a commit
+file holding the added and removed partitions, the index references and the
+dataset metadata instead of rewriting the whole snapshot. Readers replay all
+commits which are newer than the snapshot. Every ``checkpoint_interval`` commits,
+a new snapshot is written.
+
+The snapshot references the log as
+
+.. code::
+
+    "commit_log": {"checkpoint_interval": 10, "snapshot": 20}
+
+and the commits are stored as ``<uuid>.by-dataset-metadata.commit.<commit>.json``.
+"""
+
+from collections import OrderedDict
+
+import simplejson
+import six
+
+from kartothek.core import naming
+from kartothek.core._compat import load_json
+from kartothek.core.partition import CopyOnWritePartitions, Partition
+
+INDEX_METADATA_KEYS = ["indices", "minmax_indices", "composite_indices"]
+
+
+def create_commit_log(checkpoint_interval, commit=0):
+    """
+    Create the in-memory state of a commit log.
+
+    Parameters
+    ----------
+    checkpoint_interval: int
+        Number of commits after which a new snapshot is written.
+    commit: int
+        The number of the latest commit.
+    """
+    if checkpoint_interval < 1:
+        raise ValueError("The checkpoint interval needs to be a positive integer")
+    return {
+        "checkpoint_interval": checkpoint_interval,
+        "snapshot": commit,
+        "commit": commit,
+    }
+
+
+def commit_log_to_dict(commit_log):
+    """
+    Render the commit log state for a snapshot which includes all commits so far.
+    """
+    return OrderedDict(
+        [
+            ("checkpoint_interval", commit_log["checkpoint_interval"]),
+            ("snapshot", commit_log["commit"]),
+        ]
+    )
+
+
+def needs_checkpoint(commit_log):
+    """
+    Whether the next commit should be written as a new snapshot.
+    """
+    return (
+        commit_log["commit"] + 1 - commit_log["snapshot"]
+        >= commit_log["checkpoint_interval"]
+    )
+
+
+def render_commit(commit, dataset_builder, add_partitions, remove_partitions):
+    """
+    Render a commit file.
+
+    Parameters
+    ----------
+    commit: int
+        The number of the commit.
+    dataset_builder: kartothek.core.dataset.DatasetMetadataBuilder
+        The dataset after the commit. Only the index references, the dataset metadata
+        and the partition keys are taken from it.
+    add_partitions: Dict[str, kartothek.core.partition.Partition]
+        The partitions added by the commit.
+    remove_partitions: List[str]
+        The labels of the partitions removed by the commit.
+
+    Returns
+    -------
+    storage_key: str
+    commit: bytes
+    """
+    dct = OrderedDict([("commit", commit)])
+    dct["add_partitions"] = OrderedDict(
+        (label, partition.to_dict())
+        for label, partition in six.iteritems(add_partitions)
+    )
+    dct["remove_partitions"] = list(remove_partitions)
+    dct.update(dataset_builder.indices_to_dict())
+    dct["metadata"] = dataset_builder.metadata
+    dct["partition_keys"] = dataset_builder.partition_keys
+    return (
+        naming.metadata_commit_key_from_uuid(dataset_builder.uuid, commit),
+        simplejson.dumps(dct).encode("utf-8"),
+    )
+
+
+def list_commits(store, dataset_uuid):
+    """
+    List the commit files of a dataset.
+
+    Returns
+    -------
+    commits: List[Tuple[int, str]]
+        The commit numbers and storage keys, ordered by commit number.
+    """
+    prefix = naming.metadata_commit_prefix_from_uuid(dataset_uuid)
+    commits = []
+    for key in store.iter_keys(prefix=prefix):
+        if not key.endswith(naming.METADATA_FORMAT_JSON):
+            continue
+        commit = key[len(prefix) : -len(naming.METADATA_FORMAT_JSON)]
+        if commit.isdigit():
+            commits.append((int(commit), key))
+    return sorted(commits)
+
+
+def delete_commits(store, dataset_uuid, up_to=None):
+    """
+    Delete the commit files of a dataset whose number is at most ``up_to``.
+    """
+    for commit, key in list_commits(store, dataset_uuid):
+        if up_to is None or commit <= up_to:
+            store.delete(key)
+
+
+def replay_commits(dct, store):
+    """
+    Apply all commits which are newer than the snapshot to the loaded metadata
+    dictionary.
+
+    Parameters
+    ----------
+    dct: dict
+        The loaded snapshot. The ``partitions`` are either the decoded partitions
+        dictionary or a mapping of labels to ``Partition`` objects.
+    store: Object
+        Object that implements the .get and .iter_keys method for file/object loading.
+
+    Returns
+    -------
+    dct: dict
+        The metadata including the commits and the in-memory commit log state
+    """
+    dct = OrderedDict(dct)
+    commit_log = dct[naming.COMMIT_LOG_KEY]
+    commit_log = create_commit_log(
+        commit_log["checkpoint_interval"], commit_log["snapshot"]
+    )
+    dct[naming.COMMIT_LOG_KEY] = commit_log
+
+    commits = [
+        (commit, key)
+        for commit, key in list_commits(store, dct[naming.UUID_KEY])
+        if commit > commit_log["snapshot"]
+    ]
+    if not commits:
+        return dct
+
+    partitions = dct.get("partitions", {})
+    raw_partitions = isinstance(partitions, dict)
+    if raw_partitions:
+        partitions = OrderedDict(partitions)
+    else:
+        partitions = CopyOnWritePartitions(partitions)
+
+    for commit, key in commits:
+        commit_dct = load_json(store.get(key))
+        for label, part_dct in six.iteritems(commit_dct["add_partitions"]):
+            if raw_partitions:
+                partitions[label] = part_dct
+            else:
+                partitions[label] = Partition.from_v2_dict(label, part_dct)
+        for label in commit_dct["remove_partitions"]:
+            partitions.pop(label, None)
+        for index_key in INDEX_METADATA_KEYS:
+            if index_key in commit_dct:
+                dct[index_key] = commit_dct[index_key]
+            else:
+                dct.pop(index_key, None)
+        dct["metadata"] = commit_dct["metadata"]
+        if commit_dct["partition_keys"] is not None:
+            dct["partition_keys"] = commit_dct["partition_keys"]
+        commit_log["commit"] = commit
+
+    dct["partitions"] = partitions
+    return dct
@@ -5,7 +5,9 @@ import copy
 import logging
 import re
 from collections import OrderedDict, defaultdict
+from itertools import chain
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import simplejson
@@ -15,18 +17,33 @@ import kartothek.core._time
 import kartothek.core._zmsgpack as msgpack
 from kartothek.core import naming
 from kartothek.core._compat import load_json
+from kartothek.core._concurrent import iter_keys_sharded, map_concurrently
 from kartothek.core._mixins import CopyMixin
+from kartothek.core.commit_log import (
+    commit_log_to_dict,
+    create_commit_log,
+    replay_commits,
+)
 from kartothek.core.common_metadata import read_schema_metadata
 from kartothek.core.index import (
+    CompositeSecondaryIndex,
     ExplicitSecondaryIndex,
     IndexBase,
+    MinMaxIndex,
     PartitionIndex,
+    SecondaryIndexBase,
     filter_indices,
 )
+from kartothek.core.manifest import PartitionManifest
 from kartothek.core.naming import EXTERNAL_INDEX_SUFFIX, PARQUET_FILE_SUFFIX
-from kartothek.core.partition import Partition
-from kartothek.core.urlencode import decode_key, quote_indices
+from kartothek.core.partition import (
+    CopyOnWritePartitions,
+    LazyPartitions,
+    PartitionMapping,
+)
+from kartothek.core.urlencode import decode_key, quote_indices, unquote_array
 from kartothek.core.utils import verify_metadata_version
+from kartothek.core.uuid import gen_uuid
 
 _logger = logging.getLogger(__name__)
 
@@ -62,6 +79,7 @@ class DatasetMetadataBase(CopyMixin):
         explicit_partitions=True,
         partition_keys=None,
         table_meta=None,
+        commit_log=None,
     ):
         if not _validate_uuid(uuid):
             raise ValueError("UUID contains illegal character")
@@ -77,10 +95,21 @@ class DatasetMetadataBase(CopyMixin):
 
         self.partition_keys = partition_keys or []
         self.table_meta = table_meta if table_meta else {}
+        # state of the append-only metadata commit log, see `kartothek.core.commit_log`
+        self.commit_log = commit_log
+        # decoded partition key values, see `_get_partition_key_columns`
+        self._partition_key_columns = None
 
         _add_creation_time(self)
         super(DatasetMetadataBase, self).__init__()
 
+    def copy(self, **kwargs):
+        new = super(DatasetMetadataBase, self).copy(**kwargs)
+        if new.partitions is self.partitions:
+            # the partition key values only depend on the partitions, so we can share them with the copy
+            new._partition_key_columns = self._partition_key_columns
+        return new
+
     def __eq__(self, other):
         # Enforce dict comparison at the places where we only
         # care about content, not order.
@@ -114,7 +143,7 @@ class DatasetMetadataBase(CopyMixin):
         if self.table_meta:
             return list(self.table_meta.keys())
         elif self.partitions:
-            return [tab for tab in list(self.partitions.values())[0].files]
+            return list(_get_partition_files(next(six.itervalues(self.partitions))))
         else:
             return []
 
@@ -123,7 +152,15 @@ class DatasetMetadataBase(CopyMixin):
         return {
             col: ind
             for col, ind in six.iteritems(self.indices)
-            if isinstance(ind, ExplicitSecondaryIndex)
+            if isinstance(ind, SecondaryIndexBase)
+        }
+
+    @property
+    def minmax_indices(self):
+        return {
+            col: ind
+            for col, ind in six.iteritems(self.indices)
+            if isinstance(ind, MinMaxIndex)
         }
 
     @staticmethod
@@ -168,13 +205,32 @@ class DatasetMetadataBase(CopyMixin):
         keys: List[Union[str, unicode]]
             Sorted list of storage keys.
         """
-        start_markers = ["{}.".format(uuid), "{}/".format(uuid)]
-        return list(
-            sorted(
-                k
-                for k in store.iter_keys(uuid)
-                if any(k.startswith(marker) for marker in start_markers)
-            )
+        return list(DatasetMetadata.iter_storage_keys(uuid, store))
+
+    @staticmethod
+    def iter_storage_keys(uuid, store):
+        """
+        Iterate over all keys that belong to the given dataset.
+
+        The listing is sharded by table and the first level of partition keys and
+        the shards are listed concurrently. The keys are yielded as soon as their
+        shard is listed.
+
+        Parameters
+        ----------
+        uuid: str or unicode
+            UUID of the dataset.
+        store: Object
+            Object that implements the .iter_keys method for key retrieval loading.
+
+        Returns
+        -------
+        keys: Iterator[Union[str, unicode]]
+            Storage keys in sorted order.
+        """
+        metadata_keys = sorted(store.iter_keys(prefix="{}.".format(uuid)))
+        return chain(
+            metadata_keys, iter_keys_sharded(store, ["{}/".format(uuid)], depth=2)
         )
 
     def to_dict(self):
@@ -184,8 +240,8 @@ class DatasetMetadataBase(CopyMixin):
                 (naming.UUID_KEY, self.uuid),
             ]
         )
-        if self.indices:
-            dct["indices"] = {k: v.to_dict() for k, v in six.iteritems(self.indices)}
+        for k, v in six.iteritems(self.indices):
+            dct.setdefault(_index_metadata_key(v), {})[k] = v.to_dict()
         if self.metadata:
             dct["metadata"] = self.metadata
         if self.partitions or self.explicit_partitions:
@@ -195,6 +251,8 @@ class DatasetMetadataBase(CopyMixin):
 
         if self.partition_keys is not None:
             dct["partition_keys"] = self.partition_keys
+        if self.commit_log:
+            dct[naming.COMMIT_LOG_KEY] = commit_log_to_dict(self.commit_log)
         # don't preserve table_meta, since there is no JSON-compatible way (yet)
 
         return dct
@@ -259,12 +317,16 @@ class DatasetMetadataBase(CopyMixin):
         dataset_metadata: :class:`~kartothek.core.dataset.DatasetMetadata`
             Mutated metadata object with the loaded indices.
         """
-        indices = {
-            column: index.load(store)
-            if isinstance(index, ExplicitSecondaryIndex)
-            else index
+        indices = dict(self.indices)
+        external = [
+            column
             for column, index in six.iteritems(self.indices)
-        }
+            if isinstance(index, (SecondaryIndexBase, MinMaxIndex)) and not index.loaded
+        ]
+        loaded = map_concurrently(
+            lambda column: self.indices[column].load(store), external
+        )
+        indices.update(zip(external, loaded))
         ds = self.copy(indices=indices)
 
         if load_partition_indices:
@@ -329,10 +391,13 @@ class DatasetMetadataBase(CopyMixin):
         if self.primary_indices_loaded:
             return self
 
+        if self._partition_key_columns is None:
+            self._partition_key_columns = _get_partition_key_columns(self.partitions)
         indices = _construct_dynamic_index_from_partitions(
             partitions=self.partitions,
             table_meta=self.table_meta,
             default_dtype=pa.string() if self.metadata_version == 3 else None,
+            partition_key_columns=self._partition_key_columns,
         )
         indices.update(self.indices)
         return self.copy(indices=indices)
@@ -355,10 +420,14 @@ class DatasetMetadataBase(CopyMixin):
         ----------
         columns: list of str
             If provided, the dataframe will only be constructed for the provided columns/indices.
-            If `None` is given, all indices are included.
+            If `None` is given, all single column indices except min/max indices are included.
         """
         if columns is None:
-            columns = sorted(self.indices.keys())
+            columns = sorted(
+                col
+                for col, index in six.iteritems(self.indices)
+                if not isinstance(index, (MinMaxIndex, CompositeSecondaryIndex))
+            )
 
         result = None
         dfs = []
@@ -491,34 +560,43 @@ class DatasetMetadata(DatasetMetadataBase):
 
         metadata_version = dct[naming.METADATA_VERSION_KEY]
         dataset_uuid = dct[naming.UUID_KEY]
-        explicit_partitions = "partitions" in metadata
-        storage_keys = None
-        if not explicit_partitions:
-            storage_keys = DatasetMetadata.storage_keys(dataset_uuid, store)
+        explicit_partitions = (
+            "partitions" in metadata or naming.PARTITIONS_MANIFEST_KEY in metadata
+        )
+        if naming.PARTITIONS_MANIFEST_KEY in metadata:
+            metadata["partitions"] = PartitionManifest.load(
+                store, metadata.pop(naming.PARTITIONS_MANIFEST_KEY)
+            )
+        elif not explicit_partitions:
             partitions = _load_partitions_from_filenames(
                 store=store,
-                storage_keys=storage_keys,
+                storage_keys=DatasetMetadata.iter_storage_keys(dataset_uuid, store),
                 metadata_version=metadata_version,
             )
             metadata["partitions"] = partitions
+        if naming.COMMIT_LOG_KEY in metadata:
+            metadata = replay_commits(metadata, store)
 
         if metadata["partitions"]:
-            tables = [tab for tab in list(metadata["partitions"].values())[0]["files"]]
+            tables = list(
+                _get_partition_files(next(six.itervalues(metadata["partitions"])))
+            )
         else:
             tables = set()
-            if storage_keys is None:
-                storage_keys = DatasetMetadata.storage_keys(dataset_uuid, store)
-            for key in storage_keys:
+            for key in DatasetMetadata.iter_storage_keys(dataset_uuid, store):
                 if key.endswith(naming.TABLE_METADATA_FILE):
                     tables.add(key.split("/")[1])
             tables = list(tables)
 
         table_meta = {}
         if load_schema:
-            for table in tables:
-                table_meta[table] = read_schema_metadata(
+            schemas = map_concurrently(
+                lambda table: read_schema_metadata(
                     dataset_uuid=dataset_uuid, store=store, table=table
-                )
+                ),
+                tables,
+            )
+            table_meta = dict(zip(tables, schemas))
 
         metadata["table_meta"] = table_meta
 
@@ -562,13 +640,22 @@ class DatasetMetadata(DatasetMetadataBase):
             if dct[naming.METADATA_VERSION_KEY] >= 4
             else None,
         )
+        commit_log = dct.get(naming.COMMIT_LOG_KEY)
+        if commit_log:
+            builder.commit_log = create_commit_log(
+                commit_log["checkpoint_interval"],
+                commit_log.get("commit", commit_log["snapshot"]),
+            )
+            builder.commit_log["snapshot"] = commit_log["snapshot"]
 
         for key, value in six.iteritems(dct.get("metadata", {})):
             builder.add_metadata(key, value)
-        for partition_label, part_dct in six.iteritems(dct.get("partitions", {})):
-            builder.add_partition(
-                partition_label, Partition.from_v2_dict(partition_label, part_dct)
-            )
+        partitions = dct.get("partitions", {})
+        if isinstance(partitions, (PartitionMapping, CopyOnWritePartitions)):
+            builder.partitions = partitions
+        elif partitions:
+            # Partition objects are only created once they are accessed
+            builder.partitions = LazyPartitions(partitions)
         for column, index_dct in six.iteritems(dct.get("indices", {})):
             if isinstance(index_dct, IndexBase):
                 builder.add_embedded_index(column, index_dct)
@@ -576,9 +663,40 @@ class DatasetMetadata(DatasetMetadataBase):
                 builder.add_embedded_index(
                     column, ExplicitSecondaryIndex.from_v2(column, index_dct)
                 )
+        for column, index in six.iteritems(dct.get("minmax_indices", {})):
+            if isinstance(index, IndexBase):
+                builder.add_embedded_index(column, index)
+            elif isinstance(index, six.string_types):
+                builder.add_external_minmax_index(column, index)
+            else:
+                builder.add_embedded_index(
+                    column, MinMaxIndex(column=column, ranges=index)
+                )
+        for name, index in six.iteritems(dct.get("composite_indices", {})):
+            if isinstance(index, IndexBase):
+                builder.add_embedded_index(name, index)
+            else:
+                builder.add_external_composite_index(
+                    index["columns"], index["index_storage_key"]
+                )
         return builder.to_dataset()
 
 
+def _index_metadata_key(index):
+    """
+    Key of the dataset metadata under which the given index is referenced.
+
+    Index types besides the plain explicit indices are stored under their own keys
+    since older readers are not able to interpret them.
+    """
+    if isinstance(index, MinMaxIndex):
+        return "minmax_indices"
+    elif isinstance(index, CompositeSecondaryIndex):
+        return "composite_indices"
+    else:
+        return "indices"
+
+
 def _get_type_from_meta(table_meta, column, default):
     # use first schema that provides type information, since write path should ensure that types are normalized and
     # equal
@@ -597,51 +715,107 @@ def _get_type_from_meta(table_meta, column, default):
     )
 
 
-def _construct_dynamic_index_from_partitions(partitions, table_meta, default_dtype):
+def _construct_dynamic_index_from_partitions(
+    partitions, table_meta, default_dtype, partition_key_columns=None
+):
+    if partition_key_columns is None:
+        partition_key_columns = _get_partition_key_columns(partitions)
+
+    new_indices = {}
+    for col, index_dct in six.iteritems(partition_key_columns):
+        arrow_type = _get_type_from_meta(table_meta, col, default_dtype)
+        new_indices[col] = PartitionIndex(
+            column=col, index_dct=index_dct, dtype=arrow_type
+        )
+    return new_indices
+
+
+def _get_partition_files(part):
+    if isinstance(part, dict):
+        return part["files"]
+    else:
+        return part.files
+
+
+def _get_partition_key_columns(partitions):
     if len(partitions) == 0:
         return {}
-
-    def _get_files(part):
-        if isinstance(part, dict):
-            return part["files"]
-        else:
-            return part.files
+    if isinstance(partitions, PartitionManifest) and partitions.partition_key_values:
+        # the manifest already holds the decoded values
+        return partitions.partition_key_columns()
 
     # We exploit the fact that all tables are partitioned equally.
     first_partition = next(
         six.itervalues(partitions)
     )  # partitions is NOT empty here, see check above
-    first_partition_files = _get_files(first_partition)
+    first_partition_files = _get_partition_files(first_partition)
     if not first_partition_files:
         return {}
     key_table = next(six.iterkeys(first_partition_files))
     storage_keys = (
-        (key, _get_files(part)[key_table]) for key, part in six.iteritems(partitions)
+        (key, _get_partition_files(part)[key_table])
+        for key, part in six.iteritems(partitions)
     )
 
-    _key_indices = defaultdict(_get_empty_index)
+    return _decode_partition_key_columns(storage_keys)
+
+
+def _decode_partition_key_columns(storage_keys):
+    """
+    Decode the partition key values of the given storage keys.
+
+    Instead of decoding every key on its own, the encoded ``column=value`` components of all keys are
+    factorized first so that only the distinct components need to be unquoted.
+
+    Parameters
+    ----------
+    storage_keys: Iterable[Tuple[str, str]]
+        Pairs of partition label and storage key
+
+    Returns
+    -------
+    Dict[str, Dict[str, List[str]]]
+        Mapping from column to the (unquoted) values and the labels of the partitions containing them
+    """
+    labels = []
+    positions = []
+    components = []
     depth_indices = None
     for partition_label, key in storage_keys:
-        _, _, indices, file_ = decode_key(key)
+        key_components = key.split("/")
         if (
-            file_ is not None
-            and key.endswith(PARQUET_FILE_SUFFIX)
-            and not key.endswith(EXTERNAL_INDEX_SUFFIX)
+            len(key_components) < 3
+            or not key.endswith(PARQUET_FILE_SUFFIX)
+            or key.endswith(EXTERNAL_INDEX_SUFFIX)
         ):
-            depth_indices = _check_index_depth(indices, depth_indices)
-            for column, value in indices:
-                _key_indices[column][value].add(partition_label)
-    new_indices = {}
-    for col, index_dct in six.iteritems(_key_indices):
-        arrow_type = _get_type_from_meta(table_meta, col, default_dtype)
+            continue
+        key_indices = [
+            component for component in key_components[2:-1] if component.count("=") == 1
+        ]
+        depth_indices = _check_index_depth(key_indices, depth_indices)
+        positions.extend([len(labels)] * len(key_indices))
+        components.extend(key_indices)
+        labels.append(partition_label)
+
+    if not components:
+        return {}
 
-        # convert defaultdicts into dicts
-        new_indices[col] = PartitionIndex(
-            column=col,
-            index_dct={k1: list(v1) for k1, v1 in six.iteritems(index_dct)},
-            dtype=arrow_type,
-        )
-    return new_indices
+    codes, uniques = pd.factorize(components)
+    order = np.argsort(codes, kind="mergesort")
+    sorted_labels = np.asarray(labels, dtype=object)[np.asarray(positions)[order]]
+    boundaries = np.cumsum(np.bincount(codes, minlength=len(uniques)))
+
+    encoded_columns, encoded_values = zip(
+        *(component.split("=") for component in uniques)
+    )
+    result = defaultdict(dict)
+    start = 0
+    for column, value, end in zip(
+        unquote_array(encoded_columns), unquote_array(encoded_values), boundaries
+    ):
+        result[column].setdefault(value, []).extend(sorted_labels[start:end])
+        start = end
+    return dict(result)
 
 
 def _get_partition_label(indices, filename, metadata_version):
@@ -662,7 +836,7 @@ def _check_index_depth(indices, depth_indices):
 def _get_partition_keys_from_partitions(partitions):
     if len(partitions):
         part = next(iter(six.itervalues(partitions)))
-        files_dct = part["files"]
+        files_dct = _get_partition_files(part)
         if files_dct:
             key = next(iter(six.itervalues(files_dct)))
             _, _, indices, _ = decode_key(key)
@@ -689,10 +863,6 @@ def _get_empty_partition():
     return {"files": {}, "metadata": {}}
 
 
-def _get_empty_index():
-    return defaultdict(set)
-
-
 def create_partition_key(dataset_uuid, table, index_values, filename="data"):
     """
     Create partition key for a kartothek partition
@@ -734,6 +904,7 @@ class DatasetMetadataBuilder(CopyMixin):
         explicit_partitions=True,
         partition_keys=None,
         table_meta=None,
+        commit_log=None,
     ):
         verify_metadata_version(metadata_version)
 
@@ -745,25 +916,26 @@ class DatasetMetadataBuilder(CopyMixin):
         self.partition_keys = partition_keys
         self.table_meta = table_meta
         self.explicit_partitions = explicit_partitions
+        self.commit_log = commit_log
 
         _add_creation_time(self)
         super(DatasetMetadataBuilder, self).__init__()
 
     @staticmethod
     def from_dataset(dataset):
-        dataset = copy.deepcopy(dataset)
-
         ds_builder = DatasetMetadataBuilder(
             uuid=dataset.uuid,
             metadata_version=dataset.metadata_version,
             explicit_partitions=dataset.explicit_partitions,
-            partition_keys=dataset.partition_keys,
-            table_meta=dataset.table_meta,
+            partition_keys=copy.deepcopy(dataset.partition_keys),
+            table_meta=copy.deepcopy(dataset.table_meta),
+            commit_log=copy.deepcopy(dataset.commit_log),
         )
 
-        ds_builder.metadata = dataset.metadata
-        ds_builder.indices = dataset.indices
-        ds_builder.partitions = dataset.partitions
+        ds_builder.metadata = copy.deepcopy(dataset.metadata)
+        ds_builder.indices = copy.deepcopy(dataset.indices)
+        # The partitions are not copied but wrapped to avoid materializing them
+        ds_builder.partitions = CopyOnWritePartitions(dataset.partitions)
         ds_builder.tables = dataset.tables
         return ds_builder
 
@@ -824,6 +996,35 @@ class DatasetMetadataBuilder(CopyMixin):
         )
         return filename
 
+    def add_external_minmax_index(self, column, filename):
+        """
+        Add a reference to an external min/max index.
+
+        Parameters
+        ----------
+        column: str
+            Name of the indexed column
+        filename: str
+            The location where the external index is stored.
+        """
+        self.indices[column] = MinMaxIndex(column, index_storage_key=filename)
+        return filename
+
+    def add_external_composite_index(self, columns, filename):
+        """
+        Add a reference to an external composite index.
+
+        Parameters
+        ----------
+        columns: List[str]
+            Names of the indexed columns
+        filename: str
+            The location where the external index is stored.
+        """
+        index = CompositeSecondaryIndex(columns, index_storage_key=filename)
+        self.indices[index.column] = index
+        return filename
+
     def add_metadata(self, key, value):
         """
         Add arbitrary key->value metadata.
@@ -835,6 +1036,23 @@ class DatasetMetadataBuilder(CopyMixin):
         """
         self.metadata[key] = value
 
+    def indices_to_dict(self):
+        """
+        Render the index references of the dataset, grouped by the metadata key
+        of the respective index type.
+
+        Returns
+        -------
+        dict
+        """
+        dct = OrderedDict()
+        for column, index in six.iteritems(self.indices):
+            if isinstance(index, six.string_types):
+                dct.setdefault("indices", {})[column] = index
+            else:
+                dct.setdefault(_index_metadata_key(index), {})[column] = index.to_dict()
+        return dct
+
     def to_dict(self):
         """
         Render the dataset to a dict.
@@ -850,13 +1068,7 @@ class DatasetMetadataBuilder(CopyMixin):
                 (naming.UUID_KEY, self.uuid),
             ]
         )
-        if self.indices:
-            dct["indices"] = {}
-            for column, index in six.iteritems(self.indices):
-                if isinstance(index, six.string_types):
-                    dct["indices"][column] = index
-                else:
-                    dct["indices"][column] = index.to_dict()
+        dct.update(self.indices_to_dict())
         if self.metadata:
             dct["metadata"] = self.metadata
 
@@ -868,6 +1080,8 @@ class DatasetMetadataBuilder(CopyMixin):
 
         if self.partition_keys is not None:
             dct["partition_keys"] = self.partition_keys
+        if self.commit_log:
+            dct[naming.COMMIT_LOG_KEY] = commit_log_to_dict(self.commit_log)
         # don't preserve table_meta, since there is no JSON-compatible way (yet)
         return dct
 
@@ -903,6 +1117,46 @@ class DatasetMetadataBuilder(CopyMixin):
             msgpack.packb(self.to_dict()),
         )
 
+    def to_manifest(self):
+        """
+        Render the dataset to a JSON header and a Parquet manifest holding the partitions.
+
+        The header keeps the metadata version and references the manifest instead of
+        embedding the partitions. Readers which do not know the reference derive the
+        partitions from the storage keys, which yields the same partitions unless
+        files of removed partitions were not garbage collected yet.
+
+        Every call renders the manifest to a new key: a reader which loaded the
+        previous header still finds the manifest it references. Stale manifests are
+        removed with :func:`~kartothek.core.manifest.delete_stale_manifests`.
+
+        Returns
+        -------
+        objects: List[Tuple[str, bytes]]
+            The storage keys and rendered objects. They need to be stored in the
+            given order so that the header is only updated once the manifest exists.
+        """
+        dct = self.to_dict()
+        objects = []
+        if self.explicit_partitions:
+            tag = "{:%Y%m%dT%H%M%S%f}-{}".format(
+                kartothek.core._time.datetime_utcnow(), gen_uuid()[:8]
+            )
+            manifest_key = naming.metadata_manifest_key_from_uuid(self.uuid, tag)
+            manifest = PartitionManifest.from_partitions(
+                self.partitions, self.partition_keys
+            )
+            del dct["partitions"]
+            dct[naming.PARTITIONS_MANIFEST_KEY] = manifest_key
+            objects.append((manifest_key, manifest.to_buffer()))
+        objects.append(
+            (
+                naming.metadata_key_from_uuid(self.uuid),
+                simplejson.dumps(dct).encode("utf-8"),
+            )
+        )
+        return objects
+
     def to_dataset(self):
         return DatasetMetadata(
             uuid=self.uuid,
@@ -913,6 +1167,7 @@ class DatasetMetadataBuilder(CopyMixin):
             explicit_partitions=self.explicit_partitions,
             partition_keys=self.partition_keys,
             table_meta=self.table_meta,
+            commit_log=self.commit_log,
         )
 
 
@@ -2,6 +2,7 @@
 
 import logging
 from copy import copy
+from itertools import chain
 
 import numpy as np
 import pandas as pd
@@ -136,41 +137,7 @@ class IndexBase(CopyMixin):
         NotImplementedError
             If the dtype cannot be handled.
         """
-        if self.dtype is None:
-            raise ValueError(
-                "Cannot normalize index values as long as dtype is not set"
-            )
-        elif pa.types.is_string(self.dtype):
-            if isinstance(value, six.binary_type):
-                return value.decode("utf-8")
-            else:
-                return six.text_type(value)
-        elif pa.types.is_binary(self.dtype):
-            if isinstance(value, six.binary_type):
-                return value
-            else:
-                return six.text_type(value).encode("utf-8")
-        elif pa.types.is_date(self.dtype):
-            return pd.Timestamp(value).date()
-        elif pa.types.is_temporal(self.dtype):
-            return pd.Timestamp(value).to_datetime64()
-        elif pa.types.is_integer(self.dtype):
-            return int(value)
-        elif pa.types.is_floating(self.dtype):
-            return float(value)
-        elif pa.types.is_boolean(self.dtype):
-            if isinstance(value, six.string_types):
-                if value.lower() == "false":
-                    return False
-                elif value.lower() == "true":
-                    return True
-                else:
-                    return ValueError('Cannot parse boolean value "{}"'.format(value))
-            return bool(value)
-        else:
-            raise NotImplementedError(
-                "Cannot normalize index value for type {}".format(self.dtype)
-            )
+        return _normalize_value_by_dtype(value, self.dtype)
 
     @property
     def loaded(self):
@@ -477,12 +444,11 @@ class PartitionIndex(IndexBase):
         return super(PartitionIndex, self).__eq__(other)
 
 
-class ExplicitSecondaryIndex(IndexBase):
+class SecondaryIndexBase(IndexBase):
     """
-    An Index class representing an explicit, secondary index which is calculated and stored next to the dataset.
-    In contrast to the `PartitionIndex` this needs to be calculated by an explicit pass over the data. All mutations of
-    this class will erase the reference to the physical file and the storage of the mutated object will write to a new
-    storage key.
+    Base class for the secondary indices which are calculated by an explicit pass over the data and stored next to
+    the dataset. All mutations of these indices will erase the reference to the physical file and the storage of the
+    mutated object will write to a new storage key.
     """
 
     def __init__(
@@ -496,7 +462,7 @@ class ExplicitSecondaryIndex(IndexBase):
         if (index_dct is None) and not index_storage_key:
             raise ValueError("No valid index source specified")
         self.index_storage_key = index_storage_key
-        super(ExplicitSecondaryIndex, self).__init__(
+        super(SecondaryIndexBase, self).__init__(
             column=column,
             index_dct=index_dct,
             dtype=dtype,
@@ -513,10 +479,41 @@ class ExplicitSecondaryIndex(IndexBase):
         )
 
     def __eq__(self, other):
-        if not isinstance(other, ExplicitSecondaryIndex):
+        if not isinstance(other, SecondaryIndexBase):
             return False
         if self.index_storage_key != other.index_storage_key:
             return False
+        return super(SecondaryIndexBase, self).__eq__(other)
+
+    def _storage_key(self, dataset_uuid):
+        """
+        Return the storage key of the index. An existing key is kept if it belongs to the dataset.
+        """
+        if (
+            self.index_storage_key is not None
+            and dataset_uuid
+            and dataset_uuid in self.index_storage_key
+        ):
+            return self.index_storage_key
+        return "{dataset_uuid}/indices/{column}/{timestamp}{suffix}".format(
+            dataset_uuid=dataset_uuid,
+            suffix=naming.EXTERNAL_INDEX_SUFFIX,
+            column=quote(self.column),
+            timestamp=quote(self.creation_time.isoformat()),
+        )
+
+
+class ExplicitSecondaryIndex(SecondaryIndexBase):
+    """
+    An Index class representing an explicit, secondary index which is calculated and stored next to the dataset.
+    In contrast to the `PartitionIndex` this needs to be calculated by an explicit pass over the data. All mutations of
+    this class will erase the reference to the physical file and the storage of the mutated object will write to a new
+    storage key.
+    """
+
+    def __eq__(self, other):
+        if not isinstance(other, ExplicitSecondaryIndex):
+            return False
         return super(ExplicitSecondaryIndex, self).__eq__(other)
 
     @staticmethod
@@ -573,22 +570,7 @@ class ExplicitSecondaryIndex(IndexBase):
         store: object
         dataset_uuid: str
         """
-        storage_key = None
-
-        if (
-            self.index_storage_key is not None
-            and dataset_uuid
-            and dataset_uuid in self.index_storage_key
-        ):
-            storage_key = self.index_storage_key
-        if storage_key is None:
-            storage_key = "{dataset_uuid}/indices/{column}/{timestamp}{suffix}".format(
-                dataset_uuid=dataset_uuid,
-                suffix=naming.EXTERNAL_INDEX_SUFFIX,
-                column=quote(self.column),
-                timestamp=quote(self.creation_time.isoformat()),
-            )
-
+        storage_key = self._storage_key(dataset_uuid)
         table = _index_dct_to_table(self.index_dct, self.column)
         buf = pa.BufferOutputStream()
         pq.write_table(table, buf)
@@ -652,6 +634,600 @@ class ExplicitSecondaryIndex(IndexBase):
             return self
 
 
+class CompositeSecondaryIndex(SecondaryIndexBase):
+    """
+    A secondary index over a combination of columns. The index maps tuples of values (one entry per
+    column) to the partitions containing this combination. It is evaluated for conjunctions of predicates which cover
+    all of its columns and allows exact lookups of rare value combinations whose single column indices are large.
+
+    Parameters
+    ----------
+    columns: List[str]
+        Names of the columns this index is for.
+    index_dct: Union[None, Dict[Tuple, List[String]]]
+        Mapping from value tuples to partition labels
+    index_storage_key: Union[None, String]
+        Storage key of the external index file.
+    dtypes: Union[None, List[pyarrow.Type]]
+        Types of the indexed columns. If left out and ``index_dct`` is present, they will be inferred.
+    normalize_dtype: bool
+        Normalize type information and values within ``index_dct``.
+    """
+
+    def __init__(
+        self,
+        columns,
+        index_dct=None,
+        index_storage_key=None,
+        dtypes=None,
+        normalize_dtype=True,
+    ):
+        columns = list(columns)
+        if len(columns) < 2:
+            raise ValueError("A composite index needs at least two columns")
+        self.columns = columns
+        if (dtypes is None) and index_dct:
+            dtypes = [
+                _index_values_to_array(
+                    {key[pos] for key in six.iterkeys(index_dct)}
+                ).type
+                for pos in range(len(columns))
+            ]
+        if dtypes is not None and normalize_dtype:
+            dtypes = [normalize_type(t, None, None, None)[0] for t in dtypes]
+        self.dtypes = dtypes
+
+        super(CompositeSecondaryIndex, self).__init__(
+            column=composite_index_name(columns),
+            index_storage_key=index_storage_key,
+            index_dct=None if index_dct is None else {},
+            normalize_dtype=False,
+        )
+        if index_dct is not None and normalize_dtype:
+            self.index_dct = {}
+            for value, partitions in six.iteritems(index_dct):
+                value = self._normalize_value(value)
+                existing = self.index_dct.setdefault(value, [])
+                existing += [part for part in partitions if part not in existing]
+        else:
+            self.index_dct = index_dct
+
+    def _normalize_value(self, value):
+        if self.dtypes is None:
+            raise ValueError(
+                "Cannot normalize index values as long as dtype is not set"
+            )
+        return tuple(
+            _normalize_value_by_dtype(val, dtype)
+            for val, dtype in zip(value, self.dtypes)
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, CompositeSecondaryIndex):
+            return False
+        if self.columns != other.columns or self.dtypes != other.dtypes:
+            return False
+        return super(CompositeSecondaryIndex, self).__eq__(other)
+
+    def eval_operator(self, op, value):
+        raise NotImplementedError(
+            "A composite index can only be evaluated for conjunctions, see `eval_conjunction`."
+        )
+
+    def eval_conjunction(self, conjunction):
+        """
+        Evaluates a conjunction (AND) of literals on the columns of this index and returns all
+        partition labels allowed by this index.
+
+        Parameters
+        ----------
+        conjunction: list of tuple
+            A list of (column, operator, value) tuples. All columns need to be part of this index.
+
+        Returns
+        -------
+        set: Allowed partition labels
+        """
+        keys = list(self.index_dct.keys())
+        mask = np.ones(len(keys), dtype=bool)
+        for column, op, value in conjunction:
+            pos = self.columns.index(column)
+            values = [key[pos] for key in keys]
+            index_arr = None
+            dtype = self.dtypes[pos] if self.dtypes else None
+            if dtype is not None and not pa.types.is_date(dtype):
+                try:
+                    index_arr = np.array(values, dtype=dtype.to_pandas_dtype())
+                except ValueError:
+                    pass
+            if index_arr is None:
+                index_arr = np.array(values)
+            mask &= filter_array_like(index_arr, op, value, strict_date_types=True)
+
+        result = set()
+        for key, allowed in zip(keys, mask):
+            if allowed:
+                result.update(self.index_dct[key])
+        return result
+
+    def to_dict(self):
+        """
+        Serialise the object to Python object that can be part of a larger
+        dictionary that may be serialised to JSON.
+
+        Returns
+        -------
+        obj: dict
+        """
+        return {"columns": self.columns, "index_storage_key": self.index_storage_key}
+
+    def as_flat_series(self, compact=False, partitions_as_index=False):
+        raise NotImplementedError(
+            "A composite index cannot be converted to a series of values."
+        )
+
+    def store(self, store, dataset_uuid):
+        """
+        Store the index as a parquet file with one column per indexed column.
+
+        If compatible, the new keyname will be the name stored under the attribute `index_storage_key`.
+        If this attribute is None, a new key will be generated of the format
+
+            `{dataset_uuid}/indices/{column}/{timestamp}.by-dataset-index.parquet`
+
+        where column is the name of the composite index.
+
+        Parameters
+        ----------
+        store: object
+        dataset_uuid: str
+        """
+        storage_key = self._storage_key(dataset_uuid)
+        keys = list(self.index_dct.keys())
+        arrays = [
+            _index_values_to_array([key[pos] for key in keys])
+            for pos in range(len(self.columns))
+        ]
+        arrays.append(pa.array([self.index_dct[key] for key in keys]))
+        table = pa.Table.from_arrays(
+            arrays, names=self.columns + [_PARTITION_COLUMN_NAME]
+        )
+        buf = pa.BufferOutputStream()
+        pq.write_table(table, buf)
+
+        store.put(storage_key, buf.getvalue().to_pybytes())
+        return storage_key
+
+    def load(self, store):
+        """
+        Load an external index into memory. Returns a new index object that
+        contains the index dictionary. Returns itself if the index is already loaded.
+
+        Parameters
+        ----------
+        store: Object
+            Object that implements the .get method for file/object loading.
+
+        Returns
+        -------
+        index: [kartothek.core.index.CompositeSecondaryIndex]
+        """
+        if self.index_dct is not None:
+            return self
+
+        index_buffer = store.get(self.index_storage_key)
+        table = pq.read_table(pa.BufferReader(index_buffer))
+        dtypes = []
+        for column in self.columns:
+            column_type = table.schema[table.schema.get_field_index(column)].type
+            if column_type == pa.timestamp("us"):
+                # type roundtrip is wrong, was ns, values are numpy.datetime64[ns] though
+                column_type = pa.timestamp("ns")
+            dtypes.append(column_type)
+        df = _fix_pyarrow_07992_table(table).to_pandas()
+
+        index_dct = dict(
+            zip(
+                zip(*(df[column].values for column in self.columns)),
+                (list(x) for x in df[_PARTITION_COLUMN_NAME].values),
+            )
+        )
+        return CompositeSecondaryIndex(
+            columns=self.columns,
+            index_dct=index_dct,
+            dtypes=dtypes,
+            index_storage_key=self.index_storage_key,
+        )
+
+
+def composite_index_name(columns):
+    """
+    Name of the composite index over the given columns, as used as key in the dataset indices.
+    """
+    return "&".join(columns)
+
+
+class MinMaxIndex(IndexBase):
+    """
+    An Index class storing the minimum value, the maximum value and the number of null values of a column per
+    partition (a so called zone map).
+
+    In contrast to the `ExplicitSecondaryIndex` the size of this index only scales with the number of partitions and
+    not with the number of distinct values, which makes it suitable for continuous columns like floats or timestamps.
+    Evaluating a predicate on this index yields a superset of the partitions which actually contain matching rows.
+    All mutations of this class will erase the reference to the physical file.
+
+    Parameters
+    ----------
+    column: string
+        Name of the column this index is for.
+    ranges: Union[None, Dict[String, Tuple[Any, Any, int]]]
+        Mapping from partition labels to ``(min, max, null_count)``. ``min`` and ``max`` are ``None`` if the
+        partition does not contain any non-null value.
+    index_storage_key: Union[None, String]
+        Storage key of the external index file.
+    dtype: Union[None, pyarrow.Type]
+        Type of the column. If left out and ``ranges`` is present, this will be inferred.
+    normalize_dtype: bool
+        Normalize type information and values within ``ranges``.
+    """
+
+    def __init__(
+        self,
+        column,
+        ranges=None,
+        index_storage_key=None,
+        dtype=None,
+        normalize_dtype=True,
+    ):
+        if (ranges is None) and not index_storage_key:
+            raise ValueError("No valid index source specified")
+        if (dtype is None) and ranges:
+            probe = [min_ for min_, _, _ in six.itervalues(ranges) if min_ is not None]
+            if probe:
+                dtype = _index_dct_to_table({probe[0]: []}, column).schema[0].type
+        self.index_storage_key = index_storage_key
+        super(MinMaxIndex, self).__init__(
+            column=column, index_dct=None, dtype=dtype, normalize_dtype=normalize_dtype
+        )
+
+        if ranges is None:
+            self.ranges = None
+        elif normalize_dtype:
+            self.ranges = {}
+            for label, (min_, max_, null_count) in six.iteritems(ranges):
+                if min_ is not None:
+                    min_ = self._normalize_value(min_)
+                    max_ = self._normalize_value(max_)
+                self.ranges[label] = (min_, max_, int(null_count))
+        else:
+            self.ranges = ranges
+
+    def copy(self, **kwargs):
+        if kwargs:
+            index_storage_key = None
+        else:
+            index_storage_key = self.index_storage_key
+        kwargs.setdefault("normalize_dtype", False)
+        return super(IndexBase, self).copy(
+            index_storage_key=index_storage_key, **kwargs
+        )
+
+    @property
+    def loaded(self):
+        return self.ranges is not None
+
+    def _to_array(self, values):
+        if (
+            self.dtype is not None
+            and not pa.types.is_date(self.dtype)
+            and not pa.types.is_string(self.dtype)
+            and not pa.types.is_binary(self.dtype)
+        ):
+            return np.array(values, dtype=self.dtype.to_pandas_dtype())
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = values
+        return arr
+
+    def _sorted_ranges(self):
+        """
+        Return the labels, minima and maxima of all partitions containing non-null values, sorted by the minima.
+        """
+        labels = []
+        mins = []
+        maxs = []
+        for label, (min_, max_, _) in six.iteritems(self.ranges):
+            if min_ is not None:
+                labels.append(label)
+                mins.append(min_)
+                maxs.append(max_)
+        mins = self._to_array(mins)
+        maxs = self._to_array(maxs)
+        order = np.argsort(mins, kind="mergesort")
+        return np.array(labels, dtype=object)[order], mins[order], maxs[order]
+
+    def eval_operator(self, op, value):
+        """
+        Evaluates a given operator on the index for a given value and returns all
+        partition labels which may contain matching rows.
+
+        Partitions are sorted by their minimum so that upper bounds only require a binary
+        search while lower bounds are checked against the maxima of the remaining partitions.
+
+        Parameters
+        ----------
+        op: str
+            A string representation of the operator to be evaluated. Supported are
+            "==", "!=", "<=", ">=", "<", ">", "in"
+            For details, see documentation of kartothek.serialization
+        value: object
+            The value to be evaluated
+        Returns
+        -------
+        set: Allowed partition labels
+        """
+        if self.dtype is None:
+            # none of the indexed partitions contains a non-null value
+            return set(self.ranges) if op == "!=" else set()
+        if op == "!=":
+            value = self._normalize_value(value)
+            return {
+                label
+                for label, (min_, max_, null_count) in six.iteritems(self.ranges)
+                if not (null_count == 0 and min_ == value and max_ == value)
+            }
+
+        labels, mins, maxs = self._sorted_ranges()
+        if op == "in":
+            values = [self._normalize_value(val) for val in value]
+        elif op in ("==", "<", "<=", ">", ">="):
+            values = [self._normalize_value(value)]
+        else:
+            raise NotImplementedError("op not supported")
+
+        result = set()
+        for val in values:
+            if op in ("==", "in"):
+                end = np.searchsorted(mins, val, side="right")
+                candidates = labels[:end][maxs[:end] >= val]
+            elif op == "<":
+                candidates = labels[: np.searchsorted(mins, val, side="left")]
+            elif op == "<=":
+                candidates = labels[: np.searchsorted(mins, val, side="right")]
+            elif op == ">":
+                candidates = labels[maxs > val]
+            else:
+                candidates = labels[maxs >= val]
+            result.update(candidates)
+        return result
+
+    def query(self, value):
+        raise NotImplementedError(
+            "A MinMaxIndex cannot be used for exact lookups since it only stores value ranges."
+        )
+
+    def as_flat_series(self, compact=False, partitions_as_index=False):
+        raise NotImplementedError(
+            "A MinMaxIndex cannot be converted to a series of values."
+        )
+
+    def to_dict(self):
+        """
+        Serialise the object to Python object that can be part of a larger
+        dictionary that may be serialised to JSON.
+
+        Returns
+        -------
+        obj: dict or str
+        """
+        if self.ranges is None:
+            return self.index_storage_key
+        else:
+            return self.ranges
+
+    def update(self, index, inplace=False):
+        """
+        Returns a new Index object containing the ranges of both indices.
+
+        The new index object will no longer carry the attribute `index_storage_key`
+        since it is no longer a proper representation of the stored index object.
+
+        Parameters
+        ----------
+        index: [kartothek.core.index.MinMaxIndex]
+            The index which should be added to this one
+        """
+        if not isinstance(index, MinMaxIndex):
+            raise TypeError(
+                "Need to input an kartothek.core.index.MinMaxIndex object, instead got `{}`".format(
+                    type(index)
+                )
+            )
+        if self.dtype is not None and index.dtype is not None:
+            if self.dtype != index.dtype:
+                raise TypeError(
+                    "Trying to update an index with different types. Expected `{}` but got `{}`".format(
+                        self.dtype, index.dtype
+                    )
+                )
+        if self.column != index.column:
+            raise ValueError(
+                "Trying to update an index with the wrong column. Got `{}` but expected `{}`".format(
+                    index.column, self.column
+                )
+            )
+
+        if not index.ranges:
+            return self
+        if inplace:
+            new_ranges = self.ranges
+        else:
+            new_ranges = copy(self.ranges)
+
+        for label, (min_, max_, null_count) in six.iteritems(index.ranges):
+            if label in new_ranges:
+                old_min, old_max, old_null_count = new_ranges[label]
+                if old_min is not None:
+                    min_ = old_min if min_ is None else min(min_, old_min)
+                    max_ = old_max if max_ is None else max(max_, old_max)
+                null_count += old_null_count
+            new_ranges[label] = (min_, max_, null_count)
+        return self.copy(
+            column=self.column,
+            ranges=new_ranges,
+            dtype=self.dtype if self.dtype is not None else index.dtype,
+        )
+
+    def remove_partitions(self, list_of_partitions, inplace=False):
+        """
+        Removes a partition from the internal index dictionary
+
+        The new index object will no longer carry the attribute `index_storage_key`
+        since it is no longer a proper representation of the stored index object.
+
+        Parameters
+        ----------
+        list_of_partitions: obj
+            The partition to be removed
+        inplace: bool, (default: False)
+            If `True` the operation is performed inplace and will return the same object
+        """
+        if not list_of_partitions:
+            return self
+        if inplace:
+            for label in list_of_partitions:
+                self.ranges.pop(label, None)
+            new_ranges = self.ranges
+        else:
+            partitions_to_delete = set(list_of_partitions)
+            new_ranges = {
+                label: range_
+                for label, range_ in six.iteritems(self.ranges)
+                if label not in partitions_to_delete
+            }
+        return self.copy(column=self.column, ranges=new_ranges, dtype=self.dtype)
+
+    def remove_values(self, list_of_values, inplace=False):
+        raise NotImplementedError("Values cannot be removed from a MinMaxIndex.")
+
+    def __eq__(self, other):
+        if not isinstance(other, MinMaxIndex):
+            return False
+        if self.column != other.column:
+            return False
+        if self.dtype != other.dtype:
+            return False
+        if self.index_storage_key != other.index_storage_key:
+            return False
+        return self.ranges == other.ranges
+
+    def store(self, store, dataset_uuid):
+        """
+        Store the index as a parquet file
+
+        If compatible, the new keyname will be the name stored under the attribute `index_storage_key`.
+        If this attribute is None, a new key will be generated of the format
+
+            `{dataset_uuid}/indices/{column}/{timestamp}.by-dataset-minmax-index.parquet`
+
+        where the timestamp is in nanosecond accuracy and is created upon Index object initialization
+
+        Parameters
+        ----------
+        store: object
+        dataset_uuid: str
+        """
+        storage_key = None
+
+        if (
+            self.index_storage_key is not None
+            and dataset_uuid
+            and dataset_uuid in self.index_storage_key
+        ):
+            storage_key = self.index_storage_key
+        if storage_key is None:
+            storage_key = "{dataset_uuid}/indices/{column}/{timestamp}{suffix}".format(
+                dataset_uuid=dataset_uuid,
+                suffix=naming.MINMAX_INDEX_SUFFIX,
+                column=quote(self.column),
+                timestamp=quote(self.creation_time.isoformat()),
+            )
+
+        labels = sorted(self.ranges)
+        table = pa.Table.from_arrays(
+            [
+                pa.array(labels, type=pa.string()),
+                self._values_to_arrow([self.ranges[label][0] for label in labels]),
+                self._values_to_arrow([self.ranges[label][1] for label in labels]),
+                pa.array([self.ranges[label][2] for label in labels], type=pa.int64()),
+            ],
+            names=[_PARTITION_COLUMN_NAME, "min", "max", "null_count"],
+        )
+        buf = pa.BufferOutputStream()
+        pq.write_table(table, buf)
+
+        store.put(storage_key, buf.getvalue().to_pybytes())
+        return storage_key
+
+    def _values_to_arrow(self, values):
+        if self.dtype is not None and pa.types.is_timestamp(self.dtype):
+            # workaround pyarrow type inference bug (ARROW-2554)
+            mask = np.array([value is None for value in values], dtype=bool)
+            return pa.array(
+                np.array(values, dtype="datetime64[ns]"),
+                mask=mask,
+                type=pa.timestamp("ns"),
+            )
+        return pa.array(values, type=self.dtype)
+
+    def load(self, store):
+        """
+        Load an external index into memory. Returns a new index object that
+        contains the ranges. Returns itself if the index is already loaded.
+
+        Parameters
+        ----------
+        store: Object
+            Object that implements the .get method for file/object loading.
+
+        Returns
+        -------
+        index: [kartothek.core.index.MinMaxIndex]
+        """
+        if self.ranges is not None:
+            return self
+
+        index_buffer = store.get(self.index_storage_key)
+        table = pq.read_table(pa.BufferReader(index_buffer))
+        column_type = table.schema[table.schema.get_field_index("min")].type
+        if pa.types.is_null(column_type):
+            # only empty partitions were indexed
+            column_type = None
+        elif column_type == pa.timestamp("us"):
+            column_type = pa.timestamp("ns")
+
+        columns = {
+            name: table.column(table.schema.get_field_index(name)).to_pylist()
+            for name in [_PARTITION_COLUMN_NAME, "min", "max", "null_count"]
+        }
+        ranges = {
+            label: (min_, max_, null_count)
+            for label, min_, max_, null_count in zip(
+                columns[_PARTITION_COLUMN_NAME],
+                columns["min"],
+                columns["max"],
+                columns["null_count"],
+            )
+        }
+        # values returned by pyarrow are python objects which need to be normalized to the internal representation
+        return MinMaxIndex(
+            column=self.column,
+            ranges=ranges,
+            dtype=column_type,
+            index_storage_key=self.index_storage_key,
+        )
+
+
 def merge_indices(list_of_indices):
     """
     Merge a list of index dictionaries
@@ -720,6 +1296,17 @@ def filter_indices(index_dict, partitions):
     index_types = {}
     types = {}
     for column, index in six.iteritems(index_dict):
+        if isinstance(index, MinMaxIndex):
+            labels = set(index.ranges)
+        elif isinstance(index, CompositeSecondaryIndex):
+            labels = set(chain.from_iterable(six.itervalues(index.index_dct)))
+        else:
+            labels = None
+        if labels is not None:
+            new_index_dict[column] = index.remove_partitions(
+                [label for label in labels if label not in partitions]
+            )
+            continue
         new_index_dict[column] = {}
         types[column] = index.dtype
         index_types[column] = type(index)
@@ -729,14 +1316,60 @@ def filter_indices(index_dict, partitions):
             ]
 
     for column, index_dict in six.iteritems(new_index_dict):
+        if isinstance(index_dict, IndexBase):
+            continue
         new_index_dict[column] = index_types[column](
             column=column, index_dct=index_dict, dtype=types[column]
         )
     return new_index_dict
 
 
+def _normalize_value_by_dtype(value, dtype):
+    if dtype is None:
+        raise ValueError("Cannot normalize index values as long as dtype is not set")
+    elif pa.types.is_string(dtype):
+        if isinstance(value, six.binary_type):
+            return value.decode("utf-8")
+        else:
+            return six.text_type(value)
+    elif pa.types.is_binary(dtype):
+        if isinstance(value, six.binary_type):
+            return value
+        else:
+            return six.text_type(value).encode("utf-8")
+    elif pa.types.is_date(dtype):
+        return pd.Timestamp(value).date()
+    elif pa.types.is_temporal(dtype):
+        return pd.Timestamp(value).to_datetime64()
+    elif pa.types.is_integer(dtype):
+        return int(value)
+    elif pa.types.is_floating(dtype):
+        return float(value)
+    elif pa.types.is_boolean(dtype):
+        if isinstance(value, six.string_types):
+            if value.lower() == "false":
+                return False
+            elif value.lower() == "true":
+                return True
+            else:
+                return ValueError('Cannot parse boolean value "{}"'.format(value))
+        return bool(value)
+    else:
+        raise NotImplementedError(
+            "Cannot normalize index value for type {}".format(dtype)
+        )
+
+
 def _index_dct_to_table(index_dct, column):
-    keys = six.viewkeys(index_dct)
+    labeled_array = _index_values_to_array(six.viewkeys(index_dct))
+    partition_array = pa.array(list(six.viewvalues(index_dct)))
+
+    return pa.Table.from_arrays(
+        [labeled_array, partition_array], names=[column, _PARTITION_COLUMN_NAME]
+    )
+
+
+def _index_values_to_array(keys):
     keys_type = None
     if len(keys) > 0:
         probe = next(iter(keys))
@@ -759,9 +1392,4 @@ def _index_dct_to_table(index_dct, column):
     # upstream Arrow, we have to retain the following line
     keys = np.array(list(keys))
 
-    labeled_array = pa.array(keys, type=keys_type)
-    partition_array = pa.array(list(six.viewvalues(index_dct)))
-
-    return pa.Table.from_arrays(
-        [labeled_array, partition_array], names=[column, _PARTITION_COLUMN_NAME]
-    )
+    return pa.array(keys, type=keys_type)
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar representation of the partitions of a dataset.
+
+Instead of embedding every partition as a nested dictionary into the dataset
+metadata, the partitions may be stored as a Parquet manifest which is referenced
+from a small JSON header (see ``metadata_storage_format="manifest"``). The
+manifest holds one row per partition with the following columns:
+
+* ``partition``: the partition label
+* ``files.<table>``: the storage key of the file of ``<table>``
+* ``partition_keys.<column>``: the (decoded) value of the partition key ``<column>``
+
+Every commit writes a new manifest, see :func:`delete_stale_manifests`.
+"""
+
+from collections import OrderedDict
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import six
+
+from kartothek.core import naming
+from kartothek.core.partition import Partition, PartitionMapping
+from kartothek.core.urlencode import unquote_indices
+
+LABEL_COLUMN = "partition"
+FILES_COLUMN_PREFIX = "files."
+PARTITION_KEYS_COLUMN_PREFIX = "partition_keys."
+
+
+class PartitionManifest(PartitionMapping):
+    """
+    Read-only mapping of partition labels to :class:`~kartothek.core.partition.Partition`
+    objects which is backed by one array per table and partition key.
+
+    The ``Partition`` objects are only created on access.
+
+    Parameters
+    ----------
+    labels: array-like
+        The partition labels
+    files: Dict[str, array-like]
+        Mapping of table names to the storage keys of the partition files. The keys
+        are aligned with ``labels``. Partitions without a file for a table hold ``None``.
+    partition_key_values: Dict[str, array-like], optional
+        Mapping of partition key columns to the decoded values of the partitions,
+        aligned with ``labels``.
+    """
+
+    def __init__(self, labels, files, partition_key_values=None):
+        self.labels = _to_object_array(labels)
+        self.files = OrderedDict(
+            (table, _to_object_array(keys)) for table, keys in six.iteritems(files)
+        )
+        self.partition_key_values = OrderedDict(
+            (column, _to_object_array(values))
+            for column, values in six.iteritems(partition_key_values or {})
+        )
+        for name, values in chain(
+            six.iteritems(self.files), six.iteritems(self.partition_key_values)
+        ):
+            if len(values) != len(self.labels):
+                raise ValueError(
+                    "Column `{}` of the partition manifest is not aligned with the labels".format(
+                        name
+                    )
+                )
+        self._positions = None
+
+    def __repr__(self):
+        return "PartitionManifest(partitions={}, tables={})".format(
+            len(self), self.tables
+        )
+
+    @property
+    def tables(self):
+        return list(self.files.keys())
+
+    def _position(self, label):
+        if self._positions is None:
+            self._positions = pd.Index(self.labels)
+        return self._positions.get_loc(label)
+
+    def _partition_at(self, position):
+        files = {}
+        for table, keys in six.iteritems(self.files):
+            if keys[position] is not None:
+                files[table] = keys[position]
+        return Partition(self.labels[position], files=files)
+
+    def __getitem__(self, label):
+        try:
+            position = self._position(label)
+        except TypeError:
+            raise KeyError(label)
+        return self._partition_at(position)
+
+    def __contains__(self, label):
+        try:
+            self._position(label)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def partition_key_columns(self):
+        """
+        Group the partition labels by the values of their partition keys.
+
+        Returns
+        -------
+        dict
+            ``{column: {value: [labels]}}``
+        """
+        result = {}
+        for column, values in six.iteritems(self.partition_key_values):
+            codes, uniques = pd.factorize(values)
+            result[column] = group_labels_by_codes(self.labels, codes, uniques)
+        return result
+
+    @staticmethod
+    def from_partitions(partitions, partition_keys=None):
+        """
+        Create a manifest from a mapping of labels to partitions.
+
+        Parameters
+        ----------
+        partitions: Dict[str, kartothek.core.partition.Partition]
+        partition_keys: List[str], optional
+            The partition keys whose values are decoded from the labels.
+
+        Returns
+        -------
+        PartitionManifest
+        """
+        if isinstance(partitions, PartitionManifest) and list(
+            partitions.partition_key_values.keys()
+        ) == list(partition_keys or []):
+            return partitions
+
+        labels = list(partitions.keys())
+        files = OrderedDict()
+        key_values = OrderedDict((column, []) for column in partition_keys or [])
+        for position, (label, partition) in enumerate(six.iteritems(partitions)):
+            for table, key in six.iteritems(partition.files):
+                if table not in files:
+                    files[table] = [None] * len(labels)
+                files[table][position] = key
+            if key_values:
+                indices = dict(unquote_indices(label.split("/")[:-1]))
+                for column, values in six.iteritems(key_values):
+                    values.append(indices.get(column))
+        return PartitionManifest(labels, files, key_values)
+
+    def to_table(self):
+        """
+        Render the manifest as a ``pyarrow.Table``.
+        """
+        names = [LABEL_COLUMN]
+        arrays = [pa.array(self.labels, type=pa.string())]
+        for table, keys in six.iteritems(self.files):
+            names.append(FILES_COLUMN_PREFIX + table)
+            arrays.append(pa.array(keys, type=pa.string()))
+        for column, values in six.iteritems(self.partition_key_values):
+            names.append(PARTITION_KEYS_COLUMN_PREFIX + column)
+            arrays.append(pa.array(values, type=pa.string()))
+        return pa.Table.from_arrays(arrays, names)
+
+    @staticmethod
+    def from_table(table):
+        """
+        Create a manifest from a ``pyarrow.Table`` as it is returned by :meth:`to_table`.
+        """
+        df = table.to_pandas()
+        files = OrderedDict()
+        key_values = OrderedDict()
+        for name in df.columns:
+            if name.startswith(FILES_COLUMN_PREFIX):
+                files[name[len(FILES_COLUMN_PREFIX) :]] = df[name].values
+            elif name.startswith(PARTITION_KEYS_COLUMN_PREFIX):
+                key_values[name[len(PARTITION_KEYS_COLUMN_PREFIX) :]] = df[name].values
+        return PartitionManifest(df[LABEL_COLUMN].values, files, key_values)
+
+    def store(self, store, key):
+        """
+        Store the manifest as Parquet file.
+
+        Parameters
+        ----------
+        store: Object
+            Object that implements the .put method for file/object storage.
+        key: str
+            The storage key of the manifest.
+
+        Returns
+        -------
+        key: str
+        """
+        store.put(key, self.to_buffer())
+        return key
+
+    def to_buffer(self):
+        """
+        Render the manifest as Parquet file.
+
+        Returns
+        -------
+        bytes
+        """
+        buf = pa.BufferOutputStream()
+        pq.write_table(self.to_table(), buf)
+        return buf.getvalue().to_pybytes()
+
+    @staticmethod
+    def load(store, key):
+        """
+        Load a manifest which was stored with :meth:`store`.
+
+        Parameters
+        ----------
+        store: Object
+            Object that implements the .get method for file/object loading.
+        key: str
+            The storage key of the manifest.
+
+        Returns
+        -------
+        PartitionManifest
+        """
+        table = pq.read_table(pa.BufferReader(store.get(key)))
+        return PartitionManifest.from_table(table)
+
+
+def delete_stale_manifests(store, dataset_uuid, keep):
+    """
+    Delete the manifests of a dataset which were replaced by ``keep``.
+
+    The manifest preceding ``keep`` is retained for readers which loaded the previous
+    header but not yet its manifest. Manifests newer than ``keep`` belong to
+    concurrent commits and are retained as well.
+
+    Parameters
+    ----------
+    store: simplekv.KeyValueStore
+    dataset_uuid: str
+    keep: str
+        The storage key of the manifest referenced by the current header.
+    """
+    prefix = naming.metadata_manifest_prefix_from_uuid(dataset_uuid)
+    # Manifest keys are tagged with their creation time
+    stale = sorted(key for key in store.iter_keys(prefix=prefix) if key < keep)
+    for key in stale[:-1]:
+        store.delete(key)
+
+
+def group_labels_by_codes(labels, codes, uniques):
+    """
+    Group labels by the factorized values they belong to.
+
+    Labels with a missing value (code ``-1``) are dropped.
+
+    Parameters
+    ----------
+    labels: numpy.ndarray
+    codes: numpy.ndarray
+        The codes as returned by :func:`pandas.factorize`, aligned with ``labels``.
+    uniques: array-like
+        The unique values as returned by :func:`pandas.factorize`.
+
+    Returns
+    -------
+    dict
+        ``{value: [labels]}``
+    """
+    valid = codes >= 0
+    if not valid.all():
+        labels = labels[valid]
+        codes = codes[valid]
+    order = np.argsort(codes, kind="mergesort")
+    sorted_labels = labels[order]
+    boundaries = np.cumsum(np.bincount(codes, minlength=len(uniques)))
+
+    result = {}
+    start = 0
+    for value, end in zip(uniques, boundaries):
+        result[value] = list(sorted_labels[start:end])
+        start = end
+    return result
+
+
+def _to_object_array(values):
+    result = np.empty(len(values), dtype=object)
+    result[:] = list(values)
+    return result
@@ -13,6 +13,8 @@ DEFAULT_METADATA_STORAGE_FORMAT = "json"
 # Format suffixes
 METADATA_FORMAT_JSON = ".json"
 METADATA_FORMAT_MSGPACK = ".msgpack.zstd"
+METADATA_MANIFEST_INFIX = ".partitions."
+METADATA_COMMIT_INFIX = ".commit."
 
 # Metadata suffixes
 METADATA_BASE_SUFFIX = ".by-dataset-metadata"
@@ -20,9 +22,12 @@ METADATA_BASE_SUFFIX = ".by-dataset-metadata"
 # Object suffixes
 PARQUET_FILE_SUFFIX = ".parquet"
 EXTERNAL_INDEX_SUFFIX = ".by-dataset-index{}".format(PARQUET_FILE_SUFFIX)
+MINMAX_INDEX_SUFFIX = ".by-dataset-minmax-index{}".format(PARQUET_FILE_SUFFIX)
 
 METADATA_VERSION_KEY = "dataset_metadata_version"
 UUID_KEY = "dataset_uuid"
+PARTITIONS_MANIFEST_KEY = "partitions_manifest"
+COMMIT_LOG_KEY = "commit_log"
 
 # Files/BLOB with special meaning
 
@@ -36,6 +41,26 @@ def metadata_key_from_uuid(uuid, format="json"):
         return uuid + METADATA_BASE_SUFFIX + METADATA_FORMAT_MSGPACK
 
 
+def metadata_manifest_prefix_from_uuid(uuid):
+    return uuid + METADATA_BASE_SUFFIX + METADATA_MANIFEST_INFIX
+
+
+def metadata_manifest_key_from_uuid(uuid, tag):
+    return metadata_manifest_prefix_from_uuid(uuid) + tag + PARQUET_FILE_SUFFIX
+
+
+def metadata_commit_prefix_from_uuid(uuid):
+    return uuid + METADATA_BASE_SUFFIX + METADATA_COMMIT_INFIX
+
+
+def metadata_commit_key_from_uuid(uuid, commit):
+    return "{prefix}{commit:012d}{suffix}".format(
+        prefix=metadata_commit_prefix_from_uuid(uuid),
+        commit=commit,
+        suffix=METADATA_FORMAT_JSON,
+    )
+
+
 def get_partition_file_prefix(
     dataset_uuid, partition_label, table, metadata_version=DEFAULT_METADATA_VERSION
 ):
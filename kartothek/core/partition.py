@@ -1,10 +1,19 @@
 # -*- coding: utf-8 -*-
 
 
+from bisect import bisect_left
+from collections import OrderedDict
+
 import six
 
+from kartothek.core._compat import Mapping, MutableMapping
+
 
 class Partition(object):
+
+    # Datasets may consist of millions of partitions
+    __slots__ = ("label", "files")
+
     def __init__(self, label, files=None, metadata=None):
         """
         An object for the internal representation of the metadata of a partition.
@@ -23,6 +32,12 @@ class Partition(object):
         self.label = label
         self.files = files if files else {}
 
+    def __getstate__(self):
+        return self.label, self.files
+
+    def __setstate__(self, state):
+        self.label, self.files = state
+
     def __eq__(self, other):
         if not isinstance(other, Partition):
             return False
@@ -39,13 +54,152 @@ class Partition(object):
 
     @staticmethod
     def from_v2_dict(label, dct):
-        if isinstance(dct, six.string_types):
-            raise ValueError(
-                "Trying to load a partition from a string. Probably the dataset file uses the multifile "
-                "feature. Please load the metadata object using the DatasetMetadata.load_from_buffer "
-                "method instead to resolve references to external partitions."
-            )
+        _raise_if_reference(dct)
         return Partition(label, files=dct.get("files", {}))
 
     def to_dict(self, version=None):
         return {"files": self.files}
+
+
+class PartitionMapping(Mapping):
+    """
+    Base class for read-only mappings of partition labels to
+    :class:`~kartothek.core.partition.Partition` objects which only create the
+    ``Partition`` objects on access.
+    """
+
+    _sorted_labels = None
+
+    def labels_with_prefix(self, prefix):
+        """
+        Return all partition labels starting with ``prefix`` in sorted order, e.g.
+        all labels of a given partition key value like ``"P=1/"``.
+        """
+        if self._sorted_labels is None:
+            self._sorted_labels = sorted(self)
+        labels = self._sorted_labels
+        result = []
+        for position in range(bisect_left(labels, prefix), len(labels)):
+            if not labels[position].startswith(prefix):
+                break
+            result.append(labels[position])
+        return result
+
+
+class LazyPartitions(PartitionMapping):
+    """
+    Mapping of partition labels to :class:`~kartothek.core.partition.Partition`
+    objects which is backed by the decoded partition dictionaries of the dataset
+    metadata.
+
+    Parameters
+    ----------
+    partitions: dict
+        The ``partitions`` entry of the dataset metadata, i.e. ``{label: {"files": {...}}}``
+    """
+
+    def __init__(self, partitions):
+        for dct in six.itervalues(partitions):
+            _raise_if_reference(dct)
+        self._partitions = partitions
+
+    def __getitem__(self, label):
+        return Partition(label, files=self._partitions[label].get("files", {}))
+
+    def __contains__(self, label):
+        return label in self._partitions
+
+    def __iter__(self):
+        return iter(self._partitions)
+
+    def __len__(self):
+        return len(self._partitions)
+
+
+class CopyOnWritePartitions(MutableMapping):
+    """
+    Mutable view on a mapping of partitions which records additions and removals
+    without modifying (or materializing) the underlying mapping.
+
+    Parameters
+    ----------
+    base: Mapping
+        The mapping of partition labels to partitions to build upon.
+    """
+
+    def __init__(self, base):
+        self._base = base
+        self._added = OrderedDict()
+        self._removed = set()
+
+    def _is_new(self, label):
+        return label not in self._base or label in self._removed
+
+    def __getitem__(self, label):
+        if label in self._added:
+            return self._added[label]
+        if label in self._removed:
+            raise KeyError(label)
+        return self._base[label]
+
+    def __setitem__(self, label, partition):
+        self._added[label] = partition
+
+    def __delitem__(self, label):
+        if label in self._added:
+            del self._added[label]
+            if label in self._base:
+                self._removed.add(label)
+        elif label in self._base and label not in self._removed:
+            self._removed.add(label)
+        else:
+            raise KeyError(label)
+
+    def __contains__(self, label):
+        return label in self._added or (
+            label in self._base and label not in self._removed
+        )
+
+    def __iter__(self):
+        for label in self._base:
+            if label not in self._removed:
+                yield label
+        for label in self._added:
+            if self._is_new(label):
+                yield label
+
+    def __len__(self):
+        num_new = sum(1 for label in self._added if self._is_new(label))
+        return len(self._base) - len(self._removed) + num_new
+
+    def labels_with_prefix(self, prefix):
+        """
+        Return all partition labels starting with ``prefix`` in sorted order.
+        """
+        if isinstance(self._base, PartitionMapping):
+            labels = [
+                label
+                for label in self._base.labels_with_prefix(prefix)
+                if label not in self._removed
+            ]
+        else:
+            labels = [
+                label
+                for label in self._base
+                if label.startswith(prefix) and label not in self._removed
+            ]
+        labels.extend(
+            label
+            for label in self._added
+            if label.startswith(prefix) and self._is_new(label)
+        )
+        return sorted(labels)
+
+
+def _raise_if_reference(dct):
+    if isinstance(dct, six.string_types):
+        raise ValueError(
+            "Trying to load a partition from a string. Probably the dataset file uses the multifile "
+            "feature. Please load the metadata object using the DatasetMetadata.load_from_buffer "
+            "method instead to resolve references to external partitions."
+        )
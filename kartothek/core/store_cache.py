@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+Local on-disk cache for the immutable files of datasets.
+
+Partition and index files are not modified by kartothek once they are written, it
+only adds and removes whole files. Metadata files like the dataset metadata or the
+table schemas are updated in place and are always read from the wrapped store.
+
+Wrap a store factory to use the cache wherever a store factory is accepted:
+
+.. code::
+
+    >>> from kartothek.core.store_cache import DiskCacheStoreFactory
+    >>> from kartothek.io.eager import read_table
+
+    >>> store_factory = DiskCacheStoreFactory(
+    ...     remote_store_factory, cache_dir="/tmp/kartothek", max_bytes=10 * 2 ** 30
+    ... )
+    >>> df = read_table("dataset_uuid", store_factory, table="table")
+    >>> store_factory.cache_info()
+
+The cache directory can be shared by several processes on the same machine, also
+for different stores: cached files are named by the identity of the wrapped store
+(see :func:`~kartothek.core.utils.store_identity`) and the key. Files are written
+atomically and the least recently used files are evicted once the size of the
+directory exceeds ``max_bytes``. Stores which cannot be identified, e.g. in-memory
+stores, are not cached.
+
+Partition labels may be chosen by the user, so a dataset overwritten with the same
+labels writes new files under existing keys. Writes and deletes through a
+:class:`DiskCacheStore` drop the cached copy, writes bypassing the cache are not
+detected.
+"""
+
+import errno
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import namedtuple
+
+from simplekv.decorator import StoreDecorator
+
+from kartothek.core import naming
+from kartothek.core.utils import store_identity
+
+_TEMP_PREFIX = ".tmp-"
+
+# Fraction of ``max_bytes`` the directory is shrunk to by an eviction, so that the
+# directory is not listed on every miss once it is full
+_EVICTION_TARGET = 0.9
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions"])
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+
+def is_immutable_key(key):
+    """
+    Whether the key refers to a partition or index file, which never change.
+    """
+    return (
+        key.endswith(naming.PARQUET_FILE_SUFFIX)
+        and naming.METADATA_BASE_SUFFIX not in key
+    )
+
+
+def _ignore_missing(func, *args):
+    try:
+        return func(*args)
+    except (IOError, OSError) as err:
+        if err.errno != errno.ENOENT:
+            raise
+        return None
+
+
+class _CacheStats(object):
+    """
+    Thread-safe counters of cache hits, misses and evictions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def count(self, hits=0, misses=0, evictions=0):
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._evictions += evictions
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions)
+
+
+class _CacheDirectory(object):
+    """
+    Size of a cache directory as tracked by this process.
+
+    The size is determined by listing the directory once and then updated with the
+    files added and removed by this process. Files added by other processes are
+    accounted for when the directory is listed again for an eviction.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.size = sum(size for _, size, _ in self.list_files())
+
+    def list_files(self):
+        entries = []
+        for name in os.listdir(self.path):
+            if name.startswith(_TEMP_PREFIX):
+                continue
+            path = os.path.join(self.path, name)
+            stat = _ignore_missing(os.stat, path)
+            if stat is not None:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def added(self, size):
+        with self.lock:
+            self.size += size
+
+    def remove(self, path):
+        stat = _ignore_missing(os.stat, path)
+        if stat is None:
+            return
+        try:
+            os.remove(path)
+        except (IOError, OSError) as err:
+            # Another process may have removed the file already
+            if err.errno != errno.ENOENT:
+                raise
+            return
+        with self.lock:
+            self.size = max(self.size - stat.st_size, 0)
+
+    def evict(self, max_bytes):
+        """
+        Remove the least recently used files once the directory exceeds ``max_bytes``.
+
+        Returns
+        -------
+        int
+            The number of evicted files.
+        """
+        with self.lock:
+            if self.size <= max_bytes:
+                return 0
+            entries = self.list_files()
+            size = sum(entry_size for _, entry_size, _ in entries)
+            evictions = 0
+            for _, entry_size, path in sorted(entries):
+                if size <= max_bytes * _EVICTION_TARGET:
+                    break
+                # Another process may have evicted the file already
+                _ignore_missing(os.remove, path)
+                size -= entry_size
+                evictions += 1
+            self.size = size
+            return evictions
+
+
+def _get_cache_directory(path):
+    path = os.path.abspath(path)
+    with _directories_lock:
+        directory = _directories.get(path)
+        if directory is None:
+            try:
+                os.makedirs(path)
+            except OSError as err:
+                if err.errno != errno.EEXIST:
+                    raise
+            directory = _directories[path] = _CacheDirectory(path)
+        return directory
+
+
+class DiskCacheStore(StoreDecorator):
+    """
+    Store decorator which serves reads of immutable files from a local directory.
+
+    ``get`` and ``open`` of cacheable keys are answered from the cache directory.
+    On a miss, the object is fetched from the wrapped store and added to the cache.
+    ``put``, ``put_file`` and ``delete`` drop the cached copy. All other operations
+    are passed through to the wrapped store.
+
+    Parameters
+    ----------
+    store: simplekv.KeyValueStore
+        The wrapped store.
+    cache_dir: str
+        Local directory holding the cached files.
+    max_bytes: int
+        Size budget of the cache directory.
+    is_cacheable: callable, optional
+        Decides which keys are cached. Defaults to :func:`is_immutable_key`.
+    """
+
+    def __init__(self, store, cache_dir, max_bytes, is_cacheable=None, stats=None):
+        super(DiskCacheStore, self).__init__(store)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.is_cacheable = is_cacheable or is_immutable_key
+        self._stats = stats if stats is not None else _CacheStats()
+        self._directory = _get_cache_directory(cache_dir)
+        identity = store_identity(store)
+        self._identity = None if identity is None else repr(identity)
+
+    def cache_info(self):
+        """
+        Return the number of cache hits, misses and evictions of this store.
+
+        Stores created by a :class:`DiskCacheStoreFactory` share the counters of the
+        factory.
+
+        Returns
+        -------
+        CacheInfo
+        """
+        return self._stats.info()
+
+    def _is_cached(self, key):
+        return self._identity is not None and self.is_cacheable(key)
+
+    def _path(self, key):
+        name = u"{}\0{}".format(self._identity, key)
+        return os.path.join(
+            self.cache_dir, hashlib.sha256(name.encode("utf-8")).hexdigest()
+        )
+
+    def _open_cached(self, key):
+        path = self._path(key)
+        fp = _ignore_missing(io.open, path, "rb")
+        if fp is not None:
+            # The modification time serves as the access time of the LRU eviction
+            _ignore_missing(os.utime, path, None)
+            self._stats.count(hits=1)
+        return fp
+
+    def _fetch(self, key):
+        self._stats.count(misses=1)
+        data = self._dstore.get(key)
+        if len(data) <= self.max_bytes:
+            self._add(key, data)
+        return data
+
+    def _add(self, key, data):
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            # Renaming is atomic, concurrent readers either see the complete file
+            # or no file at all.
+            os.rename(tmp_path, path)
+        except Exception:
+            _ignore_missing(os.remove, tmp_path)
+            # The file was added concurrently (renaming onto an existing file
+            # fails on Windows)
+            if not os.path.exists(path):
+                raise
+        else:
+            self._directory.added(len(data))
+        self._stats.count(evictions=self._directory.evict(self.max_bytes))
+
+    def _invalidate(self, key):
+        if self._is_cached(key):
+            self._directory.remove(self._path(key))
+
+    def get(self, key):
+        if not self._is_cached(key):
+            return self._dstore.get(key)
+        fp = self._open_cached(key)
+        if fp is None:
+            return self._fetch(key)
+        with fp:
+            return fp.read()
+
+    def open(self, key):
+        if not self._is_cached(key):
+            return self._dstore.open(key)
+        fp = self._open_cached(key)
+        if fp is None:
+            fp = io.BytesIO(self._fetch(key))
+        return fp
+
+    def put(self, key, data, *args, **kwargs):
+        result = self._dstore.put(key, data, *args, **kwargs)
+        self._invalidate(key)
+        return result
+
+    def put_file(self, key, file, *args, **kwargs):
+        result = self._dstore.put_file(key, file, *args, **kwargs)
+        self._invalidate(key)
+        return result
+
+    def delete(self, key):
+        self._invalidate(key)
+        return self._dstore.delete(key)
+
+
+class DiskCacheStoreFactory(object):
+    """
+    Store factory returning a :class:`DiskCacheStore` around the store of
+    ``store_factory``.
+
+    The factory can be serialized if ``store_factory`` can be serialized, e.g. to
+    be used with dask. All stores created by it share the cache directory.
+
+    The counters of :meth:`cache_info` are shared by all stores created by the
+    factory in this process.
+
+    Parameters
+    ----------
+    store_factory: callable
+        Factory of the wrapped store.
+    cache_dir: str
+        Local directory holding the cached files.
+    max_bytes: int
+        Size budget of the cache directory.
+    is_cacheable: callable, optional
+        Decides which keys are cached. Defaults to :func:`is_immutable_key`.
+    """
+
+    def __init__(self, store_factory, cache_dir, max_bytes, is_cacheable=None):
+        self.store_factory = store_factory
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.is_cacheable = is_cacheable
+        self._stats = _CacheStats()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Counters are kept per process
+        del state["_stats"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._stats = _CacheStats()
+
+    def cache_info(self):
+        """
+        Return the number of cache hits, misses and evictions of all stores created
+        by this factory.
+
+        Returns
+        -------
+        CacheInfo
+        """
+        return self._stats.info()
+
+    def __call__(self):
+        return DiskCacheStore(
+            self.store_factory(),
+            cache_dir=self.cache_dir,
+            max_bytes=self.max_bytes,
+            is_cacheable=self.is_cacheable,
+            stats=self._stats,
+        )
@@ -1,10 +1,47 @@
 # -*- coding: utf-8 -*-
 
 
+from functools import wraps
+
+import numpy as np
+import pandas as pd
 import six
 from six.moves.urllib.parse import quote as six_quote
 from six.moves.urllib.parse import unquote as six_unquote
 
+# Partition columns usually only hold a handful of distinct values. The caches are
+# bounded nevertheless and simply start over once they are full.
+_CACHE_SIZE = 2 ** 16
+
+
+def _memoize(func):
+    cache = {}
+
+    @wraps(func)
+    def wrapper(text):
+        try:
+            return cache[text]
+        except KeyError:
+            pass
+        result = func(text)
+        if len(cache) >= _CACHE_SIZE:
+            cache.clear()
+        cache[text] = result
+        return result
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+@_memoize
+def _quote_text(text):
+    return six_quote(text.encode("utf-8"))
+
+
+@_memoize
+def _unquote_text(text):
+    return six_unquote(text)
+
 
 def quote(value):
     """
@@ -15,17 +52,78 @@ def quote(value):
         value = str(value)
     if isinstance(value, six.binary_type):
         value = value.decode("utf-8")
-    r_val = six_quote(value.encode("utf-8"))
-    return r_val
+    return _quote_text(value)
 
 
 def unquote(value):
     """
     Decodes a urlencoded string and performs necessary decoding depending on the used python version.
     """
+    if isinstance(value, six.text_type):
+        return _unquote_text(value)
     return six_unquote(value)
 
 
+def _apply_to_uniques(func, values):
+    values = np.asarray(values, dtype=object)
+    if values.ndim != 1:
+        raise ValueError("Only one dimensional arrays can be encoded")
+    if len(values) == 0:
+        return values
+    # Factorizing compares values by equality which would merge e.g. ``1``, ``1.0``
+    # and ``True``. Those need to be treated element-wise to keep their encoding.
+    inferred_type = pd.api.types.infer_dtype(values, skipna=False)
+    if inferred_type.startswith("mixed"):
+        return np.array([func(value) for value in values], dtype=object)
+    codes, uniques = pd.factorize(values)
+    result = np.empty(len(uniques) + 1, dtype=object)
+    result[:-1] = [func(value) for value in uniques]
+    # Missing values are not factorized and ``0.0`` and ``-0.0`` are equal
+    elementwise = codes == -1
+    if inferred_type == "floating":
+        elementwise |= values == 0
+    if elementwise.any():
+        result = result[codes]
+        result[elementwise] = [func(value) for value in values[elementwise]]
+        return result
+    return result[codes]
+
+
+def quote_array(values):
+    """
+    Urlencode all entries of a one dimensional array-like. Every distinct value is
+    only encoded once and the result is identical to calling :func:`quote` on every
+    single entry.
+
+    Parameters
+    ----------
+    values: array-like
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array holding the urlencoded strings
+    """
+    return _apply_to_uniques(quote, values)
+
+
+def unquote_array(values):
+    """
+    Decode all entries of a one dimensional array-like of urlencoded strings. Every
+    distinct value is only decoded once.
+
+    Parameters
+    ----------
+    values: array-like
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array holding the decoded strings
+    """
+    return _apply_to_uniques(unquote, values)
+
+
 def decode_key(key):
     """
     Split a given key into its kartothek components `{dataset_uuid}/{table}/{key_indices}/{filename}`
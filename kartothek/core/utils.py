@@ -1,5 +1,26 @@
+import os
+import re
+
+from simplekv.decorator import StoreDecorator
+from simplekv.fs import FilesystemStore
+
 from kartothek.core.naming import MAX_METADATA_VERSION, MIN_METADATA_VERSION
 
+try:
+    from simplekv.net.botostore import BotoStore
+except ImportError:  # pragma: no cover
+    BotoStore = None
+
+try:
+    from simplekv.net.azurestore import AzureBlockBlobStore
+except ImportError:  # pragma: no cover
+    AzureBlockBlobStore = None
+
+# Parts of an Azure connection string which select the storage account, i.e. no secrets
+_AZURE_LOCATION_RE = re.compile(
+    r"(?:^|;)\s*(AccountName|BlobEndpoint|EndpointSuffix)=([^;]*)"
+)
+
 
 def _check_callable(store_factory, obj_type="store"):
     if not callable(store_factory):
@@ -17,3 +38,37 @@ def verify_metadata_version(metadata_version):
         raise NotImplementedError(
             "Future metadata version `{}` encountered.".format(metadata_version)
         )
+
+
+def store_identity(store):
+    """
+    Return a hashable value identifying the storage location behind ``store``.
+
+    Two stores with equal identities return the same data for the same key, e.g. two
+    :class:`~simplekv.fs.FilesystemStore` instances on the same directory. Stores of
+    other types, e.g. in-memory stores, cannot be identified and must not be cached.
+
+    Parameters
+    ----------
+    store: simplekv.KeyValueStore
+
+    Returns
+    -------
+    Optional[tuple]
+        ``None`` if the store cannot be identified.
+    """
+    if isinstance(store, StoreDecorator):
+        inner = store_identity(store._dstore)
+        if inner is None:
+            return None
+        # Decorators may transform the keys, e.g. add a prefix
+        return (type(store).__name__, getattr(store, "prefix", None), inner)
+    if isinstance(store, FilesystemStore):
+        return ("file", os.path.abspath(store.root))
+    if BotoStore is not None and isinstance(store, BotoStore):
+        host = getattr(store.bucket.connection, "host", None)
+        return ("s3", host, store.bucket.name, store.prefix)
+    if AzureBlockBlobStore is not None and isinstance(store, AzureBlockBlobStore):
+        location = tuple(sorted(_AZURE_LOCATION_RE.findall(store.conn_string or "")))
+        return ("azure", location, store.container)
+    return None
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+Graph optimization pushing simple filters and column selections of a dask
+DataFrame down into the kartothek reads of :func:`~kartothek.io.dask.dataframe.read_dataset_as_ddf`.
+"""
+
+import operator
+from collections import defaultdict
+from itertools import chain
+
+import pandas as pd
+import six
+from dask.core import flatten, get_dependencies, istask
+from dask.dataframe.optimize import optimize as _dataframe_optimize
+from dask.highlevelgraph import HighLevelGraph
+from dask.optimization import SubgraphCallable, cull
+from dask.utils import ensure_dict
+
+from kartothek.serialization._parquet import _normalize_value
+
+from .delayed import _load_metapartitions
+
+READ_LAYER_PREFIX = "read-dataset-as-ddf-"
+
+_COMPARISON_OPERATORS = {
+    operator.eq: "==",
+    operator.ne: "!=",
+    operator.lt: "<",
+    operator.le: "<=",
+    operator.gt: ">",
+    operator.ge: ">=",
+}
+
+# The operator to use if the operands of a comparison are swapped, e.g. `3 < x`
+_REFLECTED_OPERATORS = {
+    operator.eq: operator.eq,
+    operator.ne: operator.ne,
+    operator.lt: operator.gt,
+    operator.le: operator.ge,
+    operator.gt: operator.lt,
+    operator.ge: operator.le,
+}
+
+# Positions of the arguments of a read task
+# (_load_ddf_partition, mps, dispatch_metadata, columns, predicates, filters, options)
+_DISPATCH_METADATA = 2
+_COLUMNS = 3
+_FILTERS = 5
+_OPTIONS = 6
+
+
+def _load_ddf_partition(mps, dispatch_metadata, columns, predicates, filters, options):
+    """
+    Load a single partition of a DataFrame created by
+    :func:`~kartothek.io.dask.dataframe.read_dataset_as_ddf`.
+
+    ``columns`` and ``filters`` are separate arguments of the task, such that
+    they can be rewritten by :func:`optimize_kartothek_reads`.
+
+    Parameters
+    ----------
+    mps: Union[MetaPartition, List[MetaPartition]]
+        The MetaPartitions without dataset metadata. Multiple MetaPartitions are
+        concatenated into a single DataFrame.
+    dispatch_metadata: kartothek.io_components.read.DispatchMetadata
+    columns: List[str]
+        The columns of the returned DataFrame, including the index column.
+    predicates: Optional[List[List[Tuple[str, str, Any]]]]
+        The ``predicates`` of the read.
+    filters: Optional[List[Tuple[str, str, Any]]]
+        A conjunction of filters applied to the DataFrame, which were pushed
+        down into the read. They are added to every conjunction of ``predicates``.
+    options: dict
+        The remaining, static arguments of the read.
+    """
+    table = options["table"]
+    index = options["dask_index_on"]
+
+    load_columns = list(columns)
+    for column, _, _ in chain(chain.from_iterable(predicates or []), filters or []):
+        if column not in load_columns:
+            load_columns.append(column)
+    if index is not None and index not in load_columns:
+        load_columns.append(index)
+
+    if filters:
+        if predicates:
+            predicates = [list(conjunction) + filters for conjunction in predicates]
+        else:
+            predicates = [filters]
+
+    categoricals_from_index = options["categoricals_from_index"]
+    if categoricals_from_index:
+        categoricals_from_index = {table: categoricals_from_index}
+    mp = _load_metapartitions(
+        mps,
+        dispatch_metadata,
+        categoricals_from_index=categoricals_from_index,
+        store=options["store"],
+        tables=[table],
+        columns={table: load_columns},
+        categoricals={table: options["categoricals"]},
+        predicate_pushdown_to_io=options["predicate_pushdown_to_io"],
+        dates_as_object=options["dates_as_object"],
+        predicates=predicates,
+    )
+    df = mp.data[table]
+
+    if index is not None:
+        # A stable sort keeps the order of rows with equal index values
+        df = df.set_index(index).sort_index(kind="mergesort")
+
+    columns = [column for column in columns if column != index]
+    if list(df.columns) != columns:
+        df = df[columns]
+    return df
+
+
+def _is_key(dsk, obj):
+    try:
+        return obj in dsk
+    except TypeError:
+        return False
+
+
+def _is_read(dsk, key):
+    if not _is_key(dsk, key):
+        return False
+    task = dsk[key]
+    return istask(task) and task[0] is _load_ddf_partition
+
+
+def _unpack_task(task):
+    """
+    Return the task as a tuple ``(func, *args)``.
+
+    dask wraps the operations of blockwise layers into a ``SubgraphCallable``. If
+    the callable consists of a single operation, its arguments are inlined.
+    """
+    if not istask(task):
+        return None
+    func, args = task[0], task[1:]
+    if isinstance(func, SubgraphCallable):
+        if len(func.dsk) != 1 or func.outkey not in func.dsk:
+            return None
+        inner = func.dsk[func.outkey]
+        if not istask(inner):
+            return None
+        mapping = dict(zip(func.inkeys, args))
+        unpacked = [inner[0]]
+        for arg in inner[1:]:
+            if _is_key(mapping, arg):
+                unpacked.append(mapping[arg])
+            elif istask(arg) or isinstance(arg, list):
+                # Nested expressions are not supported
+                return None
+            else:
+                unpacked.append(arg)
+        return tuple(unpacked)
+    return task
+
+
+def _column_access(dsk, key):
+    """
+    Return ``(read_key, column)`` if ``key`` selects a single column of a read.
+    """
+    if not _is_key(dsk, key):
+        return None
+    task = _unpack_task(dsk[key])
+    if (
+        task is not None
+        and len(task) == 3
+        and task[0] is operator.getitem
+        and _is_read(dsk, task[1])
+        and isinstance(task[2], six.string_types)
+    ):
+        return task[1], task[2]
+    return None
+
+
+def _accepts_value(dsk, read_key, column, value):
+    """
+    Check whether ``value`` can be compared to the column in kartothek predicates.
+
+    The predicate evaluation of kartothek is stricter about types than pandas,
+    a comparison it would reject is therefore not pushed down.
+    """
+    if not pd.api.types.is_scalar(value) or _is_key(dsk, value):
+        return False
+    task = dsk[read_key]
+    schema = dsk[task[_DISPATCH_METADATA]].table_meta[task[_OPTIONS]["table"]]
+    if column not in schema.names:
+        return False
+    try:
+        _normalize_value(value, schema.field_by_name(column).type)
+    except TypeError:
+        return False
+    return True
+
+
+def _mask_to_conjunction(dsk, key, read_key):
+    """
+    Convert a boolean mask on ``read_key`` into a conjunction of predicates.
+
+    Returns ``None`` if the mask is not an AND of simple comparisons between a
+    column of ``read_key`` and a scalar.
+    """
+    if not _is_key(dsk, key):
+        return None
+    task = _unpack_task(dsk[key])
+    if task is None or len(task) != 3:
+        return None
+    func, left, right = task
+
+    if func is operator.and_:
+        left = _mask_to_conjunction(dsk, left, read_key)
+        right = _mask_to_conjunction(dsk, right, read_key)
+        if left is None or right is None:
+            return None
+        return left + right
+
+    if not _is_key(_COMPARISON_OPERATORS, func):
+        return None
+    access, value = _column_access(dsk, left), right
+    if access is None:
+        access, value = _column_access(dsk, right), left
+        func = _REFLECTED_OPERATORS[func]
+    if access is None or access[0] != read_key:
+        return None
+    column = access[1]
+    if not _accepts_value(dsk, read_key, column, value):
+        return None
+    return [(column, _COMPARISON_OPERATORS[func], value)]
+
+
+def _push_down_filters(dsk):
+    """
+    Replace filters ``df[mask]`` on a read by a read with additional filters.
+    """
+    changed = True
+    while changed:
+        changed = False
+        for key, task in list(six.iteritems(dsk)):
+            task = _unpack_task(task)
+            if task is None or len(task) != 3 or task[0] is not operator.getitem:
+                continue
+            _, read_key, mask = task
+            if not _is_read(dsk, read_key):
+                continue
+            conjunction = _mask_to_conjunction(dsk, mask, read_key)
+            if conjunction is None:
+                continue
+
+            read = dsk[read_key]
+            filters = list(read[_FILTERS] or []) + conjunction
+            dsk[key] = read[:_FILTERS] + (filters,) + read[_FILTERS + 1 :]
+            changed = True
+
+
+def _prune_columns(dsk, output_keys):
+    """
+    Only load the columns of a read which are selected by its dependents.
+    """
+    dependents = defaultdict(list)
+    for key in dsk:
+        for dependency in get_dependencies(dsk, key):
+            dependents[dependency].append(key)
+
+    for read_key in list(dsk):
+        if not _is_read(dsk, read_key) or read_key in output_keys:
+            continue
+        needed = set()
+        for dependent in dependents[read_key]:
+            task = _unpack_task(dsk[dependent])
+            if (
+                task is None
+                or len(task) != 3
+                or task[0] is not operator.getitem
+                or task[1] != read_key
+            ):
+                break
+            selection = task[2]
+            if isinstance(selection, six.string_types):
+                needed.add(selection)
+            elif isinstance(selection, list) and all(
+                isinstance(column, six.string_types) for column in selection
+            ):
+                needed.update(selection)
+            else:
+                break
+        else:
+            read = dsk[read_key]
+            columns = read[_COLUMNS]
+            if not needed or not needed.issubset(columns):
+                continue
+            columns = [column for column in columns if column in needed]
+            dsk[read_key] = read[:_COLUMNS] + (columns,) + read[_COLUMNS + 1 :]
+
+
+def optimize_kartothek_reads(dsk, keys, **kwargs):
+    """
+    Optimize the graph of a dask DataFrame.
+
+    Filters of the form ``df[(df.x > 1) & (df.y == "a")]`` directly applied to a
+    DataFrame read by :func:`~kartothek.io.dask.dataframe.read_dataset_as_ddf`
+    are turned into predicates of the read and only the columns selected from
+    the read are loaded. Afterwards, the default optimizations of
+    ``dask.dataframe`` are applied.
+
+    As for ``predicates``, the index of a filtered partition may differ from the
+    one of ``df[mask]`` unless it is given by ``dask_index_on``.
+
+    The optimization is opt-in, enable it with the ``dataframe_optimize`` option
+    of dask:
+
+    .. code::
+
+        >>> with dask.config.set(dataframe_optimize=optimize_kartothek_reads):
+        ...     df = ddf[ddf.x > 1].compute()
+    """
+    if isinstance(dsk, HighLevelGraph) and any(
+        name.startswith(READ_LAYER_PREFIX) for name in dsk.layers
+    ):
+        output_keys = list(flatten(keys)) if isinstance(keys, list) else [keys]
+        dsk = ensure_dict(dsk)
+        _push_down_filters(dsk)
+        dsk, _ = cull(dsk, output_keys)
+        _prune_columns(dsk, set(output_keys))
+    return _dataframe_optimize(dsk, keys, **kwargs)
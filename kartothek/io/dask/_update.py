@@ -26,6 +26,7 @@ def _update_dask_partitions_shuffle(
     dataset_uuid,
     num_buckets,
     sort_partitions_by,
+    minmax_indices=None,
 ):
     splits = np.array_split(
         np.arange(ddf.npartitions), min(ddf.npartitions, num_buckets)
@@ -41,6 +42,7 @@ def _update_dask_partitions_shuffle(
             partial(
                 _store_partition,
                 secondary_indices=secondary_indices,
+                minmax_indices=minmax_indices,
                 sort_partitions_by=sort_partitions_by,
                 table=table,
                 dataset_uuid=dataset_uuid,
@@ -64,6 +66,7 @@ def _update_dask_partitions_one_to_one(
     df_serializer,
     dataset_uuid,
     sort_partitions_by,
+    minmax_indices=None,
 ):
     input_to_mps = partial(
         parse_input_to_metapartition, metadata_version=metadata_version
@@ -78,8 +81,13 @@ def _update_dask_partitions_one_to_one(
         )
     if partition_on:
         mps = map_delayed(mps, MetaPartition.partition_on, partition_on)
-    if secondary_indices:
-        mps = map_delayed(mps, MetaPartition.build_indices, secondary_indices)
+    if secondary_indices or minmax_indices:
+        mps = map_delayed(
+            mps,
+            MetaPartition.build_indices,
+            secondary_indices,
+            minmax_columns=minmax_indices,
+        )
 
     return map_delayed(
         mps,
@@ -100,6 +108,7 @@ def _store_partition(
     store_factory,
     df_serializer,
     metadata_version,
+    minmax_indices=None,
 ):
     store = store_factory()
     # I don't have access to the group values
@@ -112,8 +121,8 @@ def _store_partition(
         mps = mps.apply(partial(sort_values_categorical, column=sort_partitions_by))
     if partition_on:
         mps = mps.partition_on(partition_on)
-    if secondary_indices:
-        mps = mps.build_indices(secondary_indices)
+    if secondary_indices or minmax_indices:
+        mps = mps.build_indices(secondary_indices, minmax_columns=minmax_indices)
     return mps.store_dataframes(
         store=store, dataset_uuid=dataset_uuid, df_serializer=df_serializer
     )
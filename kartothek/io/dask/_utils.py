@@ -7,6 +7,8 @@ import pandas as pd
 import six
 from dask import delayed
 
+from kartothek.core.index import ExplicitSecondaryIndex, PartitionIndex
+
 CATEGORICAL_EFFICIENCY_WARN_LIMIT = 100000
 
 
@@ -34,7 +36,9 @@ def _maybe_get_categoricals_from_index(dataset_metadata_factory, categoricals):
                 continue
             categoricals_from_index[table] = {}
             for cat in table_cat:
-                if cat in dataset_metadata_factory.indices:
+                index = dataset_metadata_factory.indices.get(cat)
+                # Only explicit indices hold the values of the column
+                if isinstance(index, (PartitionIndex, ExplicitSecondaryIndex)):
                     cat_dtype = _construct_categorical(cat, dataset_metadata_factory)
                     categoricals_from_index[table][cat] = cat_dtype
     return categoricals_from_index
@@ -38,6 +38,8 @@ def store_bag_as_dataset(
     partition_on=None,
     metadata_storage_format=naming.DEFAULT_METADATA_STORAGE_FORMAT,
     secondary_indices=None,
+    minmax_indices=None,
+    checkpoint_interval=None,
 ):
     """
     Transform and store a dask.bag of dictionaries containing
@@ -71,8 +73,12 @@ def store_bag_as_dataset(
     if partition_on:
         mps = mps.map(MetaPartition.partition_on, partition_on=partition_on)
 
-    if secondary_indices:
-        mps = mps.map(MetaPartition.build_indices, columns=secondary_indices)
+    if secondary_indices or minmax_indices:
+        mps = mps.map(
+            MetaPartition.build_indices,
+            columns=secondary_indices,
+            minmax_columns=minmax_indices,
+        )
 
     mps = mps.map(
         MetaPartition.store_dataframes,
@@ -88,6 +94,7 @@ def store_bag_as_dataset(
         dataset_metadata=metadata,
         metadata_merger=metadata_merger,
         metadata_storage_format=metadata_storage_format,
+        checkpoint_interval=checkpoint_interval,
     )
 
     result = mps.reduction(perpartition=list, aggregate=aggregate, split_every=False)
@@ -4,23 +4,35 @@
 import dask
 import dask.dataframe as dd
 import numpy as np
+from dask.highlevelgraph import HighLevelGraph
 
 from kartothek.core.common_metadata import empty_dataframe_from_schema
 from kartothek.core.factory import _ensure_factory
 from kartothek.core.naming import DEFAULT_METADATA_VERSION
+from kartothek.core.uuid import gen_uuid
 from kartothek.io_components.docs import default_docs
 from kartothek.io_components.metapartition import parse_input_to_metapartition
+from kartothek.io_components.read import (
+    DispatchMetadata,
+    dispatch_metapartitions_from_factory,
+    get_dispatch_bounds,
+)
 from kartothek.io_components.update import update_dataset_from_partitions
 from kartothek.io_components.utils import (
     _ensure_compatible_indices,
+    _ensure_compatible_minmax_indices,
     check_single_table_dataset,
     normalize_arg,
     validate_partition_keys,
 )
 
+from ._optimize import (  # noqa: F401
+    READ_LAYER_PREFIX,
+    _load_ddf_partition,
+    optimize_kartothek_reads,
+)
 from ._update import _update_dask_partitions_one_to_one, _update_dask_partitions_shuffle
 from ._utils import _maybe_get_categoricals_from_index
-from .delayed import read_table_as_delayed
 
 
 @default_docs
@@ -36,6 +48,8 @@ def read_dataset_as_ddf(
     dates_as_object=False,
     predicates=None,
     factory=None,
+    target_partition_size=None,
+    dask_index_on=None,
 ):
     """
     Retrieve a single table from a dataset as partition-individual :class:`~dask.dataframe.DataFrame` instance.
@@ -43,6 +57,23 @@ def read_dataset_as_ddf(
     Please take care when using categoricals with Dask. For index columns, this function will construct dataset
     wide categoricals. For all other columns, Dask will determine the categories on a partition level and will
     need to merge them when shuffling data.
+
+    Parameters
+    ----------
+    dask_index_on: str, optional
+        Use this column as the index of the dask DataFrame and order the partitions by it, such that the
+        divisions of the DataFrame are known. The column needs to be a partition key or have a min/max index.
+        Partitions whose values overlap are concatenated.
+
+    Notes
+    -----
+    With :func:`~kartothek.io.dask.dataframe.optimize_kartothek_reads` configured as ``dataframe_optimize``
+    in the dask config, filters of the form ``ddf[(ddf.x > 1) & (ddf.y == "a")]`` and column selections which
+    are directly applied to the returned DataFrame are pushed down into the reads, i.e. the filters are
+    evaluated as ``predicates`` of the partitions, using partition keys and row group statistics, and only
+    the selected columns are loaded. As for ``predicates``, the index of the filtered partitions may differ
+    from the one of ``ddf[mask]`` unless it is given by ``dask_index_on``. The number of partitions is determined when the
+    DataFrame is created, pass ``predicates`` to skip partitions based on the indices.
     """
     ds_factory = _ensure_factory(
         dataset_uuid=dataset_uuid,
@@ -52,6 +83,9 @@ def read_dataset_as_ddf(
     )
     if isinstance(columns, dict):
         columns = columns[table]
+    if dask_index_on is not None and columns is not None:
+        if dask_index_on not in columns:
+            columns = list(columns) + [dask_index_on]
     meta = _get_dask_meta_for_dataset(
         ds_factory, table, columns, categoricals, dates_as_object
     )
@@ -59,20 +93,56 @@ def read_dataset_as_ddf(
     if columns is None:
         columns = list(meta.columns)
 
-    # that we can use factories instead of dataset_uuids
-    delayed_partitions = read_table_as_delayed(
-        factory=ds_factory,
-        table=table,
-        columns=columns,
+    mps = dispatch_metapartitions_from_factory(
+        dataset_factory=ds_factory,
         concat_partitions_on_primary_index=concat_partitions_on_primary_index,
-        predicate_pushdown_to_io=predicate_pushdown_to_io,
-        categoricals={table: categoricals},
         label_filter=label_filter,
-        dates_as_object=dates_as_object,
         predicates=predicates,
+        dispatch_metadata=False,
+        target_partition_size=target_partition_size,
+        dispatch_by=dask_index_on,
     )
+    categoricals_from_index = _maybe_get_categoricals_from_index(
+        ds_factory, {table: categoricals}
+    )
+    options = {
+        "store": ds_factory.store_factory,
+        "table": table,
+        "categoricals": categoricals,
+        "categoricals_from_index": categoricals_from_index.get(table),
+        "predicate_pushdown_to_io": predicate_pushdown_to_io,
+        "dates_as_object": dates_as_object,
+        "dask_index_on": dask_index_on,
+    }
+
+    # The tasks of this layer are recognized by ``optimize_kartothek_reads``,
+    # which rewrites their ``columns`` and ``filters``.
+    name = READ_LAYER_PREFIX + gen_uuid()
+    dispatch_metadata_key = "dispatch-metadata-" + name
+    dsk = {dispatch_metadata_key: DispatchMetadata.from_factory(ds_factory)}
+    for i, mp in enumerate(mps):
+        dsk[(name, i)] = (
+            _load_ddf_partition,
+            mp,
+            dispatch_metadata_key,
+            columns,
+            predicates,
+            None,
+            options,
+        )
+    npartitions = len(dsk) - 1
+
+    divisions = [None] * (npartitions + 1)
+    if dask_index_on is not None:
+        meta = meta.set_index(dask_index_on)
+        bounds = get_dispatch_bounds(
+            ds_factory, dask_index_on, label_filter=label_filter, predicates=predicates
+        )
+        if bounds:
+            divisions = [lower for lower, _ in bounds] + [bounds[-1][1]]
 
-    return dd.from_delayed(delayed_partitions, meta=meta)
+    graph = HighLevelGraph.from_collections(name, dsk)
+    return dd.core.new_dd_object(graph, name, meta, divisions)
 
 
 def _get_dask_meta_for_dataset(
@@ -116,6 +186,8 @@ def update_dataset_from_ddf(
     default_metadata_version=DEFAULT_METADATA_VERSION,
     partition_on=None,
     factory=None,
+    minmax_indices=None,
+    checkpoint_interval=None,
 ):
     """
     Update a dataset from a dask.dataframe.
@@ -170,6 +242,7 @@ def update_dataset_from_ddf(
     """
     partition_on = normalize_arg("partition_on", partition_on)
     secondary_indices = normalize_arg("secondary_indices", secondary_indices)
+    minmax_indices = normalize_arg("minmax_indices", minmax_indices)
     delete_scope = dask.delayed(normalize_arg)("delete_scope", delete_scope)
 
     if table is None:
@@ -202,6 +275,7 @@ def update_dataset_from_ddf(
         ]
     else:
         secondary_indices = _ensure_compatible_indices(ds_factory, secondary_indices)
+        minmax_indices = _ensure_compatible_minmax_indices(ds_factory, minmax_indices)
 
         if shuffle and partition_on:
             mps = _update_dask_partitions_shuffle(
@@ -215,6 +289,7 @@ def update_dataset_from_ddf(
                 dataset_uuid=dataset_uuid,
                 num_buckets=num_buckets,
                 sort_partitions_by=sort_partitions_by,
+                minmax_indices=minmax_indices,
             )
         else:
             delayed_tasks = ddf.to_delayed()
@@ -228,6 +303,7 @@ def update_dataset_from_ddf(
                 df_serializer=df_serializer,
                 dataset_uuid=dataset_uuid,
                 sort_partitions_by=sort_partitions_by,
+                minmax_indices=minmax_indices,
             )
     return dask.delayed(update_dataset_from_partitions)(
         mps,
@@ -237,4 +313,5 @@ def update_dataset_from_ddf(
         delete_scope=delete_scope,
         metadata=metadata,
         metadata_merger=metadata_merger,
+        checkpoint_interval=checkpoint_interval,
     )
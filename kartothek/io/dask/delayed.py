@@ -5,12 +5,14 @@ from collections import defaultdict
 from functools import partial
 
 import dask
+import pandas as pd
 import six
 from dask import delayed
 
 from kartothek.core import naming
 from kartothek.core.factory import _ensure_factory
 from kartothek.core.naming import DEFAULT_METADATA_VERSION
+from kartothek.core.urlencode import decode_key
 from kartothek.core.utils import _check_callable
 from kartothek.core.uuid import gen_uuid
 from kartothek.io_components.delete import (
@@ -20,15 +22,24 @@ from kartothek.io_components.delete import (
 )
 from kartothek.io_components.docs import default_docs
 from kartothek.io_components.gc import delete_files, dispatch_files_to_gc
+from kartothek.io_components.join import (
+    align_partitions_by_keys,
+    empty_partitions_join_result,
+    join_partitions,
+)
 from kartothek.io_components.merge import align_datasets
 from kartothek.io_components.metapartition import (
     MetaPartition,
     parse_input_to_metapartition,
 )
-from kartothek.io_components.read import dispatch_metapartitions_from_factory
+from kartothek.io_components.read import (
+    DispatchMetadata,
+    dispatch_metapartitions_from_factory,
+)
 from kartothek.io_components.update import update_dataset_from_partitions
 from kartothek.io_components.utils import (
     _ensure_compatible_indices,
+    _ensure_compatible_minmax_indices,
     normalize_arg,
     normalize_args,
     validate_partition_keys,
@@ -36,6 +47,7 @@ from kartothek.io_components.utils import (
 from kartothek.io_components.write import (
     raise_if_dataset_exists,
     store_dataset_from_partitions,
+    store_empty_dataset_header,
 )
 
 from ._update import _update_dask_partitions_one_to_one
@@ -121,8 +133,38 @@ def garbage_collect_dataset__delayed(
     return [delayed(delete_files)(files, store_factory=store) for files in nested_files]
 
 
-def _load_and_merge_mps(mp_list, store, label_merger, metadata_merger, merge_tasks):
-    mp_list = [mp.load_dataframes(store=store) for mp in mp_list]
+def _dataset_uuid(mp):
+    _, file_key = next(six.iteritems(mp.files))
+    dataset_uuid, _, _, _ = decode_key(file_key)
+    return dataset_uuid
+
+
+def _load_and_merge_mps(
+    mp_list,
+    store,
+    label_merger,
+    metadata_merger,
+    merge_tasks,
+    columns=None,
+    categoricals=None,
+    predicates=None,
+):
+    """
+    Load and merge the aligned MetaPartitions of two datasets.
+
+    ``predicates`` maps the dataset UUIDs to the predicates of the dataset.
+    """
+    if predicates is None:
+        predicates = {}
+    mp_list = [
+        mp.load_dataframes(
+            store=store,
+            columns=columns,
+            categoricals=categoricals,
+            predicates=predicates.get(_dataset_uuid(mp)),
+        )
+        for mp in mp_list
+    ]
     mp = MetaPartition.merge_metapartitions(
         mp_list, label_merger=label_merger, metadata_merger=metadata_merger
     )
@@ -143,6 +185,10 @@ def merge_datasets_as_delayed(
     match_how="exact",
     label_merger=None,
     metadata_merger=None,
+    columns=None,
+    categoricals=None,
+    left_predicates=None,
+    right_predicates=None,
 ):
     """
     A dask.delayed graph to perform the merge of two full kartothek datasets.
@@ -211,14 +257,29 @@ def merge_datasets_as_delayed(
             ...     },
             ... ]
 
+    left_predicates : List[List[Tuple[str, str, Any]]]
+        Predicates to filter the left dataset with, see ``predicates`` of the
+        read functions. Partitions which are ruled out by the partition keys or
+        indices are not loaded and are not merged.
+    right_predicates : List[List[Tuple[str, str, Any]]]
+        Predicates to filter the right dataset with.
+
+    ``columns`` and ``categoricals`` are given per table, the tables of both
+    datasets are therefore expected to have distinct names.
     """
     _check_callable(store)
+    if left_dataset_uuid == right_dataset_uuid and left_predicates != right_predicates:
+        raise ValueError(
+            "Merging a dataset with itself requires the same predicates on both sides."
+        )
 
     mps = align_datasets(
         left_dataset_uuid=left_dataset_uuid,
         right_dataset_uuid=right_dataset_uuid,
         store=store,
         match_how=match_how,
+        left_predicates=left_predicates,
+        right_predicates=right_predicates,
     )
     mps = map_delayed(
         mps,
@@ -226,20 +287,232 @@ def merge_datasets_as_delayed(
         store=store,
         label_merger=label_merger,
         metadata_merger=metadata_merger,
+        columns=columns,
+        categoricals=categoricals,
+        predicates={
+            left_dataset_uuid: left_predicates,
+            right_dataset_uuid: right_predicates,
+        },
         merge_tasks=merge_tasks,
     )
 
     return mps
 
 
-def _load_and_concat_metapartitions(list_of_mps, *args, **kwargs):
-    @dask.delayed
-    def _load_and_concat(mps):
-        return MetaPartition.concat_metapartitions(
-            [mp.load_dataframes(*args, **kwargs) for mp in mps]
+def _join_partitions(partitions, **kwargs):
+    left_mps, right_mps = partitions
+    dfs = list(join_partitions(left_mps, right_mps, **kwargs))
+    if len(dfs) == 1:
+        return dfs[0]
+    return pd.concat(dfs, ignore_index=True, sort=False)
+
+
+def _join_and_store_partitions(
+    partitions,
+    store,
+    output_dataset_uuid,
+    output_table,
+    df_serializer,
+    metadata_version,
+    **kwargs
+):
+    left_mps, right_mps = partitions
+    stored_mps = []
+    for df in join_partitions(left_mps, right_mps, store=store, **kwargs):
+        if len(df) == 0:
+            continue
+        mp = MetaPartition(
+            label=gen_uuid(), data={output_table: df}, metadata_version=metadata_version
+        )
+        mp = mp.partition_on(list(left_mps or right_mps)[0].partition_keys)
+        stored_mps.append(
+            mp.store_dataframes(
+                store=store,
+                dataset_uuid=output_dataset_uuid,
+                df_serializer=df_serializer,
+            )
+        )
+    return stored_mps
+
+
+def _store_joined_dataset(
+    stored_mps, store, dataset_uuid, table, empty_df, partition_keys, metadata_version
+):
+    mps = [mp for mps in stored_mps for mp in mps]
+    if not mps:
+        # Nothing was joined, only write the header and the schema of the dataset
+        return store_empty_dataset_header(
+            store=store,
+            dataset_uuid=dataset_uuid,
+            table_meta={table: empty_df},
+            partition_on=partition_keys,
+            metadata_version=metadata_version,
+        )
+    return store_dataset_from_partitions(mps, store=store, dataset_uuid=dataset_uuid)
+
+
+@default_docs
+def join_datasets_as_delayed(
+    left_dataset_uuid,
+    right_dataset_uuid,
+    store,
+    on,
+    left_table,
+    right_table,
+    how="inner",
+    left_columns=None,
+    right_columns=None,
+    suffixes=("_x", "_y"),
+    dates_as_object=False,
+    chunk_size=None,
+    output_dataset_uuid=None,
+    output_table="table",
+    df_serializer=None,
+    metadata_version=DEFAULT_METADATA_VERSION,
+    overwrite=False,
+):
+    """
+    A dask.delayed graph joining two datasets which are partitioned by the same
+    columns, without a shuffle.
+
+    The partitions of both datasets are paired by their partition key values and
+    every pair is joined in its own task. Within a pair, the partitions need to be
+    sorted by ``on``. Their row groups are streamed in sort order and merged as
+    soon as all rows of a join key were read, such that only a few row groups of
+    each partition are held in memory.
+
+    For ``left``, ``right`` and ``outer`` joins, integer and boolean columns of
+    the side whose rows may be missing are returned as ``float64`` and
+    ``object``, independent of whether all rows found a partner.
+
+    Parameters
+    ----------
+    left_dataset_uuid: str
+        UUID of the left dataset.
+    right_dataset_uuid: str
+        UUID of the right dataset.
+    on: str
+        The join column. Every partition needs to be sorted by it and it must not
+        contain missing values.
+    left_table: str
+        The table of the left dataset.
+    right_table: str
+        The table of the right dataset.
+    how: str
+        One of ``inner``, ``left``, ``right`` and ``outer``, see :func:`pandas.merge`.
+    left_columns: List[str]
+        The columns to load from the left table, defaults to all columns.
+    right_columns: List[str]
+        The columns to load from the right table, defaults to all columns.
+    suffixes: Tuple[str, str]
+        See :func:`pandas.merge`.
+    chunk_size: int
+        If the result is written, write partitions of at least this many rows.
+        Defaults to one partition per joined row group.
+    output_table: str
+        The table of the output dataset.
+
+    Returns
+    -------
+    Union[List[dask.delayed.Delayed], dask.delayed.Delayed]
+        The joined DataFrames, one per combination of partition key values, or
+        the delayed metadata of the written dataset if ``output_dataset_uuid`` is
+        given.
+    """
+    _check_callable(store)
+    left_factory = _ensure_factory(
+        dataset_uuid=left_dataset_uuid,
+        store=store,
+        factory=None,
+        load_dataset_metadata=False,
+    )
+    right_factory = _ensure_factory(
+        dataset_uuid=right_dataset_uuid,
+        store=store,
+        factory=None,
+        load_dataset_metadata=False,
+    )
+    partitions = align_partitions_by_keys(
+        left_factory, right_factory, left_table, right_table, how=how
+    )
+    join_kwargs = dict(
+        on=on,
+        left_table=left_table,
+        right_table=right_table,
+        left_schema=left_factory.table_meta[left_table],
+        right_schema=right_factory.table_meta[right_table],
+        how=how,
+        left_columns=left_columns,
+        right_columns=right_columns,
+        suffixes=suffixes,
+        dates_as_object=dates_as_object,
+        chunk_size=chunk_size,
+    )
+
+    if output_dataset_uuid is None:
+        return map_delayed(partitions, _join_partitions, store=store, **join_kwargs)
+
+    if not overwrite:
+        raise_if_dataset_exists(dataset_uuid=output_dataset_uuid, store=store)
+    stored_mps = map_delayed(
+        partitions,
+        _join_and_store_partitions,
+        store=store,
+        output_dataset_uuid=output_dataset_uuid,
+        output_table=output_table,
+        df_serializer=df_serializer,
+        metadata_version=metadata_version,
+        **join_kwargs
+    )
+    empty_df = empty_partitions_join_result(
+        join_kwargs["left_schema"],
+        join_kwargs["right_schema"],
+        on=on,
+        partition_keys=left_factory.partition_keys,
+        how=how,
+        left_columns=left_columns,
+        right_columns=right_columns,
+        suffixes=suffixes,
+        dates_as_object=dates_as_object,
+    )
+    return delayed(_store_joined_dataset)(
+        stored_mps,
+        store=store,
+        dataset_uuid=output_dataset_uuid,
+        table=output_table,
+        empty_df=empty_df,
+        partition_keys=left_factory.partition_keys,
+        metadata_version=metadata_version,
+    )
+
+
+def _load_metapartitions(
+    mps, dispatch_metadata, categoricals_from_index=None, **kwargs
+):
+    """
+    Load the dataframes of a MetaPartition, or of a list of MetaPartitions which
+    are concatenated, and cast the columns of ``categoricals_from_index``.
+
+    The keyword arguments are passed to
+    :meth:`~kartothek.io_components.metapartition.MetaPartition.load_dataframes`.
+    """
+    if isinstance(mps, list):
+        mp = MetaPartition.concat_metapartitions(
+            [mp.load_dataframes(**kwargs) for mp in dispatch_metadata.attach(mps)]
         )
+    else:
+        mp = dispatch_metadata.attach(mps).load_dataframes(**kwargs)
 
-    return [_load_and_concat(mps) for mps in list_of_mps]
+    if categoricals_from_index:
+        func_dict = defaultdict(_identity)
+        func_dict.update(
+            {
+                table: partial(_cast_categorical_to_index_cat, categories=cats)
+                for table, cats in six.iteritems(categoricals_from_index)
+            }
+        )
+        mp = mp.apply(func_dict, type_safe=True)
+    return mp
 
 
 def _identity():
@@ -263,6 +536,8 @@ def read_dataset_as_delayed_metapartitions(
     load_dataset_metadata=False,
     predicates=None,
     factory=None,
+    target_partition_size=None,
+    dispatch_by=None,
 ):
     """
     A collection of dask.delayed objects to retrieve a dataset from store where each
@@ -288,47 +563,30 @@ def read_dataset_as_delayed_metapartitions(
         concat_partitions_on_primary_index=concat_partitions_on_primary_index,
         label_filter=label_filter,
         predicates=predicates,
+        dispatch_metadata=False,
+        target_partition_size=target_partition_size,
+        dispatch_by=dispatch_by,
     )
-
-    if concat_partitions_on_primary_index:
-        mps = _load_and_concat_metapartitions(
-            mps,
-            store=store,
-            tables=tables,
-            columns=columns,
-            categoricals=categoricals,
-            predicate_pushdown_to_io=predicate_pushdown_to_io,
-            dates_as_object=dates_as_object,
-            predicates=predicates,
-        )
-    else:
-        mps = map_delayed(
-            mps,
-            MetaPartition.load_dataframes,
-            store=store,
-            tables=tables,
-            columns=columns,
-            categoricals=categoricals,
-            predicate_pushdown_to_io=predicate_pushdown_to_io,
-            dates_as_object=dates_as_object,
-            predicates=predicates,
-        )
-
+    # The metadata shared by all partitions is only serialized once as a single
+    # node of the graph instead of once per task.
+    dispatch_metadata = delayed(DispatchMetadata.from_factory(ds_factory))
     categoricals_from_index = _maybe_get_categoricals_from_index(
         ds_factory, categoricals
     )
 
-    if categoricals_from_index:
-        func_dict = defaultdict(_identity)
-        func_dict.update(
-            {
-                table: partial(_cast_categorical_to_index_cat, categories=cats)
-                for table, cats in six.iteritems(categoricals_from_index)
-            }
-        )
-        mps = map_delayed(mps, MetaPartition.apply, func_dict, type_safe=True)
-
-    return mps
+    return map_delayed(
+        mps,
+        _load_metapartitions,
+        dispatch_metadata,
+        categoricals_from_index=categoricals_from_index,
+        store=store,
+        tables=tables,
+        columns=columns,
+        categoricals=categoricals,
+        predicate_pushdown_to_io=predicate_pushdown_to_io,
+        dates_as_object=dates_as_object,
+        predicates=predicates,
+    )
 
 
 def _get_data(mp, table=None):
@@ -354,6 +612,8 @@ def read_dataset_as_delayed(
     dates_as_object=False,
     predicates=None,
     factory=None,
+    target_partition_size=None,
+    dispatch_by=None,
 ):
     """
     A collection of dask.delayed objects to retrieve a dataset from store
@@ -375,6 +635,8 @@ def read_dataset_as_delayed(
         dates_as_object=dates_as_object,
         load_dataset_metadata=False,
         predicates=predicates,
+        target_partition_size=target_partition_size,
+        dispatch_by=dispatch_by,
     )
     return map_delayed(mps, _get_data)
 
@@ -392,6 +654,8 @@ def read_table_as_delayed(
     dates_as_object=False,
     predicates=None,
     factory=None,
+    target_partition_size=None,
+    dispatch_by=None,
 ):
     """
     A collection of dask.delayed objects to retrieve a single table from
@@ -429,6 +693,8 @@ def read_table_as_delayed(
         load_dataset_metadata=False,
         predicates=predicates,
         factory=factory,
+        target_partition_size=target_partition_size,
+        dispatch_by=dispatch_by,
     )
     return map_delayed(mps, partial(_get_data, table=table))
 
@@ -461,6 +727,8 @@ def update_dataset_from_delayed(
     sort_partitions_by=None,
     secondary_indices=None,
     factory=None,
+    minmax_indices=None,
+    checkpoint_interval=None,
 ):
     """
     A dask.delayed graph to add and store a list of dictionaries containing
@@ -475,6 +743,7 @@ def update_dataset_from_delayed(
     """
     partition_on = normalize_arg("partition_on", partition_on)
     secondary_indices = normalize_arg("secondary_indices", secondary_indices)
+    minmax_indices = normalize_arg("minmax_indices", minmax_indices)
     delete_scope = dask.delayed(normalize_arg)("delete_scope", delete_scope)
 
     ds_factory, metadata_version, partition_on = validate_partition_keys(
@@ -486,9 +755,11 @@ def update_dataset_from_delayed(
     )
 
     secondary_indices = _ensure_compatible_indices(ds_factory, secondary_indices)
+    minmax_indices = _ensure_compatible_minmax_indices(ds_factory, minmax_indices)
     mps = _update_dask_partitions_one_to_one(
         delayed_tasks=delayed_tasks,
         secondary_indices=secondary_indices,
+        minmax_indices=minmax_indices,
         metadata_version=metadata_version,
         partition_on=partition_on,
         store_factory=store,
@@ -505,6 +776,7 @@ def update_dataset_from_delayed(
         delete_scope=delete_scope,
         metadata=metadata,
         metadata_merger=metadata_merger,
+        checkpoint_interval=checkpoint_interval,
     )
 
 
@@ -522,6 +794,8 @@ def store_delayed_as_dataset(
     partition_on=None,
     metadata_storage_format=naming.DEFAULT_METADATA_STORAGE_FORMAT,
     secondary_indices=None,
+    minmax_indices=None,
+    checkpoint_interval=None,
 ):
     """
     Transform and store a list of dictionaries containing
@@ -553,8 +827,13 @@ def store_delayed_as_dataset(
     if partition_on:
         mps = map_delayed(mps, MetaPartition.partition_on, partition_on=partition_on)
 
-    if secondary_indices:
-        mps = map_delayed(mps, MetaPartition.build_indices, columns=secondary_indices)
+    if secondary_indices or minmax_indices:
+        mps = map_delayed(
+            mps,
+            MetaPartition.build_indices,
+            columns=secondary_indices,
+            minmax_columns=minmax_indices,
+        )
 
     mps = map_delayed(
         mps,
@@ -571,4 +850,5 @@ def store_delayed_as_dataset(
         dataset_metadata=metadata,
         metadata_merger=metadata_merger,
         metadata_storage_format=metadata_storage_format,
+        checkpoint_interval=checkpoint_interval,
     )
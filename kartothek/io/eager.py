@@ -1,23 +1,32 @@
 # -*- coding: utf-8 -*-
 
 
+import logging
+from functools import partial
+
 import pandas as pd
+import pyarrow as pa
 import six
 
-from kartothek.core.common_metadata import (
-    empty_dataframe_from_schema,
-    make_meta,
-    store_schema_metadata,
-)
-from kartothek.core.dataset import DatasetMetadataBuilder
+from kartothek.core._concurrent import map_concurrently
+from kartothek.core.common_metadata import empty_dataframe_from_schema
 from kartothek.core.factory import _ensure_factory
+from kartothek.core.index import ExplicitSecondaryIndex, PartitionIndex
 from kartothek.core.naming import (
     DEFAULT_METADATA_STORAGE_FORMAT,
     DEFAULT_METADATA_VERSION,
     PARQUET_FILE_SUFFIX,
     get_partition_file_prefix,
 )
+from kartothek.core.urlencode import decode_key
 from kartothek.core.uuid import gen_uuid
+from kartothek.io_components.aggregate import (
+    PartialAggregates,
+    aggregate_partition,
+    aggregates_to_dataframe,
+    normalize_aggregations,
+)
+from kartothek.io_components.cache import get_dataframe_cache
 from kartothek.io_components.delete import (
     delete_common_metadata,
     delete_indices,
@@ -40,7 +49,13 @@ from kartothek.io_components.utils import (
 from kartothek.io_components.write import (
     raise_if_dataset_exists,
     store_dataset_from_partitions,
+    store_empty_dataset_header,
 )
+from kartothek.serialization import ParquetSerializer
+from kartothek.serialization._arrow_compat import ARROW_LARGER_EQ_0160
+from kartothek.serialization._util import ensure_unicode_string_type
+
+LOGGER = logging.getLogger(__name__)
 
 
 @default_docs
@@ -85,6 +100,7 @@ def read_dataset_as_dataframes(
     dates_as_object=False,
     predicates=None,
     factory=None,
+    concurrency=1,
 ):
     """
     Read a dataset as a list of dataframes.
@@ -131,6 +147,7 @@ def read_dataset_as_dataframes(
         dates_as_object=dates_as_object,
         predicates=predicates,
         factory=ds_factory,
+        concurrency=concurrency,
     )
     return [mp.data for mp in mps]
 
@@ -149,6 +166,7 @@ def read_dataset_as_metapartitions(
     dates_as_object=False,
     predicates=None,
     factory=None,
+    concurrency=1,
 ):
     """
     Read a dataset as a list of :class:`kartothek.io_components.metapartition.MetaPartition`.
@@ -184,20 +202,26 @@ def read_dataset_as_metapartitions(
         factory=factory,
         load_dataset_metadata=False,
     )
-    from .iter import read_dataset_as_metapartitions__iterator
+    from .iter import _load_metapartition
 
-    ds_iter = read_dataset_as_metapartitions__iterator(
+    mps = dispatch_metapartitions_from_factory(
+        ds_factory,
+        concat_partitions_on_primary_index=concat_partitions_on_primary_index,
+        label_filter=label_filter,
+        predicates=predicates,
+    )
+    load = partial(
+        _load_metapartition,
+        store=ds_factory.store,
         tables=tables,
         columns=columns,
         concat_partitions_on_primary_index=concat_partitions_on_primary_index,
         predicate_pushdown_to_io=predicate_pushdown_to_io,
         categoricals=categoricals,
-        label_filter=label_filter,
         dates_as_object=dates_as_object,
         predicates=predicates,
-        factory=ds_factory,
     )
-    return list(ds_iter)
+    return map_concurrently(load, mps, max_workers=concurrency)
 
 
 def _check_compatible_list(table, obj, argument_name=""):
@@ -234,6 +258,7 @@ def read_table(
     dates_as_object=False,
     predicates=None,
     factory=None,
+    concurrency=1,
 ):
     """
     A utility function to load a single table with multiple partitions as a single dataframe in one go.
@@ -284,27 +309,53 @@ def read_table(
         factory=factory,
         load_dataset_metadata=False,
     )
-    partitions = read_dataset_as_dataframes(
-        tables=[table],
-        columns=columns,
-        concat_partitions_on_primary_index=concat_partitions_on_primary_index,
-        predicate_pushdown_to_io=predicate_pushdown_to_io,
-        categoricals=categoricals,
-        label_filter=label_filter,
-        dates_as_object=dates_as_object,
-        predicates=predicates,
-        factory=ds_factory,
-    )
-
     empty_df = empty_dataframe_from_schema(
         schema=ds_factory.table_meta[table],
         columns=columns[table] if columns is not None else None,
     )
-    dfs = [partition_data[table] for partition_data in partitions] + [empty_df]
+    df = None
+    if (
+        predicates is None
+        and not concat_partitions_on_primary_index
+        and get_dataframe_cache() is None
+    ):
+        df = _read_table_as_arrow(
+            ds_factory=ds_factory,
+            table=table,
+            columns=list(empty_df.columns),
+            categoricals=categoricals[table] if categoricals else None,
+            label_filter=label_filter,
+            dates_as_object=dates_as_object,
+            concurrency=concurrency,
+        )
+
+    if df is None:
+        partitions = read_dataset_as_dataframes(
+            tables=[table],
+            columns=columns,
+            concat_partitions_on_primary_index=concat_partitions_on_primary_index,
+            predicate_pushdown_to_io=predicate_pushdown_to_io,
+            categoricals=categoricals,
+            label_filter=label_filter,
+            dates_as_object=dates_as_object,
+            predicates=predicates,
+            factory=ds_factory,
+            concurrency=concurrency,
+        )
+        dfs = [partition_data[table] for partition_data in partitions] + [empty_df]
+    else:
+        dfs = [df]
     # require meta 4 otherwise, can't construct types/columns
     if categoricals:
-        dfs = align_categories(dfs, categoricals[table])
-    df = pd.concat(dfs, ignore_index=True, sort=False)
+        dfs = align_categories(
+            dfs,
+            categoricals[table],
+            categories=_categories_from_indices(ds_factory, categoricals[table]),
+        )
+    if len(dfs) == 1:
+        df = dfs[0]
+    else:
+        df = pd.concat(dfs, ignore_index=True, sort=False)
 
     # ensure column order
     if len(empty_df.columns) > 0:
@@ -313,6 +364,232 @@ def read_table(
     return df
 
 
+def _categories_from_indices(ds_factory, categoricals):
+    """
+    Get the categories of the ``categoricals`` which are known from the partition
+    keys or an already loaded secondary index of the dataset.
+
+    These are the values of the whole dataset, the categories of the result do
+    therefore not depend on the partitions which were read.
+    """
+    if set(categoricals) & set(ds_factory.partition_keys):
+        # The partition keys are decoded from the partition labels, no IO needed
+        ds_factory.load_partition_indices()
+    categories = {}
+    for column in categoricals:
+        index = ds_factory.indices.get(column)
+        if (
+            not isinstance(index, (PartitionIndex, ExplicitSecondaryIndex))
+            or not index.loaded
+        ):
+            continue
+        values = list(index.index_dct)
+        try:
+            values = sorted(values)
+        except TypeError:
+            pass
+        categories[column] = values
+    return categories
+
+
+def _load_arrow_table(mp, store, table, columns, partition_keys):
+    """
+    Load the partition file of ``table`` as a :class:`pyarrow.Table` with the
+    ``columns`` of the table schema, including the partition keys.
+    """
+    key = mp.files[table]
+    _, _, indices, _ = decode_key(key)
+    schema = mp.table_meta[table]
+    io_columns = [column for column in columns if column not in partition_keys]
+    arrow_table = ParquetSerializer.restore_table(store, key, columns=io_columns)
+
+    index_df = mp._reconstruct_index_columns(
+        df=pd.DataFrame(index=pd.RangeIndex(arrow_table.num_rows)),
+        key_indices=indices,
+        table=table,
+        columns=columns,
+        categories=None,
+        date_as_object=True,
+    )
+    arrays = []
+    for column in columns:
+        field = schema.field_by_name(column)
+        if column in index_df:
+            array = pa.array(index_df[column], type=field.type)
+        else:
+            array = arrow_table.column(column).data
+            if array.type == pa.null():
+                # The column only holds nulls in this partition
+                array = pa.array([None] * len(array), type=field.type)
+        arrays.append(pa.column(ensure_unicode_string_type(column), array))
+    return pa.Table.from_arrays(arrays)
+
+
+def _read_table_as_arrow(
+    ds_factory, table, columns, categoricals, label_filter, dates_as_object, concurrency
+):
+    """
+    Read all partitions of ``table`` into a single :class:`pyarrow.Table` and
+    convert it to pandas once.
+
+    Contrary to concatenating the DataFrames of the partitions, this only holds
+    the data in Arrow and a single DataFrame in memory and encodes categoricals
+    with one dictionary for the whole table.
+
+    Returns ``None`` if the dataset cannot be read this way, e.g. if it is not
+    stored as Parquet, only the partition keys are requested or the schemas of
+    the files differ.
+    """
+    partition_keys = ds_factory.partition_keys
+    if not [column for column in columns if column not in partition_keys]:
+        return None
+
+    mps = [
+        mp
+        for mp in dispatch_metapartitions_from_factory(
+            ds_factory, label_filter=label_filter
+        )
+        if table in mp.files
+    ]
+    if not mps or not all(mp.files[table].endswith(PARQUET_FILE_SUFFIX) for mp in mps):
+        return None
+
+    load = partial(
+        _load_arrow_table,
+        store=ds_factory.store,
+        table=table,
+        columns=columns,
+        partition_keys=partition_keys,
+    )
+    tables = map_concurrently(load, mps, max_workers=concurrency)
+    try:
+        arrow_table = pa.concat_tables(tables)
+    except pa.ArrowInvalid as err:
+        # Fall back to reading the partitions with pandas, which is more
+        # lenient about differing types of the files.
+        LOGGER.info(
+            "The files of table %s have differing schemas, falling back to "
+            "reading them with pandas: %s",
+            table,
+            err,
+        )
+        return None
+    del tables
+
+    to_pandas_kwargs = {}
+    if ARROW_LARGER_EQ_0160:
+        # Release the Arrow buffers while converting the columns
+        to_pandas_kwargs = {"split_blocks": True, "self_destruct": True}
+    df = arrow_table.to_pandas(
+        categories=categoricals, date_as_object=dates_as_object, **to_pandas_kwargs
+    )
+    del arrow_table
+
+    # The dictionary is in order of appearance, which depends on the order of
+    # the partitions.
+    for column in categoricals or []:
+        try:
+            categories = sorted(df[column].cat.categories)
+        except TypeError:
+            continue
+        df[column] = df[column].cat.reorder_categories(categories)
+    return df
+
+
+@default_docs
+def aggregate_table(
+    aggregations,
+    dataset_uuid=None,
+    store=None,
+    table=None,
+    group_by=None,
+    predicates=None,
+    dates_as_object=False,
+    factory=None,
+    concurrency=1,
+):
+    """
+    Compute ``count``, ``min``, ``max`` and ``sum`` aggregations of a table without
+    reading it as a whole.
+
+    Partitions are pruned by their partition keys and the secondary indices of the
+    dataset. Row groups of the Parquet files in which all rows match the
+    ``predicates`` are aggregated from the partition keys and the row group
+    statistics where possible, e.g. ``count`` and the ``min`` and ``max`` of
+    integer, string and timestamp columns. Only the remaining row groups are read,
+    with the columns required for the aggregations, ``group_by`` and ``predicates``.
+    The partial aggregates of all row groups are combined afterwards.
+
+    Parameters
+    ----------
+    aggregations: Dict[str, Tuple[Optional[str], str]]
+        Maps the output columns to a tuple of the aggregated column and one of
+        ``count``, ``min``, ``max`` and ``sum``. Use ``(None, "count")`` to count
+        rows. As in pandas, ``count`` and ``min`` and ``max`` ignore missing values.
+    table: str
+        The table to be aggregated
+    group_by: List[str]
+        Columns to group by. Rows with missing values in these columns are
+        ignored, as in :meth:`pandas.DataFrame.groupby`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The ``group_by`` columns and one column per aggregation, with one row per
+        group sorted by the ``group_by`` columns. Without ``group_by``, a single row.
+
+    Examples
+    --------
+    .. code ::
+
+        >>> from kartothek.io.eager import aggregate_table
+
+        >>> df = aggregate_table(
+        ...     {"last_event": ("event_time", "max"), "events": (None, "count")},
+        ...     "dataset_uuid",
+        ...     store,
+        ...     table="table",
+        ...     group_by=["country"],
+        ...     predicates=[[("event_time", ">=", pd.Timestamp("2019-01-01"))]],
+        ... )
+
+    """
+    if table is None:
+        raise TypeError("Parameter `table` is not optional.")
+    if not isinstance(table, six.string_types):
+        raise TypeError("Argument `table` needs to be a string")
+
+    ds_factory = _ensure_factory(
+        dataset_uuid=dataset_uuid,
+        store=_make_callable(store),
+        factory=factory,
+        load_dataset_metadata=False,
+    )
+    schema = ds_factory.table_meta[table]
+    aggregations = normalize_aggregations(aggregations, schema)
+    if isinstance(group_by, six.string_types):
+        group_by = [group_by]
+    group_by = list(group_by or [])
+    for column in group_by:
+        if column not in schema.names:
+            raise ValueError("Column `{}` is not part of the table.".format(column))
+
+    mps = dispatch_metapartitions_from_factory(ds_factory, predicates=predicates)
+    aggregate = partial(
+        aggregate_partition,
+        store=ds_factory.store_factory,
+        table=table,
+        aggregations=aggregations,
+        group_by=group_by,
+        predicates=predicates,
+        dates_as_object=dates_as_object,
+    )
+    result = PartialAggregates([func for _, _, func in aggregations])
+    for partial_aggregates in map_concurrently(aggregate, mps, max_workers=concurrency):
+        result.update(partial_aggregates)
+    return aggregates_to_dataframe(result, aggregations, group_by)
+
+
 @default_docs
 @normalize_args
 def commit_dataset(
@@ -444,6 +721,7 @@ def store_dataframes_as_dataset(
     overwrite=False,
     metadata_storage_format=DEFAULT_METADATA_STORAGE_FORMAT,
     metadata_version=DEFAULT_METADATA_VERSION,
+    checkpoint_interval=None,
 ):
     """
     Utility function to store a list of dataframes as a partitioned dataset with multiple tables (files).
@@ -454,6 +732,9 @@ def store_dataframes_as_dataset(
     ----------
     dfs : dict of pd.DataFrame or pd.DataFrame
         The dataframe(s) to be stored. If only a single dataframe is passed, it will be stored as the `core` table.
+    checkpoint_interval: int, optional
+        Store later updates of the dataset metadata as append-only commits and only write a new
+        snapshot every ``checkpoint_interval`` commits.
 
     Returns
     -------
@@ -484,6 +765,7 @@ def store_dataframes_as_dataset(
         store=store,
         dataset_metadata=metadata,
         metadata_storage_format=metadata_storage_format,
+        checkpoint_interval=checkpoint_interval,
     )
 
 
@@ -518,35 +800,15 @@ def create_empty_dataset_header(
     if not overwrite:
         raise_if_dataset_exists(dataset_uuid=dataset_uuid, store=store)
 
-    for table, schema in six.iteritems(table_meta):
-        table_meta[table] = make_meta(schema, origin=table, partition_keys=partition_on)
-        store_schema_metadata(
-            schema=table_meta[table],
-            dataset_uuid=dataset_uuid,
-            store=store,
-            table=table,
-        )
-    dataset_builder = DatasetMetadataBuilder(
-        uuid=dataset_uuid,
-        metadata_version=metadata_version,
-        partition_keys=partition_on,
-        explicit_partitions=False,
+    return store_empty_dataset_header(
+        store=store,
+        dataset_uuid=dataset_uuid,
         table_meta=table_meta,
+        partition_on=partition_on,
+        metadata=metadata,
+        metadata_storage_format=metadata_storage_format,
+        metadata_version=metadata_version,
     )
-    if metadata:
-        for key, value in six.iteritems(metadata):
-            dataset_builder.add_metadata(key, value)
-    if metadata_storage_format.lower() == "json":
-        store.put(*dataset_builder.to_json())
-    elif metadata_storage_format.lower() == "msgpack":
-        store.put(*dataset_builder.to_msgpack())
-    else:
-        raise ValueError(
-            "Unkown metadata storage format encountered: {}".format(
-                metadata_storage_format
-            )
-        )
-    return dataset_builder.to_dataset()
 
 
 @default_docs
@@ -3,6 +3,7 @@
 
 from functools import partial
 
+from kartothek.core._concurrent import iter_prefetched
 from kartothek.core.factory import _ensure_factory
 from kartothek.core.naming import (
     DEFAULT_METADATA_STORAGE_FORMAT,
@@ -18,6 +19,7 @@ from kartothek.io_components.read import dispatch_metapartitions_from_factory
 from kartothek.io_components.update import update_dataset_from_partitions
 from kartothek.io_components.utils import (
     _ensure_compatible_indices,
+    _ensure_compatible_minmax_indices,
     normalize_args,
     sort_values_categorical,
     validate_partition_keys,
@@ -28,6 +30,37 @@ from kartothek.io_components.write import (
 )
 
 
+def _load_metapartition(
+    mp,
+    store,
+    tables,
+    columns,
+    concat_partitions_on_primary_index,
+    predicate_pushdown_to_io,
+    categoricals,
+    dates_as_object,
+    predicates,
+):
+    """
+    Load the data of a dispatched MetaPartition, or of a list of MetaPartitions
+    which are concatenated if ``concat_partitions_on_primary_index`` is set.
+    """
+    load_kwargs = dict(
+        store=store,
+        tables=tables,
+        columns=columns,
+        categoricals=categoricals,
+        predicate_pushdown_to_io=predicate_pushdown_to_io,
+        dates_as_object=dates_as_object,
+        predicates=predicates,
+    )
+    if concat_partitions_on_primary_index:
+        return MetaPartition.concat_metapartitions(
+            [mp_inner.load_dataframes(**load_kwargs) for mp_inner in mp]
+        )
+    return mp.load_dataframes(**load_kwargs)
+
+
 @default_docs
 def read_dataset_as_metapartitions__iterator(
     dataset_uuid=None,
@@ -42,6 +75,7 @@ def read_dataset_as_metapartitions__iterator(
     load_dataset_metadata=False,
     predicates=None,
     factory=None,
+    prefetch=0,
 ):
     """
 
@@ -51,6 +85,9 @@ def read_dataset_as_metapartitions__iterator(
     .. seealso:
 
         :func:`~kartothek.io_components.read.read_dataset_as_dataframes__iterator`
+
+    Parameters
+    ----------
     """
 
     ds_factory = _ensure_factory(
@@ -67,31 +104,18 @@ def read_dataset_as_metapartitions__iterator(
         predicates=predicates,
     )
 
-    for mp in mps:
-        if concat_partitions_on_primary_index:
-            mp = MetaPartition.concat_metapartitions(
-                [
-                    mp_inner.load_dataframes(
-                        store=store,
-                        tables=tables,
-                        columns=columns,
-                        categoricals=categoricals,
-                        predicate_pushdown_to_io=predicate_pushdown_to_io,
-                        predicates=predicates,
-                    )
-                    for mp_inner in mp
-                ]
-            )
-        else:
-            mp = mp.load_dataframes(
-                store=store,
-                tables=tables,
-                columns=columns,
-                categoricals=categoricals,
-                predicate_pushdown_to_io=predicate_pushdown_to_io,
-                dates_as_object=dates_as_object,
-                predicates=predicates,
-            )
+    load = partial(
+        _load_metapartition,
+        store=store,
+        tables=tables,
+        columns=columns,
+        concat_partitions_on_primary_index=concat_partitions_on_primary_index,
+        predicate_pushdown_to_io=predicate_pushdown_to_io,
+        categoricals=categoricals,
+        dates_as_object=dates_as_object,
+        predicates=predicates,
+    )
+    for mp in iter_prefetched(load, mps, prefetch):
         yield mp
 
 
@@ -108,6 +132,7 @@ def read_dataset_as_dataframes__iterator(
     dates_as_object=False,
     predicates=None,
     factory=None,
+    prefetch=0,
 ):
     """
     A Python iterator to retrieve a dataset from store where each
@@ -163,6 +188,7 @@ def read_dataset_as_dataframes__iterator(
         load_dataset_metadata=False,
         predicates=predicates,
         factory=factory,
+        prefetch=prefetch,
     )
     for mp in mp_iter:
         yield mp.data
@@ -185,6 +211,8 @@ def update_dataset_from_dataframes__iter(
     sort_partitions_by=None,
     secondary_indices=None,
     factory=None,
+    minmax_indices=None,
+    checkpoint_interval=None,
 ):
     """
     Update a kartothek dataset in store iteratively, using a generator of dataframes.
@@ -211,6 +239,7 @@ def update_dataset_from_dataframes__iter(
     )
 
     secondary_indices = _ensure_compatible_indices(ds_factory, secondary_indices)
+    minmax_indices = _ensure_compatible_minmax_indices(ds_factory, minmax_indices)
 
     if sort_partitions_by:  # Define function which sorts each partition by column
         sort_partitions_by_fn = partial(
@@ -227,8 +256,10 @@ def update_dataset_from_dataframes__iter(
         if partition_on:
             mp = mp.partition_on(partition_on=partition_on)
 
-        if secondary_indices:
-            mp = mp.build_indices(columns=secondary_indices)
+        if secondary_indices or minmax_indices:
+            mp = mp.build_indices(
+                columns=secondary_indices, minmax_columns=minmax_indices
+            )
 
         # Store dataframe, thereby clearing up the dataframe from the `mp` metapartition
         mp = mp.store_dataframes(
@@ -248,6 +279,7 @@ def update_dataset_from_dataframes__iter(
         delete_scope=delete_scope,
         metadata=metadata,
         metadata_merger=metadata_merger,
+        checkpoint_interval=checkpoint_interval,
     )
 
 
@@ -264,6 +296,8 @@ def store_dataframes_as_dataset__iter(
     metadata_storage_format=DEFAULT_METADATA_STORAGE_FORMAT,
     metadata_version=DEFAULT_METADATA_VERSION,
     secondary_indices=None,
+    minmax_indices=None,
+    checkpoint_interval=None,
 ):
     """
     Store `pd.DataFrame` s iteratively as a partitioned dataset with multiple tables (files).
@@ -295,8 +329,8 @@ def store_dataframes_as_dataset__iter(
         if partition_on:
             mp = mp.partition_on(partition_on)
 
-        if secondary_indices:
-            mp = mp.build_indices(secondary_indices)
+        if secondary_indices or minmax_indices:
+            mp = mp.build_indices(secondary_indices, minmax_columns=minmax_indices)
 
         # Store dataframe, thereby clearing up the dataframe from the `mp` metapartition
         mp = mp.store_dataframes(
@@ -313,4 +347,5 @@ def store_dataframes_as_dataset__iter(
         store=store,
         dataset_metadata=metadata,
         metadata_storage_format=metadata_storage_format,
+        checkpoint_interval=checkpoint_interval,
     )
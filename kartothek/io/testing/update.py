@@ -12,7 +12,7 @@ import six
 from kartothek.core.dataset import DatasetMetadata
 from kartothek.core.index import ExplicitSecondaryIndex
 from kartothek.core.testing import TIME_TO_FREEZE_ISO
-from kartothek.io.eager import store_dataframes_as_dataset
+from kartothek.io.eager import read_table, store_dataframes_as_dataset
 from kartothek.io.iter import read_dataset_as_dataframes__iterator
 
 
@@ -527,3 +527,87 @@ def test_sort_partitions_by(
     ):
         for _, df in six.iteritems(label_df_tupl):
             assert (df.TARGET == sorted(df.TARGET)).all()
+
+
+def test_update_dataset_commit_log(store_factory, bound_update_dataset):
+    store = store_factory()
+    store_dataframes_as_dataset(
+        dfs=[{"data": {"core": pd.DataFrame({"p": [1], "x": [1]})}}],
+        store=store_factory,
+        dataset_uuid="dataset_uuid",
+        partition_on=["p"],
+        metadata={"dataset": "metadata"},
+        checkpoint_interval=3,
+    )
+    snapshot_key = "dataset_uuid.by-dataset-metadata.json"
+    snapshot = store.get(snapshot_key)
+
+    updates = []
+    for value in [2, 3]:
+        updates.append(
+            bound_update_dataset(
+                [
+                    {
+                        "label": "part_{}".format(value),
+                        "data": [("core", pd.DataFrame({"p": [value], "x": [value]}))],
+                    }
+                ],
+                store=store_factory,
+                dataset_uuid="dataset_uuid",
+                partition_on=["p"],
+                delete_scope=[{"p": 1}] if value == 3 else None,
+                metadata={"update": value},
+            )
+        )
+
+    # The updates are only stored as commits
+    assert store.get(snapshot_key) == snapshot
+    assert sorted(k for k in store.keys() if ".commit." in k) == [
+        "dataset_uuid.by-dataset-metadata.commit.000000000001.json",
+        "dataset_uuid.by-dataset-metadata.commit.000000000002.json",
+    ]
+    loaded = DatasetMetadata.load_from_store("dataset_uuid", store)
+    assert loaded == updates[-1]
+    assert sorted(p.split("/")[0] for p in loaded.partitions) == ["p=2", "p=3"]
+    assert loaded.metadata["dataset"] == "metadata"
+    assert loaded.metadata["update"] == 3
+    assert loaded.commit_log["commit"] == 2
+    assert sorted(loaded.load_partition_indices().indices["p"].index_dct.keys()) == [
+        2,
+        3,
+    ]
+
+    # The third commit triggers a new snapshot
+    bound_update_dataset(
+        [{"label": "part_4", "data": [("core", pd.DataFrame({"p": [4], "x": [4]}))]}],
+        store=store_factory,
+        dataset_uuid="dataset_uuid",
+        partition_on=["p"],
+    )
+    assert store.get(snapshot_key) != snapshot
+    loaded = DatasetMetadata.load_from_store("dataset_uuid", store)
+    assert loaded.commit_log == {"checkpoint_interval": 3, "snapshot": 3, "commit": 3}
+    assert sorted(p.split("/")[0] for p in loaded.partitions) == ["p=2", "p=3", "p=4"]
+
+
+def test_update_dataset_enables_commit_log(store_factory, bound_update_dataset):
+    store = store_factory()
+    store_dataframes_as_dataset(
+        dfs=[{"label": "part_1", "data": [("core", pd.DataFrame({"x": [1]}))]}],
+        store=store_factory,
+        dataset_uuid="dataset_uuid",
+    )
+    bound_update_dataset(
+        [{"label": "part_2", "data": [("core", pd.DataFrame({"x": [2]}))]}],
+        store=store_factory,
+        dataset_uuid="dataset_uuid",
+        checkpoint_interval=5,
+    )
+
+    # Enabling the log writes a snapshot referencing it
+    assert not [k for k in store.keys() if ".commit." in k]
+    loaded = DatasetMetadata.load_from_store("dataset_uuid", store)
+    assert loaded.commit_log == {"checkpoint_interval": 5, "snapshot": 1, "commit": 1}
+    assert len(loaded.partitions) == 2
+    df = read_table(dataset_uuid="dataset_uuid", store=store_factory, table="core")
+    assert sorted(df["x"]) == [1, 2]
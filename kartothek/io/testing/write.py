@@ -11,8 +11,10 @@ import pandas.util.testing as pdt
 import pytest
 import six
 
+from kartothek.core._compat import load_json
 from kartothek.core.dataset import DatasetMetadata
-from kartothek.core.index import ExplicitSecondaryIndex
+from kartothek.core.index import ExplicitSecondaryIndex, MinMaxIndex
+from kartothek.core.manifest import PartitionManifest
 from kartothek.core.uuid import gen_uuid
 from kartothek.io_components.metapartition import MetaPartition
 from kartothek.serialization import DataFrameSerializer
@@ -262,6 +264,60 @@ def test_store_dataframes_as_dataset(
     pdt.assert_frame_equal(df_helper, df_stored)
 
 
+def test_store_dataframes_as_dataset_minmax_index(
+    store_factory, metadata_version, bound_store_dataframes
+):
+    df_list = [
+        {
+            "label": "cluster_1",
+            "data": [
+                (
+                    "core",
+                    pd.DataFrame(
+                        {
+                            "P": [1, 2],
+                            "TS": pd.to_datetime(["2019-01-01", "2019-01-02"]),
+                        }
+                    ),
+                )
+            ],
+        },
+        {
+            "label": "cluster_2",
+            "data": [
+                (
+                    "core",
+                    pd.DataFrame(
+                        {
+                            "P": [3, 4],
+                            "TS": pd.to_datetime(["2019-01-03", "2019-01-04"]),
+                        }
+                    ),
+                )
+            ],
+        },
+    ]
+
+    dataset = bound_store_dataframes(
+        df_list,
+        store=store_factory,
+        dataset_uuid="dataset_uuid",
+        metadata_version=metadata_version,
+        secondary_indices=["P"],
+        minmax_indices=["TS"],
+    )
+    assert isinstance(dataset.indices["TS"], MinMaxIndex)
+
+    store = store_factory()
+    stored_dataset = DatasetMetadata.load_from_store("dataset_uuid", store)
+    assert isinstance(stored_dataset.indices["P"], ExplicitSecondaryIndex)
+    assert set(stored_dataset.minmax_indices.keys()) == {"TS"}
+
+    index = stored_dataset.indices["TS"].load(store)
+    assert index.eval_operator(">=", pd.Timestamp("2019-01-03")) == {"cluster_2"}
+    assert index.eval_operator("<", pd.Timestamp("2019-01-02")) == {"cluster_1"}
+
+
 @pytest.mark.skipif(six.PY2, reason="Partition order unstable in PY2")
 def test_store_dataframes_as_dataset_empty_dataframe(
     store_factory, metadata_version, df_all_types, bound_store_dataframes
@@ -537,6 +593,77 @@ def test_store_dataframes_partition_on(store_factory, bound_store_dataframes):
     assert dataset.partition_keys == ["other"]
 
 
+def test_store_dataframes_as_dataset_manifest(store_factory, bound_store_dataframes):
+    df = pd.DataFrame(
+        OrderedDict([("P", [1, 1, 2]), ("L", ["a", "b", "a"]), ("TARGET", [1, 2, 3])])
+    )
+    dataset = bound_store_dataframes(
+        [{"label": "cluster_1", "data": [("core", df)]}],
+        store=store_factory,
+        dataset_uuid="dataset_uuid",
+        metadata_version=4,
+        partition_on=["P", "L"],
+        metadata_storage_format="manifest",
+    )
+    store = store_factory()
+    header = load_json(store.get("dataset_uuid.by-dataset-metadata.json"))
+    manifest_key = header["partitions_manifest"]
+    assert manifest_key.startswith("dataset_uuid.by-dataset-metadata.partitions.")
+    assert manifest_key in store
+
+    stored_dataset = DatasetMetadata.load_from_store("dataset_uuid", store)
+    assert isinstance(stored_dataset.partitions, PartitionManifest)
+    assert stored_dataset == dataset
+    assert stored_dataset.explicit_partitions
+    assert stored_dataset.partition_keys == ["P", "L"]
+    assert stored_dataset.metadata_version == 4
+
+    stored_dataset = stored_dataset.load_partition_indices()
+    assert stored_dataset.indices["P"].index_dct == {
+        1: ["P=1/L=a/cluster_1", "P=1/L=b/cluster_1"],
+        2: ["P=2/L=a/cluster_1"],
+    }
+
+    # Readers which don't know the manifest derive the partitions from the storage keys
+    assert "partitions" not in header
+    assert header["dataset_metadata_version"] == 4
+    del header["partitions_manifest"]
+    legacy_dataset = DatasetMetadata.load_from_dict(header, store)
+    assert not legacy_dataset.explicit_partitions
+    assert set(legacy_dataset.partitions) == set(stored_dataset.partitions)
+
+
+def test_store_dataframes_as_dataset_manifest_per_commit(
+    store_factory, bound_store_dataframes
+):
+    def _manifests(store):
+        return sorted(
+            key
+            for key in store.keys()
+            if key.startswith("dataset_uuid.by-dataset-metadata.partitions.")
+        )
+
+    store = store_factory()
+    manifests = []
+    for value in range(3):
+        df = pd.DataFrame({"x": [value]})
+        bound_store_dataframes(
+            [{"label": "cluster_1", "data": [("core", df)]}],
+            store=store_factory,
+            dataset_uuid="dataset_uuid",
+            metadata_storage_format="manifest",
+            overwrite=True,
+        )
+        header = load_json(store.get("dataset_uuid.by-dataset-metadata.json"))
+        manifests.append(header["partitions_manifest"])
+        # The manifest of the previous commit is kept for concurrent readers
+        assert _manifests(store) == manifests[-2:]
+
+    assert len(set(manifests)) == 3
+    stored_dataset = DatasetMetadata.load_from_store("dataset_uuid", store)
+    assert list(stored_dataset.partitions) == ["cluster_1"]
+
+
 def _exception_str(exception):
     """
     Extract the exception message, even if this is a re-throw of an exception
@@ -0,0 +1,519 @@
+# -*- coding: utf-8 -*-
+"""
+Aggregations of a table which are answered from metadata where possible.
+
+``count``, ``min``, ``max`` and ``sum`` of a (filtered) table are computed per row
+group of the Parquet files and combined afterwards:
+
+* Partitions are pruned by their partition keys and the secondary indices of the
+  dataset before any file is accessed.
+* Row groups whose statistics rule out all ``predicates`` are skipped. Row groups
+  whose statistics prove that every row matches are aggregated from the partition
+  keys and the statistics in the footer, if they suffice for the aggregation.
+* Only the remaining row groups are read, with the columns which are required for
+  the aggregations, the grouping and the predicates.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow.parquet import ParquetFile
+
+from kartothek.core.naming import PARQUET_FILE_SUFFIX
+from kartothek.core.urlencode import decode_key
+from kartothek.serialization import filter_df_from_predicates
+from kartothek.serialization._parquet import (
+    EPOCH_ORDINAL,
+    _normalize_predicates,
+    _open_parquet_reader,
+    _predicate_accepts,
+    _read_row_group,
+)
+
+AGGREGATION_FUNCTIONS = ("count", "min", "max", "sum")
+
+# Row groups (or partitions) in which no row, some rows or all rows match
+_NONE, _PARTIAL, _ALL = 0, 1, 2
+
+
+def normalize_aggregations(aggregations, schema):
+    """
+    Validate the aggregations against the table schema.
+
+    Parameters
+    ----------
+    aggregations: Dict[str, Tuple[Optional[str], str]]
+        Maps the output column to the aggregated column and the aggregation
+        function. The column may be ``None`` for ``count``, to count rows.
+    schema: kartothek.core.common_metadata.SchemaWrapper
+
+    Returns
+    -------
+    List[Tuple[str, Optional[str], str]]
+    """
+    if not aggregations:
+        raise ValueError("At least one aggregation needs to be provided.")
+    normalized = []
+    for name, (column, func) in sorted(aggregations.items()):
+        if func not in AGGREGATION_FUNCTIONS:
+            raise ValueError(
+                "Unknown aggregation `{}`, supported are {}".format(
+                    func, ", ".join(AGGREGATION_FUNCTIONS)
+                )
+            )
+        if column is None and func != "count":
+            raise ValueError("Only `count` can be applied without a column.")
+        if column is not None and column not in schema.names:
+            raise ValueError(
+                "Column `{}` of aggregation `{}` is not part of the table.".format(
+                    column, name
+                )
+            )
+        normalized.append((name, column, func))
+    return normalized
+
+
+class PartialAggregates(object):
+    """
+    Aggregates per group of values, which can be combined with other partial
+    aggregates of the same aggregations.
+
+    ``count`` and ``sum`` start at zero, ``min`` and ``max`` at ``None``.
+    """
+
+    def __init__(self, funcs):
+        self.funcs = funcs
+        self.groups = {}
+
+    def _state(self, group):
+        state = self.groups.get(group)
+        if state is None:
+            state = [0 if func in ("count", "sum") else None for func in self.funcs]
+            self.groups[group] = state
+        return state
+
+    def add_group(self, group):
+        self._state(group)
+
+    def add(self, group, position, value):
+        state = self._state(group)
+        func = self.funcs[position]
+        current = state[position]
+        if func in ("count", "sum"):
+            state[position] = current + value
+        elif value is None or _is_null(value):
+            return
+        elif current is None:
+            state[position] = value
+        elif func == "min":
+            state[position] = min(current, value)
+        else:
+            state[position] = max(current, value)
+
+    def update(self, other):
+        for group, values in other.groups.items():
+            self.add_group(group)
+            for position, value in enumerate(values):
+                self.add(group, position, value)
+        return self
+
+
+def _is_null(value):
+    try:
+        return bool(pd.isnull(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _key_values(mp, table, dates_as_object):
+    """
+    The typed values of the partition keys of a partition.
+    """
+    _, _, key_indices, _ = decode_key(mp.files[table])
+    key_df = mp._reconstruct_index_columns(
+        df=pd.DataFrame(index=pd.RangeIndex(1)),
+        key_indices=key_indices,
+        table=table,
+        columns=None,
+        categories=None,
+        date_as_object=dates_as_object,
+    )
+    key_values = {column: key_df[column].iloc[0] for column in key_df.columns}
+    return key_indices, key_df, key_values
+
+
+def _stats_values(statistics, pa_type, dates_as_object):
+    """
+    The minimum and maximum of the statistics of a column chunk, converted to the
+    values read by pandas, or ``None`` if they cannot be used.
+    """
+    if statistics is None or not statistics.has_min_max:
+        return None
+    min_value, max_value = statistics.min, statistics.max
+    if pa.types.is_string(pa_type):
+        return min_value.decode("utf-8"), max_value.decode("utf-8")
+    if pa.types.is_signed_integer(pa_type):
+        # Integer overflow protection, see ARROW-5166
+        if max_value < min_value:
+            return None
+        return min_value, max_value
+    if pa.types.is_boolean(pa_type) or pa.types.is_binary(pa_type):
+        return min_value, max_value
+    if pa.types.is_timestamp(pa_type) and pa_type.tz is None:
+        return (
+            pd.Timestamp(min_value, unit=pa_type.unit),
+            pd.Timestamp(max_value, unit=pa_type.unit),
+        )
+    if pa.types.is_date32(pa_type):
+        values = tuple(
+            datetime.date.fromordinal(value + EPOCH_ORDINAL)
+            for value in (min_value, max_value)
+        )
+        if dates_as_object:
+            return values
+        return tuple(pd.Timestamp(value) for value in values)
+    # The statistics of floats are not exact
+    return None
+
+
+def _literal_matches_all(literal, statistics, pa_type):
+    """
+    Whether the statistics prove that every row of the row group matches the
+    literal, which is normalized for the predicate pushdown.
+    """
+    if statistics is None or not statistics.has_min_max or statistics.null_count:
+        return False
+    if pa.types.is_floating(pa_type) or pa.types.is_unsigned_integer(pa_type):
+        return False
+    min_value, max_value = statistics.min, statistics.max
+    if pa.types.is_string(pa_type):
+        min_value, max_value = min_value.decode("utf-8"), max_value.decode("utf-8")
+    elif pa.types.is_integer(pa_type) and max_value < min_value:
+        return False
+    _, op, value = literal
+    if op == "==":
+        return min_value == value and max_value == value
+    elif op == "!=":
+        return value < min_value or value > max_value
+    elif op == "<":
+        return max_value < value
+    elif op == "<=":
+        return max_value <= value
+    elif op == ">":
+        return min_value > value
+    elif op == ">=":
+        return min_value >= value
+    elif op == "in":
+        return bool(value) and min_value == max_value == value[0] == value[1]
+    return False
+
+
+def _row_group_status(parquet_file, row_group, conjunctions):
+    """
+    Whether none, some or all rows of the row group match the ``conjunctions``,
+    judged by the statistics of the row group.
+    """
+    row_meta = parquet_file.metadata.row_group(row_group)
+    if row_meta.num_rows == 0:
+        return _NONE
+    arrow_schema = parquet_file.schema.to_arrow_schema()
+    parquet_reader = parquet_file.reader
+
+    status = _NONE
+    for conjunction in conjunctions:
+        conjunction_status = _ALL
+        for literal in conjunction:
+            col_idx = parquet_reader.column_name_idx(literal[0])
+            statistics = row_meta.column(col_idx).statistics
+            pa_type = arrow_schema[col_idx].type
+            if statistics is None or not statistics.has_min_max:
+                conjunction_status = _PARTIAL
+            elif not _predicate_accepts(
+                literal, row_meta, arrow_schema, parquet_reader
+            ):
+                conjunction_status = _NONE
+                break
+            elif not _literal_matches_all(literal, statistics, pa_type):
+                conjunction_status = _PARTIAL
+        status = max(status, conjunction_status)
+        if status == _ALL:
+            break
+    return status
+
+
+def _partition_conjunctions(predicates, key_df, partition_keys):
+    """
+    Evaluate the literals on the partition keys.
+
+    Returns ``None`` if every row of the partition matches, otherwise the
+    conjunctions whose literals on the partition keys match, without these literals.
+    """
+    conjunctions = []
+    for conjunction in predicates:
+        key_literals = [
+            literal for literal in conjunction if literal[0] in partition_keys
+        ]
+        if key_literals and len(filter_df_from_predicates(key_df, [key_literals])) == 0:
+            continue
+        literals = [
+            literal for literal in conjunction if literal[0] not in partition_keys
+        ]
+        if not literals:
+            return None
+        conjunctions.append(literals)
+    return conjunctions
+
+
+def _aggregate_from_metadata(
+    aggregations,
+    group_by,
+    key_values,
+    row_meta,
+    arrow_schema,
+    column_idx,
+    dates_as_object,
+):
+    """
+    Aggregate a row group in which all rows match from the partition keys and
+    the statistics.
+
+    Returns the group and the values of the aggregations, ``None`` for
+    aggregations which cannot be answered this way. The group is ``None`` if the
+    values of the ``group_by`` columns are not constant in the row group.
+    """
+
+    def _constant(column):
+        if column in key_values:
+            return True, key_values[column]
+        statistics = row_meta.column(column_idx[column]).statistics
+        values = _stats_values(
+            statistics, arrow_schema[column_idx[column]].type, dates_as_object
+        )
+        if values is None or statistics.null_count or values[0] != values[1]:
+            return False, None
+        return True, values[0]
+
+    group = []
+    for column in group_by:
+        is_constant, value = _constant(column)
+        if not is_constant:
+            return None, None
+        group.append(value)
+
+    num_rows = row_meta.num_rows
+    results = []
+    for _, column, func in aggregations:
+        result = None
+        if column is None:
+            result = num_rows
+        elif column in key_values:
+            value = key_values[column]
+            if func == "count":
+                result = num_rows
+            elif func in ("min", "max"):
+                result = value
+            elif pd.api.types.is_integer(value):
+                result = value * num_rows
+        else:
+            pa_type = arrow_schema[column_idx[column]].type
+            statistics = row_meta.column(column_idx[column]).statistics
+            if pa.types.is_null(pa_type):
+                # The column only holds nulls in this file
+                result = 0 if func in ("count", "sum") else np.nan
+            elif statistics is not None:
+                count = num_rows - statistics.null_count
+                values = _stats_values(statistics, pa_type, dates_as_object)
+                if func == "count":
+                    result = count
+                elif count == 0:
+                    result = 0 if func == "sum" else np.nan
+                elif func in ("min", "max") and values is not None:
+                    result = values[0] if func == "min" else values[1]
+                elif (
+                    func == "sum"
+                    and values is not None
+                    and pa.types.is_signed_integer(pa_type)
+                    and values[0] == values[1]
+                ):
+                    result = values[0] * count
+        results.append(result)
+    return tuple(group), results
+
+
+def _aggregate_dataframe(df, aggregations, positions, group_by, partial):
+    """
+    Add the aggregations at ``positions`` of the rows of ``df`` to ``partial``.
+    """
+    if len(df) == 0:
+        return
+    if not group_by:
+        partial.add_group(())
+        for position in positions:
+            _, column, func = aggregations[position]
+            if column is None:
+                value = len(df)
+            else:
+                value = getattr(df[column], func)()
+            partial.add((), position, value)
+        return
+
+    grouped = df.groupby(list(group_by), sort=False)
+    for group in grouped.size().index:
+        partial.add_group(group if isinstance(group, tuple) else (group,))
+    for position in positions:
+        _, column, func = aggregations[position]
+        if column is None:
+            values = grouped.size()
+        else:
+            values = getattr(grouped[column], func)()
+        for group, value in values.items():
+            partial.add(
+                group if isinstance(group, tuple) else (group,), position, value
+            )
+
+
+def aggregate_partition(
+    mp,
+    store,
+    table,
+    aggregations,
+    group_by=None,
+    predicates=None,
+    dates_as_object=False,
+):
+    """
+    Compute the partial aggregates of a partition.
+
+    Parameters
+    ----------
+    mp: MetaPartition
+    store: Callable or simplekv.KeyValueStore
+    table: str
+    aggregations: List[Tuple[str, Optional[str], str]]
+        See :func:`normalize_aggregations`.
+    group_by: List[str]
+    predicates: List[List[Tuple[str, str, Any]]]
+    dates_as_object: bool
+
+    Returns
+    -------
+    PartialAggregates
+    """
+    if callable(store):
+        store = store()
+    group_by = list(group_by or [])
+    partial = PartialAggregates([func for _, _, func in aggregations])
+    if table not in mp.files:
+        return partial
+    key = mp.files[table]
+    if not key.endswith(PARQUET_FILE_SUFFIX):
+        raise ValueError(
+            "Only datasets stored as Parquet can be aggregated, got {}".format(key)
+        )
+
+    key_indices, key_df, key_values = _key_values(mp, table, dates_as_object)
+    conjunctions = None
+    if predicates is not None:
+        conjunctions = _partition_conjunctions(predicates, key_df, set(key_values))
+        if conjunctions == []:
+            return partial
+
+    reader = _open_parquet_reader(store, key)
+    try:
+        parquet_file = ParquetFile(reader)
+        if conjunctions:
+            conjunctions = _normalize_predicates(parquet_file, conjunctions, True)
+            if not conjunctions:
+                return partial
+        arrow_schema = parquet_file.schema.to_arrow_schema()
+        column_idx = {
+            name: parquet_file.reader.column_name_idx(name)
+            for name in arrow_schema.names
+        }
+        for row_group in range(parquet_file.num_row_groups):
+            row_meta = parquet_file.metadata.row_group(row_group)
+            if conjunctions is None:
+                status = _ALL if row_meta.num_rows else _NONE
+            else:
+                status = _row_group_status(parquet_file, row_group, conjunctions)
+            if status == _NONE:
+                continue
+
+            positions = list(range(len(aggregations)))
+            if status == _ALL:
+                group, results = _aggregate_from_metadata(
+                    aggregations,
+                    group_by,
+                    key_values,
+                    row_meta,
+                    arrow_schema,
+                    column_idx,
+                    dates_as_object,
+                )
+                if results is not None:
+                    partial.add_group(group)
+                    positions = []
+                    for position, result in enumerate(results):
+                        if result is None:
+                            positions.append(position)
+                        else:
+                            partial.add(group, position, result)
+            if not positions:
+                continue
+
+            columns = set(group_by)
+            columns.update(aggregations[position][1] for position in positions)
+            if status == _PARTIAL:
+                columns.update(
+                    literal[0] for conjunction in predicates for literal in conjunction
+                )
+            columns.discard(None)
+            df = _read_row_group(
+                parquet_file,
+                row_group,
+                [column for column in arrow_schema.names if column in columns],
+                date_as_object=dates_as_object,
+            )
+            read_key_indices = [
+                (column, value) for column, value in key_indices if column in columns
+            ]
+            if read_key_indices:
+                df = mp._reconstruct_index_columns(
+                    df=df,
+                    key_indices=read_key_indices,
+                    table=table,
+                    columns=None,
+                    categories=None,
+                    date_as_object=dates_as_object,
+                )
+            if status == _PARTIAL:
+                df = filter_df_from_predicates(df, predicates)
+            _aggregate_dataframe(df, aggregations, positions, group_by, partial)
+    finally:
+        reader.close()
+    return partial
+
+
+def aggregates_to_dataframe(partial, aggregations, group_by=None):
+    """
+    Convert combined partial aggregates to a DataFrame with one row per group,
+    sorted by the ``group_by`` columns.
+
+    Without ``group_by``, the DataFrame has a single row.
+    """
+    group_by = list(group_by or [])
+    names = [name for name, _, _ in aggregations]
+    if not group_by:
+        partial.add_group(())
+    groups = list(partial.groups)
+    try:
+        groups = sorted(groups)
+    except TypeError:
+        pass
+    rows = []
+    for group in groups:
+        values = [np.nan if value is None else value for value in partial.groups[group]]
+        rows.append(list(group) + values)
+    return pd.DataFrame(rows, columns=group_by + names)
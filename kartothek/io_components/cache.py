@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in, in-process cache of decoded partition files.
+
+Repeatedly reading the same partitions decompresses and converts the same files
+again and again. Once a :class:`DataFrameCache` is activated with
+:func:`set_dataframe_cache`, :meth:`~kartothek.io_components.metapartition.MetaPartition.load_dataframes`
+returns copies of previously decoded DataFrames instead of reading the files.
+
+.. code::
+
+    >>> from kartothek.io_components.cache import DataFrameCache, set_dataframe_cache
+
+    >>> set_dataframe_cache(DataFrameCache(max_bytes=2 * 2 ** 30))
+
+Entries are keyed by the identity of the store (see
+:func:`~kartothek.core.utils.store_identity`), the storage key of the file and the
+arguments of the read. Reads from stores which cannot be identified, e.g. in-memory
+stores, are not cached. Partition labels may be chosen by the user and datasets may be
+overwritten, so the same key can refer to different files over time. Writes and
+deletes of partition files performed by kartothek in this process invalidate the
+affected entries; modifications by other processes are not detected, so only use the
+cache for datasets which are not overwritten concurrently.
+"""
+
+import threading
+from collections import OrderedDict, defaultdict, namedtuple
+
+from kartothek.core.utils import store_identity
+from kartothek.serialization import DataFrameSerializer
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "size", "max_bytes"])
+
+_active_cache = None
+
+
+class DataFrameCache(object):
+    """
+    Thread-safe LRU cache of DataFrames, bounded by their approximate memory size.
+
+    Keys are tuples starting with the store identity and the storage key of the
+    file, which :meth:`invalidate` uses to drop all entries of a file.
+
+    Parameters
+    ----------
+    max_bytes: int
+        Memory budget of the cached DataFrames as reported by
+        :meth:`pandas.DataFrame.memory_usage`.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._file_entries = defaultdict(set)
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return a copy of the cached DataFrame or ``None``.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self._misses += 1
+                return None
+            # Re-insert to mark it as the most recently used entry
+            self._entries[key] = entry
+            self._hits += 1
+        return entry[0].copy()
+
+    def put(self, key, df):
+        """
+        Add a copy of ``df`` to the cache and evict the least recently used entries
+        exceeding the budget.
+        """
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        df = df.copy()
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (df, size)
+            self._file_entries[key[:2]].add(key)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, file_key):
+        """
+        Drop all entries of a file.
+
+        Parameters
+        ----------
+        file_key: tuple
+            The store identity and the storage key of the file.
+        """
+        with self._lock:
+            for key in list(self._file_entries.get(file_key, ())):
+                self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= entry[1]
+        file_key = key[:2]
+        keys = self._file_entries[file_key]
+        keys.discard(key)
+        if not keys:
+            del self._file_entries[file_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._file_entries.clear()
+            self._size = 0
+
+    def cache_info(self):
+        """
+        Returns
+        -------
+        CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._size, self.max_bytes)
+
+
+def set_dataframe_cache(cache):
+    """
+    Activate ``cache`` for all reads of this process. Pass ``None`` to disable caching.
+
+    Parameters
+    ----------
+    cache: Optional[DataFrameCache]
+
+    Returns
+    -------
+    Optional[DataFrameCache]
+        The previously active cache.
+    """
+    global _active_cache
+    previous, _active_cache = _active_cache, cache
+    return previous
+
+
+def get_dataframe_cache():
+    """
+    Returns
+    -------
+    Optional[DataFrameCache]
+        The active cache.
+    """
+    return _active_cache
+
+
+def _freeze(obj):
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(item) for item in obj)
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(_freeze(item) for item in obj)
+    return obj
+
+
+def invalidate_dataframes(store, keys):
+    """
+    Drop the files ``keys`` of ``store`` from the active :class:`DataFrameCache`.
+
+    Must be called whenever partition files are written or deleted.
+    """
+    cache = _active_cache
+    if cache is None:
+        return
+    identity = store_identity(store)
+    if identity is None:
+        return
+    for key in keys:
+        cache.invalidate((identity, key))
+
+
+def _cache_key(identity, key, columns, categories, predicates, date_as_object):
+    if predicates is not None:
+        # The order of the literals and conjunctions does not change the result
+        predicates = tuple(
+            sorted(
+                (
+                    tuple(sorted(_freeze(conjunction), key=repr))
+                    for conjunction in predicates
+                ),
+                key=repr,
+            )
+        )
+    cache_key = (
+        identity,
+        key,
+        _freeze(columns),
+        _freeze(categories),
+        predicates,
+        bool(date_as_object),
+    )
+    try:
+        hash(cache_key)
+    except TypeError:
+        return None
+    return cache_key
+
+
+def restore_dataframe(
+    key,
+    store,
+    columns=None,
+    categories=None,
+    predicate_pushdown_to_io=True,
+    predicates=None,
+    date_as_object=False,
+):
+    """
+    Load a DataFrame using :meth:`~kartothek.serialization.DataFrameSerializer.restore_dataframe`,
+    served from the active :class:`DataFrameCache` if there is one.
+    """
+    cache = _active_cache
+    cache_key = None
+    identity = None
+    if cache is not None:
+        identity = store_identity(store)
+    if identity is not None:
+        cache_key = _cache_key(
+            identity, key, columns, categories, predicates, date_as_object
+        )
+    if cache_key is not None:
+        df = cache.get(cache_key)
+        if df is not None:
+            return df
+
+    df = DataFrameSerializer.restore_dataframe(
+        key=key,
+        store=store,
+        columns=columns,
+        categories=categories,
+        predicate_pushdown_to_io=predicate_pushdown_to_io,
+        predicates=predicates,
+        date_as_object=date_as_object,
+    )
+    if cache_key is not None:
+        cache.put(cache_key, df)
+    return df
@@ -4,6 +4,7 @@
 import six
 
 from kartothek.core import naming
+from kartothek.core.commit_log import delete_commits
 from kartothek.core.naming import metadata_key_from_uuid
 
 
@@ -26,3 +27,9 @@ def delete_top_level_metadata(dataset_factory, *args):
     The additional arguments allow to schedule this function with delayed objects.
     """
     dataset_factory.store.delete(metadata_key_from_uuid(dataset_factory.dataset_uuid))
+    manifest_prefix = naming.metadata_manifest_prefix_from_uuid(
+        dataset_factory.dataset_uuid
+    )
+    for manifest_key in list(dataset_factory.store.iter_keys(prefix=manifest_prefix)):
+        dataset_factory.store.delete(manifest_key)
+    delete_commits(dataset_factory.store, dataset_factory.dataset_uuid)
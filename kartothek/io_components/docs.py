@@ -61,6 +61,19 @@ _PARAMETER_MAPPING = {
     "metadata_version": """
     metadata_version: int, optional
         The dataset metadata version
+""",
+    "checkpoint_interval": """
+    checkpoint_interval: int, optional
+        Write updates of the dataset metadata as small append-only commit files which are
+        replayed by readers, instead of rewriting the whole metadata, and only write a new
+        snapshot every ``checkpoint_interval`` commits. Once enabled, all further updates of
+        the dataset use the commit log.
+""",
+    "metadata_storage_format": """
+    metadata_storage_format: str, optional
+        The format of the dataset metadata. Either `json`, `msgpack` or `manifest`. The latter
+        stores the partitions as a Parquet manifest next to a small JSON header which is
+        considerably faster to load for datasets with many partitions.
 """,
     "partition_on": """
     partition_on: list
@@ -119,12 +132,46 @@ _PARAMETER_MAPPING = {
         kinds of predicates that are possible using boolean logic.
 """,
     "secondary_indices": """
-    secondary_indices: List[str]
-        A list of columns for which a secondary index should be calculated.
+    secondary_indices: List[Union[str, Tuple[str]]]
+        A list of columns for which a secondary index should be calculated. A tuple of columns
+        creates a composite index over the combination of these columns.
+""",
+    "minmax_indices": """
+    minmax_indices: List[str]
+        A list of columns for which a min/max index should be calculated. In contrast to a
+        secondary index, this only stores the value range of the column per partition and is
+        suited for continuous columns like floats or timestamps.
 """,
     "sort_partitions_by": """
     sort_partitions_by: str
         Provide a column after which the data should be sorted before storage to enable predicate pushdown.
+""",
+    "target_partition_size": """
+    target_partition_size: int, optional
+        Pack partitions into tasks whose files add up to approximately this size in
+        bytes. Each pack is concatenated into a single partition. This reduces the
+        number of tasks for datasets with many small files. Not compatible with
+        ``concat_partitions_on_primary_index``.
+""",
+    "dispatch_by": """
+    dispatch_by: str, optional
+        Group and order the partitions by the values of this column. Partitions whose
+        values overlap are concatenated. The column needs to be a partition key or have
+        a min/max index. Not compatible with ``concat_partitions_on_primary_index`` and
+        ``target_partition_size``.
+""",
+    "concurrency": """
+    concurrency: int, optional
+        Number of partitions which are loaded concurrently on a thread pool. This
+        also bounds the number of partitions which are decoded at the same time. The
+        order of the partitions does not depend on it. Defaults to ``1``, loading one
+        partition after another.
+""",
+    "prefetch": """
+    prefetch: int, optional
+        Number of partitions which are loaded ahead in background threads while the
+        current partition is being processed. Defaults to ``0``, loading a partition
+        only when it is requested.
 """,
     "factory": """
     factory: kartothek.core.factory.DatasetFactory
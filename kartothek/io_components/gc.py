@@ -3,8 +3,10 @@
 
 import six
 
+from kartothek.core._concurrent import iter_keys_sharded
 from kartothek.core.factory import _ensure_factory
 from kartothek.core.naming import TABLE_METADATA_FILE
+from kartothek.io_components.cache import invalidate_dataframes
 
 
 def dispatch_files_to_gc(dataset_uuid, store_factory, chunk_size, factory):
@@ -16,7 +18,7 @@ def dispatch_files_to_gc(dataset_uuid, store_factory, chunk_size, factory):
     )
 
     index_path = "{dataset_uuid}/indices/".format(dataset_uuid=dataset_uuid)
-    remove_index_files = set(ds_factory.store.iter_keys(prefix=index_path))
+    remove_index_files = set(iter_keys_sharded(ds_factory.store, [index_path], depth=1))
 
     for index in six.itervalues(ds_factory.indices):
         index_keys = set()
@@ -32,14 +34,17 @@ def dispatch_files_to_gc(dataset_uuid, store_factory, chunk_size, factory):
             for name in six.itervalues(partition.files):
                 table_files.add(name)
 
-        for table in ds_factory.tables:
-            table_path = "{dataset_uuid}/{table}/".format(
-                dataset_uuid=dataset_uuid, table=table
-            )
+        table_paths = [
+            "{dataset_uuid}/{table}/".format(dataset_uuid=dataset_uuid, table=table)
+            for table in ds_factory.tables
+        ]
+        for table_path in table_paths:
             table_files.add(table_path + TABLE_METADATA_FILE)
-            for key in ds_factory.store.iter_keys(prefix=table_path):
+        # Shard the listing of partitioned tables by the first partition key
+        depth = 1 if ds_factory.partition_keys else 0
+        for key in iter_keys_sharded(ds_factory.store, table_paths, depth=depth):
+            if key not in table_files:
                 remove_table_files.add(key)
-        remove_table_files -= table_files
 
     files_to_remove = list(remove_index_files | remove_table_files)
 
@@ -51,3 +56,4 @@ def delete_files(files, store_factory):
     store = store_factory()
     for f in files:
         store.delete(f)
+    invalidate_dataframes(store, files)
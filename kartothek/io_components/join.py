@@ -0,0 +1,511 @@
+# -*- coding: utf-8 -*-
+"""
+Sort-merge join of co-partitioned datasets.
+
+Two datasets which are partitioned by the same ``partition_keys`` and whose
+partitions are sorted by the join column can be joined one partition key value
+at a time, without a shuffle. Within a partition key value, the row groups of
+both sides are streamed in sort order and only rows whose join key is complete
+on both sides are merged. At any time, only a few row groups per side and the
+rows sharing the current join key are held in memory.
+"""
+
+import pandas as pd
+
+from kartothek.core.common_metadata import empty_dataframe_from_schema
+from kartothek.core.naming import PARQUET_FILE_SUFFIX
+from kartothek.core.urlencode import decode_key
+from kartothek.io_components.read import dispatch_metapartitions_from_factory
+from kartothek.serialization import ParquetSerializer
+
+
+class _SortedBuffer(object):
+    """
+    The rows of a sorted stream of DataFrames which were read but not consumed.
+    """
+
+    def __init__(self, chunks, on, empty_df):
+        self._chunks = iter(chunks)
+        self._on = on
+        self.df = empty_df
+        self.exhausted = False
+
+    def fill(self):
+        """
+        Append the next non-empty chunk of the stream to the buffer.
+        """
+        for chunk in self._chunks:
+            if len(chunk) == 0:
+                continue
+            keys = chunk[self._on]
+            if keys.isnull().any():
+                raise ValueError(
+                    "The join column `{}` must not contain missing values.".format(
+                        self._on
+                    )
+                )
+            if not keys.is_monotonic_increasing or (
+                len(self.df) and keys.iloc[0] < self.last_key()
+            ):
+                raise ValueError(
+                    "The partitions need to be sorted by `{}`.".format(self._on)
+                )
+            if len(self.df) == 0:
+                self.df = chunk
+            else:
+                self.df = pd.concat([self.df, chunk], ignore_index=True, sort=False)
+            return
+        self.exhausted = True
+
+    def ensure_rows(self):
+        while len(self.df) == 0 and not self.exhausted:
+            self.fill()
+
+    def last_key(self):
+        return self.df[self._on].iloc[-1]
+
+    def pop_before(self, bound):
+        """
+        Remove and return the rows whose key is smaller than ``bound``, or all rows
+        if ``bound`` is ``None``.
+        """
+        if bound is None:
+            rows, self.df = self.df, self.df.iloc[:0]
+            return rows
+        position = self.df[self._on].searchsorted(bound, side="left")
+        rows = self.df.iloc[:position]
+        self.df = self.df.iloc[position:]
+        return rows
+
+
+def _complete_rows(buffers):
+    """
+    Yield the rows of the buffers whose key is smaller than the last key of every
+    buffer which is not exhausted. These keys cannot occur in later chunks anymore.
+    """
+    while True:
+        for buf in buffers:
+            buf.ensure_rows()
+        open_buffers = [buf for buf in buffers if not buf.exhausted]
+        if open_buffers:
+            bound = min(buf.last_key() for buf in open_buffers)
+        else:
+            bound = None
+        yield [buf.pop_before(bound) for buf in buffers]
+        if bound is None:
+            return
+        # At least one buffer ends with ``bound``, continue with its next chunk
+        for buf in open_buffers:
+            if len(buf.df) and buf.last_key() == bound:
+                buf.fill()
+
+
+def merge_sorted_chunks(streams, on, empty_df):
+    """
+    Merge streams of DataFrames, which are each sorted by ``on``, into a single
+    sorted stream.
+
+    Parameters
+    ----------
+    streams: List[Iterable[pandas.DataFrame]]
+    on: str
+        The column the streams are sorted by.
+    empty_df: pandas.DataFrame
+        An empty DataFrame with the columns and types of the streams.
+
+    Yields
+    ------
+    pandas.DataFrame
+    """
+    if len(streams) == 1:
+        for chunk in streams[0]:
+            if len(chunk):
+                yield chunk
+        return
+    buffers = [_SortedBuffer(stream, on, empty_df) for stream in streams]
+    for parts in _complete_rows(buffers):
+        parts = [part for part in parts if len(part)]
+        if len(parts) == 1:
+            yield parts[0]
+        elif parts:
+            df = pd.concat(parts, ignore_index=True, sort=False)
+            yield df.sort_values(on, kind="mergesort").reset_index(drop=True)
+
+
+def _output_column(column, other_columns, on, suffix):
+    if column != on and column in other_columns:
+        return "{}{}".format(column, suffix)
+    return column
+
+
+def empty_join_result(left_empty_df, right_empty_df, on, how, suffixes=("_x", "_y")):
+    """
+    An empty DataFrame with the columns and types of a join.
+
+    Contrary to :func:`pandas.merge`, the types do not depend on whether all rows
+    found a partner. Integer and boolean columns of a side whose rows may be
+    missing are converted to ``float64`` and ``object``.
+
+    Parameters
+    ----------
+    left_empty_df: pandas.DataFrame
+    right_empty_df: pandas.DataFrame
+    on: str
+    how: str
+    suffixes: Tuple[str, str]
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    empty_result = pd.merge(
+        left_empty_df, right_empty_df, on=on, how=how, suffixes=suffixes
+    )
+    # pandas orders the columns differently if the left DataFrame is empty
+    columns = pd.merge(
+        left_empty_df.reindex([0]),
+        right_empty_df.reindex([0]),
+        on=on,
+        how=how,
+        suffixes=suffixes,
+    ).columns
+    empty_result = empty_result[columns]
+
+    nullable_columns = []
+    if how in ("right", "outer"):
+        nullable_columns.extend(
+            _output_column(column, right_empty_df.columns, on, suffixes[0])
+            for column in left_empty_df.columns
+        )
+    if how in ("left", "outer"):
+        nullable_columns.extend(
+            _output_column(column, left_empty_df.columns, on, suffixes[1])
+            for column in right_empty_df.columns
+        )
+    dtypes = {}
+    for column in nullable_columns:
+        if column == on:
+            continue
+        dtype = empty_result[column].dtype
+        if pd.api.types.is_integer_dtype(dtype):
+            dtypes[column] = "float64"
+        elif pd.api.types.is_bool_dtype(dtype):
+            dtypes[column] = "object"
+    if dtypes:
+        empty_result = empty_result.astype(dtypes)
+    return empty_result
+
+
+def sort_merge_join(
+    left_chunks,
+    right_chunks,
+    on,
+    left_empty_df,
+    right_empty_df,
+    how="inner",
+    suffixes=("_x", "_y"),
+):
+    """
+    Join two streams of DataFrames which are sorted by ``on``.
+
+    Parameters
+    ----------
+    left_chunks: Iterable[pandas.DataFrame]
+    right_chunks: Iterable[pandas.DataFrame]
+    on: str
+        The join column, both streams need to be sorted by it.
+    left_empty_df: pandas.DataFrame
+        An empty DataFrame with the columns and types of the left stream.
+    right_empty_df: pandas.DataFrame
+        An empty DataFrame with the columns and types of the right stream.
+    how: str
+        One of ``inner``, ``left``, ``right`` and ``outer``, see :func:`pandas.merge`.
+    suffixes: Tuple[str, str]
+        See :func:`pandas.merge`.
+
+    Yields
+    ------
+    pandas.DataFrame
+        The joined rows, sorted by ``on``, with the columns and types of
+        :func:`empty_join_result`. If no rows are joined, a single empty
+        DataFrame is yielded.
+    """
+    buffers = [
+        _SortedBuffer(left_chunks, on, left_empty_df),
+        _SortedBuffer(right_chunks, on, right_empty_df),
+    ]
+    empty_result = empty_join_result(
+        left_empty_df, right_empty_df, on=on, how=how, suffixes=suffixes
+    )
+    dtypes = empty_result.dtypes
+    has_rows = False
+    for left, right in _complete_rows(buffers):
+        if how == "inner" and (len(left) == 0 or len(right) == 0):
+            continue
+        if how == "left" and len(left) == 0:
+            continue
+        if how == "right" and len(right) == 0:
+            continue
+        if len(left) == 0 and len(right) == 0:
+            continue
+        df = pd.merge(left, right, on=on, how=how, suffixes=suffixes, sort=False)
+        if how in ("right", "outer"):
+            # pandas appends the unmatched rows of the right side
+            df = df.sort_values(on, kind="mergesort").reset_index(drop=True)
+        if not df.columns.equals(empty_result.columns):
+            df = df[empty_result.columns]
+        if not df.dtypes.equals(dtypes):
+            df = df.astype(dtypes.to_dict())
+        has_rows = True
+        yield df
+    if not has_rows:
+        yield empty_result
+
+
+def _partition_key_values(mp, table):
+    _, _, indices, _ = decode_key(mp.files[table])
+    return tuple(value for _, value in indices)
+
+
+def align_partitions_by_keys(
+    left_factory, right_factory, left_table, right_table, how="inner"
+):
+    """
+    Pair the partitions of two datasets with the same partition key values.
+
+    Parameters
+    ----------
+    left_factory: kartothek.core.factory.DatasetFactory
+    right_factory: kartothek.core.factory.DatasetFactory
+    left_table: str
+    right_table: str
+    how: str
+        One of ``inner``, ``left``, ``right`` and ``outer``. Determines which
+        partition key values are yielded if only one of the datasets holds them.
+
+    Yields
+    ------
+    Tuple[List[MetaPartition], List[MetaPartition]]
+        The partitions of the left and the right dataset of one combination of
+        partition key values.
+    """
+    if not left_factory.partition_keys:
+        raise ValueError("The datasets need to be partitioned to be joined.")
+    if list(left_factory.partition_keys) != list(right_factory.partition_keys):
+        raise ValueError(
+            "The datasets need to have the same partition keys, got {} and {}.".format(
+                left_factory.partition_keys, right_factory.partition_keys
+            )
+        )
+
+    def _group(factory, table):
+        groups = {}
+        for mp in dispatch_metapartitions_from_factory(factory):
+            if table not in mp.files:
+                continue
+            if not mp.files[table].endswith(PARQUET_FILE_SUFFIX):
+                raise ValueError(
+                    "Only datasets stored as Parquet can be joined, got {}".format(
+                        mp.files[table]
+                    )
+                )
+            groups.setdefault(_partition_key_values(mp, table), []).append(mp)
+        return groups
+
+    left_groups = _group(left_factory, left_table)
+    right_groups = _group(right_factory, right_table)
+
+    if how == "inner":
+        keys = [key for key in left_groups if key in right_groups]
+    elif how == "left":
+        keys = list(left_groups)
+    elif how == "right":
+        keys = list(right_groups)
+    elif how == "outer":
+        keys = list(left_groups) + [
+            key for key in right_groups if key not in left_groups
+        ]
+    else:
+        raise ValueError("Unknown join type `{}`".format(how))
+
+    for key in sorted(keys):
+        yield left_groups.get(key, []), right_groups.get(key, [])
+
+
+def _sorted_stream(mps, store, table, columns, on, dates_as_object, empty_df):
+    streams = [
+        ParquetSerializer.restore_row_groups(
+            store, mp.files[table], columns=columns, date_as_object=dates_as_object
+        )
+        for mp in mps
+    ]
+    if not streams:
+        return []
+    return merge_sorted_chunks(streams, on, empty_df)
+
+
+def _empty_side(schema, columns, on, partition_keys, dates_as_object):
+    """
+    An empty DataFrame with the columns of a table which are loaded from its files.
+    """
+    if columns is None:
+        columns = empty_dataframe_from_schema(schema).columns
+    io_columns = [column for column in columns if column not in partition_keys]
+    if on not in io_columns:
+        raise ValueError(
+            "The join column `{}` needs to be loaded from both tables.".format(on)
+        )
+    return empty_dataframe_from_schema(
+        schema, columns=io_columns, date_as_object=dates_as_object
+    )
+
+
+def empty_partitions_join_result(
+    left_schema,
+    right_schema,
+    on,
+    partition_keys,
+    how="inner",
+    left_columns=None,
+    right_columns=None,
+    suffixes=("_x", "_y"),
+    dates_as_object=False,
+):
+    """
+    An empty DataFrame with the columns and types of the DataFrames yielded by
+    :func:`join_partitions`, including the partition keys.
+
+    See :func:`join_partitions` for the parameters.
+    """
+    left_empty_df, right_empty_df = [
+        _empty_side(schema, columns, on, partition_keys, dates_as_object)
+        for schema, columns in [
+            (left_schema, left_columns),
+            (right_schema, right_columns),
+        ]
+    ]
+    keys_df = empty_dataframe_from_schema(
+        left_schema, columns=partition_keys, date_as_object=dates_as_object
+    )
+    return pd.concat(
+        [
+            keys_df,
+            empty_join_result(
+                left_empty_df, right_empty_df, on=on, how=how, suffixes=suffixes
+            ),
+        ],
+        axis=1,
+        sort=False,
+    )
+
+
+def join_partitions(
+    left_mps,
+    right_mps,
+    store,
+    on,
+    left_table,
+    right_table,
+    left_schema,
+    right_schema,
+    how="inner",
+    left_columns=None,
+    right_columns=None,
+    suffixes=("_x", "_y"),
+    dates_as_object=False,
+    chunk_size=None,
+):
+    """
+    Join the partitions of two datasets which share their partition key values.
+
+    Parameters
+    ----------
+    left_mps: List[MetaPartition]
+        Partitions of the left dataset, each sorted by ``on``.
+    right_mps: List[MetaPartition]
+        Partitions of the right dataset, each sorted by ``on``.
+    store: Callable or simplekv.KeyValueStore
+    on: str
+        The join column.
+    left_table: str
+    right_table: str
+    left_schema: kartothek.core.common_metadata.SchemaWrapper
+        The schema of the left table.
+    right_schema: kartothek.core.common_metadata.SchemaWrapper
+        The schema of the right table.
+    how: str
+        One of ``inner``, ``left``, ``right`` and ``outer``.
+    left_columns: List[str]
+        The columns to load from the left dataset, defaults to all columns.
+    right_columns: List[str]
+        The columns to load from the right dataset, defaults to all columns.
+    suffixes: Tuple[str, str]
+        See :func:`pandas.merge`.
+    dates_as_object: bool
+    chunk_size: int
+        Combine the joined rows into DataFrames of at least this many rows. By
+        default, the rows which are complete after reading a row group are
+        yielded.
+
+    Yields
+    ------
+    pandas.DataFrame
+        The joined rows including the partition keys, sorted by ``on``.
+    """
+    if callable(store):
+        store = store()
+    reference, reference_table = (
+        (left_mps[0], left_table) if left_mps else (right_mps[0], right_table)
+    )
+    partition_keys = reference.partition_keys
+
+    sides = []
+    for mps, table, schema, columns in [
+        (left_mps, left_table, left_schema, left_columns),
+        (right_mps, right_table, right_schema, right_columns),
+    ]:
+        empty_df = _empty_side(schema, columns, on, partition_keys, dates_as_object)
+        stream = _sorted_stream(
+            mps, store, table, list(empty_df.columns), on, dates_as_object, empty_df
+        )
+        sides.append((stream, empty_df))
+
+    (left_stream, left_empty_df), (right_stream, right_empty_df) = sides
+    joined = sort_merge_join(
+        left_stream,
+        right_stream,
+        on=on,
+        left_empty_df=left_empty_df,
+        right_empty_df=right_empty_df,
+        how=how,
+        suffixes=suffixes,
+    )
+
+    _, _, key_indices, _ = decode_key(reference.files[reference_table])
+    for df in _batches(joined, chunk_size):
+        yield reference._reconstruct_index_columns(
+            df,
+            key_indices,
+            reference_table,
+            columns=None,
+            categories=None,
+            date_as_object=dates_as_object,
+        )
+
+
+def _batches(chunks, chunk_size):
+    if chunk_size is None:
+        for chunk in chunks:
+            yield chunk
+        return
+    buffered = []
+    buffered_rows = 0
+    for chunk in chunks:
+        buffered.append(chunk)
+        buffered_rows += len(chunk)
+        if buffered_rows >= chunk_size:
+            yield pd.concat(buffered, ignore_index=True, sort=False)
+            buffered = []
+            buffered_rows = 0
+    if buffered:
+        yield pd.concat(buffered, ignore_index=True, sort=False)
@@ -1,13 +1,72 @@
+import bisect
 import logging
 
 from kartothek.core.dataset import DatasetMetadata
+from kartothek.core.factory import _ensure_factory
 from kartothek.io_components.metapartition import MetaPartition
-from kartothek.io_components.utils import _instantiate_store
+from kartothek.io_components.read import _allowed_labels_by_predicates
+from kartothek.io_components.utils import _instantiate_store, _make_callable
 
 LOGGER = logging.getLogger(__name__)
 
 
-def align_datasets(left_dataset_uuid, right_dataset_uuid, store, match_how="exact"):
+class _PrefixMatcher(object):
+    """
+    Find the labels starting with a prefix, every label is only returned once.
+
+    The labels are sorted, such that the labels with a common prefix form a
+    contiguous range found by bisection. Returned labels are skipped by pointing
+    to the next label which was not returned yet.
+    """
+
+    def __init__(self, labels):
+        self._labels = sorted(labels)
+        self._next = list(range(len(self._labels) + 1))
+
+    def _find(self, ix):
+        root = ix
+        while self._next[root] != root:
+            root = self._next[root]
+        # Compress the path for later lookups
+        while self._next[ix] != root:
+            self._next[ix], ix = root, self._next[ix]
+        return root
+
+    def pop_matches(self, prefix):
+        matches = []
+        ix = self._find(bisect.bisect_left(self._labels, prefix))
+        while ix < len(self._labels) and self._labels[ix].startswith(prefix):
+            matches.append(self._labels[ix])
+            self._next[ix] = ix + 1
+            ix = self._find(ix + 1)
+        return matches
+
+
+def _load_dataset(dataset_uuid, store, predicates):
+    """
+    Load the dataset metadata and the labels of the partitions which may satisfy
+    the predicates, or ``None`` if all partitions are allowed.
+    """
+    if predicates is None:
+        return DatasetMetadata.load_from_store(uuid=dataset_uuid, store=store), None
+    ds_factory = _ensure_factory(
+        dataset_uuid=dataset_uuid,
+        store=_make_callable(store),
+        factory=None,
+        load_dataset_metadata=True,
+    )
+    ds_factory, allowed_labels = _allowed_labels_by_predicates(predicates, ds_factory)
+    return ds_factory.dataset_metadata, allowed_labels
+
+
+def align_datasets(
+    left_dataset_uuid,
+    right_dataset_uuid,
+    store,
+    match_how="exact",
+    left_predicates=None,
+    right_predicates=None,
+):
     """
     Determine dataset partition alignment
 
@@ -17,15 +76,22 @@ def align_datasets(left_dataset_uuid, right_dataset_uuid, store, match_how="exac
     right_dataset_uuid : basestring
     store : KeyValuestore or callable
     match_how : basestring or callable, {exact, prefix, all, callable}
+    left_predicates : list of list of tuple, optional
+        Predicates of the left dataset. Partitions which are ruled out by the
+        partition keys and indices of the dataset are not part of the alignment.
+    right_predicates : list of list of tuple, optional
+        Predicates of the right dataset.
 
     Yields
     ------
     list
     """
     store = _instantiate_store(store)
-    left_dataset = DatasetMetadata.load_from_store(uuid=left_dataset_uuid, store=store)
-    right_dataset = DatasetMetadata.load_from_store(
-        uuid=right_dataset_uuid, store=store
+    left_dataset, left_allowed_labels = _load_dataset(
+        left_dataset_uuid, store, left_predicates
+    )
+    right_dataset, right_allowed_labels = _load_dataset(
+        right_dataset_uuid, store, right_predicates
     )
 
     metadata_version = left_dataset.metadata_version
@@ -37,70 +103,86 @@ def align_datasets(left_dataset_uuid, right_dataset_uuid, store, match_how="exac
         or match_how == "left"
         or (
             match_how == "prefix"
-            and len(list(left_dataset.partitions.keys())[0])
-            < len(list(right_dataset.partitions.keys())[0])
+            and len(next(iter(left_dataset.partitions)))
+            < len(next(iter(right_dataset.partitions)))
         )
     ):
-        first_dataset = left_dataset
-        second_dataset = right_dataset
+        first_dataset, first_allowed_labels = left_dataset, left_allowed_labels
+        second_dataset, second_allowed_labels = right_dataset, right_allowed_labels
     else:
-        first_dataset = right_dataset
-        second_dataset = left_dataset
+        first_dataset, first_allowed_labels = right_dataset, right_allowed_labels
+        second_dataset, second_allowed_labels = left_dataset, left_allowed_labels
     # The del statements are here to reduce confusion below
-    del left_dataset
-    del right_dataset
+    del left_dataset, left_allowed_labels
+    del right_dataset, right_allowed_labels
 
     # For every partition in the 'small' dataset, at least one partition match
     # needs to be found in the larger dataset.
-    available_partitions = list(second_dataset.partitions.items())
-    partition_stack = available_partitions[:]
+    second_partitions = second_dataset.partitions
+    if match_how == "exact":
+
+        def _matching_labels(label):
+            return [label] if label in second_partitions else []
+
+    elif match_how == "prefix":
+        # In the prefix matching scheme, every partition of the second dataset
+        # is matched only once.
+        matcher = _PrefixMatcher(second_partitions)
+        position = {label: ix for ix, label in enumerate(second_partitions)}
+
+        def _matching_labels(label):
+            return sorted(matcher.pop_matches(label), key=position.__getitem__)
+
+    elif callable(match_how):
+
+        def _matching_labels(label):
+            return [other for other in second_partitions if match_how(label, other)]
+
+    else:
+        all_labels = list(second_partitions)
+
+        def _matching_labels(label):
+            return all_labels
 
-    # TODO: write a test which protects against the following scenario!!
     # Sort the partition labels by length of the labels, starting with the
     # labels which are the longest. This way we prevent label matching for
-    # similar partitions, e.g. cluster_100 and cluster_1. This, of course,
-    # works only as long as the internal loop removes elements which were
-    # matched already (here improperly called stack)
+    # similar partitions, e.g. cluster_100 and cluster_1, as matched partitions
+    # are not available to the shorter prefixes anymore.
     for l_1 in sorted(first_dataset.partitions, key=len, reverse=True):
         p_1 = first_dataset.partitions[l_1]
         res = [
             MetaPartition.from_partition(
-                partition=p_1, metadata_version=metadata_version
+                partition=p_1,
+                metadata_version=metadata_version,
+                partition_keys=first_dataset.partition_keys,
             )
         ]
-        for parts in available_partitions:
-            l_2, p_2 = parts
-            if callable(match_how) and not match_how(l_1, l_2):
-                continue
-            if match_how == "exact" and l_1 != l_2:
-                continue
-            elif match_how == "prefix" and not l_2.startswith(l_1):
-                LOGGER.debug("rejecting (%s, %s)", l_1, l_2)
-                continue
-
+        # Pruned partitions still take part in the matching, such that they are
+        # not matched to other partitions instead.
+        pruned = first_allowed_labels is not None and l_1 not in first_allowed_labels
+        matching_labels = _matching_labels(l_1)
+        for l_2 in matching_labels:
             LOGGER.debug(
                 "Found alignment between partitions " "(%s, %s) and" "(%s, %s)",
                 first_dataset.uuid,
-                p_1.label,
+                l_1,
                 second_dataset.uuid,
-                p_2.label,
+                l_2,
             )
-            res.append(
-                MetaPartition.from_partition(
-                    partition=p_2, metadata_version=metadata_version
+            if second_allowed_labels is None or l_2 in second_allowed_labels:
+                res.append(
+                    MetaPartition.from_partition(
+                        partition=second_partitions[l_2],
+                        metadata_version=metadata_version,
+                        partition_keys=second_dataset.partition_keys,
+                    )
                 )
-            )
-
-            # In exact or prefix matching schemes, it is expected to only
-            # find one partition alignment. in this case reduce the size of
-            # the inner loop
-            if match_how in ["exact", "prefix"]:
-                partition_stack.remove((l_2, p_2))
-        # Need to copy, otherwise remove will alter the loop iterator
-        available_partitions = partition_stack[:]
-        if len(res) == 1:
+        if not matching_labels:
             raise RuntimeError(
                 "No matching partition for {} in dataset {} "
                 "found".format(p_1, first_dataset)
             )
+        if pruned or len(res) == 1:
+            LOGGER.debug("Skipping alignment of pruned partition %s", l_1)
+            continue
         yield res
@@ -19,25 +19,27 @@ import six
 
 from kartothek.core import naming
 from kartothek.core.common_metadata import (
+    empty_dataframe_from_schema,
     make_meta,
     normalize_column_order,
     read_schema_metadata,
     validate_compatible,
     validate_shared_columns,
 )
-from kartothek.core.index import ExplicitSecondaryIndex
+from kartothek.core.index import (
+    CompositeSecondaryIndex,
+    ExplicitSecondaryIndex,
+    MinMaxIndex,
+)
 from kartothek.core.index import merge_indices as merge_indices_algo
 from kartothek.core.naming import get_partition_file_prefix
 from kartothek.core.partition import Partition
-from kartothek.core.urlencode import decode_key, quote_indices
+from kartothek.core.urlencode import decode_key, quote, quote_array, quote_indices
 from kartothek.core.utils import verify_metadata_version
 from kartothek.core.uuid import gen_uuid
+from kartothek.io_components.cache import invalidate_dataframes, restore_dataframe
 from kartothek.io_components.utils import _instantiate_store, combine_metadata
-from kartothek.serialization import (
-    DataFrameSerializer,
-    default_serializer,
-    filter_df_from_predicates,
-)
+from kartothek.serialization import default_serializer, filter_df_from_predicates
 
 LOGGER = logging.getLogger(__name__)
 
@@ -125,6 +127,9 @@ def _apply_to_list(method):
 
 
 class MetaPartitionIterator(Iterator):
+
+    __slots__ = ("metapartition", "position")
+
     def __init__(self, metapartition):
         self.metapartition = metapartition
         self.position = 0
@@ -160,6 +165,15 @@ class MetaPartition(Iterable):
     about the parent dataset
     """
 
+    # Planning large datasets creates millions of MetaPartitions
+    __slots__ = (
+        "metadata_version",
+        "table_meta",
+        "metapartitions",
+        "dataset_metadata",
+        "partition_keys",
+    )
+
     def __init__(
         self,
         label,
@@ -233,6 +247,13 @@ class MetaPartition(Iterable):
         self.dataset_metadata = dataset_metadata or {}
         self.partition_keys = partition_keys or []
 
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
     def __repr__(self):
         if len(self.metapartitions) > 1:
             label = "NESTED ({})".format(len(self.metapartitions))
@@ -697,17 +718,26 @@ class MetaPartition(Iterable):
                     c for c in table_columns_to_io if c not in keys_to_remove
                 ]
 
-            start = time.time()
-            df = DataFrameSerializer.restore_dataframe(
-                key=key,
-                store=store,
-                columns=table_columns_to_io,
-                categories=categories,
-                predicate_pushdown_to_io=predicate_pushdown_to_io,
-                predicates=filtered_predicates,
-                date_as_object=dates_as_object,
-            )
-            LOGGER.debug("Loaded dataframe %s in %s seconds.", key, time.time() - start)
+            if filtered_predicates == []:
+                # The partition keys of this partition do not satisfy any of the
+                # conjunctions, the file does not need to be read.
+                df = self._empty_table_dataframe(
+                    table, table_columns_to_io, categories, dates_as_object
+                )
+            else:
+                start = time.time()
+                df = restore_dataframe(
+                    key=key,
+                    store=store,
+                    columns=table_columns_to_io,
+                    categories=categories,
+                    predicate_pushdown_to_io=predicate_pushdown_to_io,
+                    predicates=filtered_predicates,
+                    date_as_object=dates_as_object,
+                )
+                LOGGER.debug(
+                    "Loaded dataframe %s in %s seconds.", key, time.time() - start
+                )
             # Metadata version >=4 parse the index columns and add them back to the dataframe
 
             df = self._reconstruct_index_columns(
@@ -755,6 +785,21 @@ class MetaPartition(Iterable):
             self.table_meta[table] = _common_metadata
         return self
 
+    def _empty_table_dataframe(self, table, columns, categories, date_as_object):
+        schema = self.table_meta[table]
+        if columns is None:
+            columns = [
+                column for column in schema.names if column not in self.partition_keys
+            ]
+        df = empty_dataframe_from_schema(
+            schema, columns=columns, date_as_object=date_as_object
+        )
+        if categories:
+            df = df.astype(
+                {column: "category" for column in categories if column in df.columns}
+            )
+        return df
+
     def _reconstruct_index_columns(
         self, df, key_indices, table, columns, categories, date_as_object
     ):
@@ -990,6 +1035,8 @@ class MetaPartition(Iterable):
                     six.reraise(exc_type, exc_value, exc_traceback)
             LOGGER.debug("Storage of dataframe for table `%s` successful", table)
 
+        # Partitions may be overwritten under the same key
+        invalidate_dataframes(store, six.itervalues(file_dct))
         new_metapartition = self.copy(files=file_dct, data={})
 
         return new_metapartition
@@ -1173,17 +1220,27 @@ class MetaPartition(Iterable):
             return mp
 
     @_apply_to_list
-    def build_indices(self, columns):
+    def build_indices(self, columns, minmax_columns=None):
         """
         This builds the indices for this metapartition for the given columns. The indices for the passed columns
         are rebuilt, so exisiting index entries in the metapartition are overwritten.
 
         :param columns: A list of columns from which the indices over all dataframes in the metapartition
-            are overwritten
+            are overwritten. A tuple of columns builds a
+            :class:`~kartothek.core.index.CompositeSecondaryIndex` over the combination of these columns.
+        :param minmax_columns: A list of columns for which a :class:`~kartothek.core.index.MinMaxIndex` is built
+            instead of an explicit index
         :return: self
         """
         new_indices = {}
-        for col in columns:
+        for col in columns or []:
+            if isinstance(col, (tuple, list)):
+                new_index = self._build_composite_index(col)
+                if new_index.column in self.indices:
+                    new_index = self.indices[new_index.column].update(new_index)
+                new_indices[new_index.column] = new_index
+                continue
+
             possible_values = set()
             col_in_partition = False
             for df in self.data.values():
@@ -1191,15 +1248,7 @@ class MetaPartition(Iterable):
                     possible_values = possible_values | set(df[col].dropna().unique())
                     col_in_partition = True
 
-            if (self.label is not None) and (not col_in_partition):
-                raise RuntimeError(
-                    "Column `{corrupt_col}` could not be found in the partition `{partition_label}` "
-                    "with tables `{tables}`. Please check for any typos and validate your dataset.".format(
-                        corrupt_col=col,
-                        partition_label=self.label,
-                        tables=sorted(self.data.keys()),
-                    )
-                )
+            self._raise_if_index_column_missing(col, col_in_partition)
 
             new_index = ExplicitSecondaryIndex(
                 column=col, index_dct={value: [self.label] for value in possible_values}
@@ -1209,8 +1258,49 @@ class MetaPartition(Iterable):
             else:
                 new_indices[col] = new_index
 
+        for col in minmax_columns or []:
+            series_list = [df[col] for df in self.data.values() if col in df]
+            self._raise_if_index_column_missing(col, bool(series_list))
+
+            if self.label is None:
+                ranges = {}
+            else:
+                ranges = {self.label: _compute_min_max_null_count(series_list)}
+            new_index = MinMaxIndex(column=col, ranges=ranges)
+            if col in self.indices:
+                new_indices[col] = self.indices[col].update(new_index)
+            else:
+                new_indices[col] = new_index
+
         return self.copy(indices=new_indices)
 
+    def _build_composite_index(self, columns):
+        columns = list(columns)
+        possible_values = set()
+        col_in_partition = False
+        for df in self.data.values():
+            if all(col in df for col in columns):
+                values = df[columns].dropna().drop_duplicates()
+                possible_values |= set(values.itertuples(index=False, name=None))
+                col_in_partition = True
+
+        self._raise_if_index_column_missing(columns, col_in_partition)
+        return CompositeSecondaryIndex(
+            columns=columns,
+            index_dct={value: [self.label] for value in possible_values},
+        )
+
+    def _raise_if_index_column_missing(self, col, col_in_partition):
+        if (self.label is not None) and (not col_in_partition):
+            raise RuntimeError(
+                "Column `{corrupt_col}` could not be found in the partition `{partition_label}` "
+                "with tables `{tables}`. Please check for any typos and validate your dataset.".format(
+                    corrupt_col=col,
+                    partition_label=self.label,
+                    tables=sorted(self.data.keys()),
+                )
+            )
+
     @_apply_to_list
     def partition_on(self, partition_on):
         """
@@ -1282,7 +1372,18 @@ class MetaPartition(Iterable):
             )
             new_mp = new_mp.add_metapartition(tmp_mp)
         if self.indices:
-            new_mp = new_mp.build_indices(columns=self.indices.keys())
+            new_mp = new_mp.build_indices(
+                columns=[
+                    index.columns if isinstance(index, CompositeSecondaryIndex) else col
+                    for col, index in six.iteritems(self.indices)
+                    if not isinstance(index, MinMaxIndex)
+                ],
+                minmax_columns=[
+                    col
+                    for col, index in six.iteritems(self.indices)
+                    if isinstance(index, MinMaxIndex)
+                ],
+            )
         return new_mp
 
     def _ensure_compatible_partitioning(self, partition_on):
@@ -1307,6 +1408,7 @@ class MetaPartition(Iterable):
         existing_indices, base_label = decode_key("uuid/table/{}".format(self.label))[
             2:
         ]
+        existing_info = quote_indices(existing_indices)
         dct = dict()
         empty_tables = []
         for table, df in six.iteritems(self.data):
@@ -1334,13 +1436,24 @@ class MetaPartition(Iterable):
                 empty_tables.append((table, df))
 
             data_df = df.drop(partition_on, axis="columns")
-            for value, group in data_df.groupby(by=partition_keys, sort=False):
-                partitioning_info = []
-                if pd.api.types.is_scalar(value):
-                    value = [value]
-                if existing_indices:
-                    partitioning_info.extend(quote_indices(existing_indices))
-                partitioning_info.extend(quote_indices(zip(partition_on, value)))
+            groups = list(data_df.groupby(by=partition_keys, sort=False))
+            # Encode the values of every partition column in one batch
+            quoted_values = [
+                quote_array(
+                    [
+                        value[position] if isinstance(value, tuple) else value
+                        for value, _ in groups
+                    ]
+                )
+                for position in range(len(partition_on))
+            ]
+            quoted_columns = [quote(column) for column in partition_on]
+            for group_position, (_, group) in enumerate(groups):
+                partitioning_info = list(existing_info)
+                partitioning_info.extend(
+                    "{}={}".format(column, values[group_position])
+                    for column, values in zip(quoted_columns, quoted_values)
+                )
                 partitioning_info.append(base_label)
                 new_label = "/".join(partitioning_info)
 
@@ -1465,9 +1578,34 @@ class MetaPartition(Iterable):
         # Delete data first
         for file_key in six.itervalues(self.files):
             store.delete(file_key)
+        invalidate_dataframes(store, six.itervalues(self.files))
         return self.copy(files={}, data={}, metadata={})
 
 
+def _compute_min_max_null_count(series_list):
+    """
+    Compute the minimum, maximum and number of null values over a list of series.
+    """
+    min_value = None
+    max_value = None
+    null_count = 0
+    for series in series_list:
+        if pd.api.types.is_categorical_dtype(series):
+            series = series.astype(series.cat.categories.dtype)
+        null_count += int(series.isnull().sum())
+        series = series.dropna()
+        if len(series) == 0:
+            continue
+        series_min = series.min()
+        series_max = series.max()
+        if min_value is None:
+            min_value, max_value = series_min, series_max
+        else:
+            min_value = min(min_value, series_min)
+            max_value = max(max_value, series_max)
+    return min_value, max_value, null_count
+
+
 def _unique_label(label_list):
     label = os.path.commonprefix(label_list)
     if len(label) == 0:
@@ -1,24 +1,172 @@
-import pandas as pd
+import io
+import logging
+import os
+
 import six
+from simplekv.fs import FilesystemStore
 
+from kartothek.core._concurrent import map_concurrently
 from kartothek.core.factory import DatasetFactory
-from kartothek.core.index import ExplicitSecondaryIndex
+from kartothek.core.index import (
+    CompositeSecondaryIndex,
+    MinMaxIndex,
+    SecondaryIndexBase,
+)
 from kartothek.io_components.metapartition import MetaPartition
 from kartothek.io_components.utils import _make_callable
 
+try:
+    from simplekv.net.botostore import BotoStore
+except ImportError:  # pragma: no cover
+    BotoStore = None
+
+try:
+    from simplekv.net.azurestore import AzureBlockBlobStore
+except ImportError:  # pragma: no cover
+    AzureBlockBlobStore = None
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _group_labels_by_partition_keys(partition_keys, indices, allowed_labels=None):
+    """
+    Group the partition labels by the values of their partition keys.
+
+    Parameters
+    ----------
+    partition_keys: List[str]
+    indices: Dict[str, kartothek.core.index.IndexBase]
+        The loaded partition indices.
+    allowed_labels: Set[str], optional
+        Only these labels are grouped.
 
-def _index_to_dataframe(idx_name, idx, allowed_labels=None):
-    label_col = []
-    value_col = []
-    for value, labels in six.iteritems(idx):
+    Returns
+    -------
+    List[List[str]]
+        The labels of every group, ordered by the partition key values.
+    """
+    first_key = partition_keys[0]
+    value_by_label = [
+        {
+            label: value
+            for value, labels in six.iteritems(indices[part_key].index_dct)
+            for label in labels
+        }
+        for part_key in partition_keys[1:]
+    ]
+    groups = {}
+    for value, labels in six.iteritems(indices[first_key].index_dct):
         for label in labels:
             if allowed_labels is not None and label not in allowed_labels:
                 continue
-            label_col.append(label)
-            value_col.append(value)
-    df = pd.DataFrame({idx_name: value_col, "__partition__": label_col})
+            try:
+                key = (value,) + tuple(values[label] for values in value_by_label)
+            except KeyError:
+                # Partitions which are not part of all partition indices are skipped
+                continue
+            groups.setdefault(key, []).append(label)
+    return [groups[key] for key in sorted(groups)]
+
+
+class DispatchMetadata(object):
+    """
+    Immutable snapshot of the dataset metadata which is shared by all
+    :class:`~kartothek.io_components.metapartition.MetaPartition` objects of a dataset.
+
+    Dispatching a dataset with ``dispatch_metadata=False`` yields MetaPartitions which
+    only reference their files. Attaching the snapshot just before loading avoids
+    that the schemas, the dataset metadata and the index stubs are serialized once
+    per partition, e.g. when the MetaPartitions are submitted as dask tasks.
+
+    Parameters
+    ----------
+    dataset_metadata: dict
+    indices: Dict[str, kartothek.core.index.IndexBase]
+        The (empty) index stubs which are dispatched with every partition.
+    metadata_version: int
+    table_meta: Dict[str, kartothek.core.common_metadata.SchemaWrapper]
+    partition_keys: List[str]
+    """
+
+    __slots__ = (
+        "dataset_metadata",
+        "indices",
+        "metadata_version",
+        "table_meta",
+        "partition_keys",
+    )
+
+    def __init__(
+        self, dataset_metadata, indices, metadata_version, table_meta, partition_keys
+    ):
+        object.__setattr__(self, "dataset_metadata", dataset_metadata)
+        object.__setattr__(self, "indices", indices)
+        object.__setattr__(self, "metadata_version", metadata_version)
+        object.__setattr__(self, "table_meta", table_meta)
+        object.__setattr__(self, "partition_keys", partition_keys)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DispatchMetadata is immutable")
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
-    return df
+    @staticmethod
+    def from_factory(dataset_factory):
+        """
+        Create the snapshot of a dataset.
+
+        Parameters
+        ----------
+        dataset_factory: kartothek.core.factory.DatasetFactory
+
+        Returns
+        -------
+        DispatchMetadata
+        """
+        indices = {
+            name: ix.copy(index_dct={})
+            for name, ix in six.iteritems(dataset_factory.indices)
+            if isinstance(ix, SecondaryIndexBase)
+        }
+        return DispatchMetadata(
+            dataset_metadata=dataset_factory.metadata,
+            indices=indices,
+            metadata_version=dataset_factory.metadata_version,
+            table_meta=dataset_factory.table_meta,
+            partition_keys=dataset_factory.partition_keys,
+        )
+
+    def attach(self, metapartition):
+        """
+        Create a copy of a MetaPartition which was dispatched without metadata,
+        holding the metadata of this snapshot.
+
+        Parameters
+        ----------
+        metapartition: Union[MetaPartition, List[MetaPartition]]
+            The MetaPartition(s) or :class:`~kartothek.core.partition.Partition` (s)
+            whose label and files are used.
+
+        Returns
+        -------
+        Union[MetaPartition, List[MetaPartition]]
+        """
+        if isinstance(metapartition, list):
+            return [self.attach(mp) for mp in metapartition]
+        return MetaPartition(
+            label=metapartition.label,
+            files=metapartition.files,
+            dataset_metadata=self.dataset_metadata,
+            indices=self.indices,
+            metadata_version=self.metadata_version,
+            table_meta=self.table_meta,
+            partition_keys=self.partition_keys,
+        )
 
 
 def dispatch_metapartitions_from_factory(
@@ -27,11 +175,45 @@ def dispatch_metapartitions_from_factory(
     concat_partitions_on_primary_index=False,
     predicates=None,
     store=None,
+    dispatch_metadata=True,
+    target_partition_size=None,
+    dispatch_by=None,
 ):
+    """
+    Dispatch the partitions of a dataset as
+    :class:`~kartothek.io_components.metapartition.MetaPartition` objects.
+
+    If ``dispatch_metadata`` is ``False``, the MetaPartitions only hold their label,
+    files and metadata version and the remaining metadata needs to be attached
+    using :meth:`DispatchMetadata.attach`.
+
+    If ``target_partition_size`` is given, lists of MetaPartitions whose files sum up
+    to roughly ``target_partition_size`` bytes are dispatched instead of single
+    MetaPartitions.
+
+    If ``dispatch_by`` is given, lists of MetaPartitions are dispatched whose values
+    of the column ``dispatch_by`` do not overlap, ordered by these values (see
+    :func:`get_dispatch_bounds`).
+    """
     if not callable(dataset_factory) and not isinstance(
         dataset_factory, DatasetFactory
     ):
         raise TypeError("Need to supply a dataset factory!")
+    options = [
+        name
+        for name, value in [
+            ("concat_partitions_on_primary_index", concat_partitions_on_primary_index),
+            ("target_partition_size", target_partition_size is not None),
+            ("dispatch_by", dispatch_by is not None),
+        ]
+        if value
+    ]
+    if len(options) > 1:
+        raise ValueError(
+            "The options {} are not compatible with each other".format(
+                ", ".join("`{}`".format(name) for name in options)
+            )
+        )
 
     if predicates is not None:
         dataset_factory, allowed_labels = _allowed_labels_by_predicates(
@@ -40,67 +222,236 @@ def dispatch_metapartitions_from_factory(
     else:
         allowed_labels = None
 
-    indices_to_dispatch = {
-        name: ix.copy(index_dct={})
-        for name, ix in six.iteritems(dataset_factory.indices)
-        if isinstance(ix, ExplicitSecondaryIndex)
-    }
+    if dispatch_metadata:
+        snapshot = DispatchMetadata.from_factory(dataset_factory)
+        _to_metapartition = snapshot.attach
+    else:
+        metadata_version = dataset_factory.metadata_version
+
+        def _to_metapartition(partition):
+            return MetaPartition(
+                label=partition.label,
+                files=partition.files,
+                metadata_version=metadata_version,
+            )
 
     if concat_partitions_on_primary_index:
         if dataset_factory.explicit_partitions:
             dataset_factory = dataset_factory.load_partition_indices()
 
-        # Build up a DataFrame that contains per row a Partition and its
-        # primary index columns.
-        base_df = None
-        for part_key in dataset_factory.partition_keys:
-            idx = dataset_factory.indices[part_key].index_dct
-            df = _index_to_dataframe(part_key, idx, allowed_labels)
-            if base_df is None:
-                base_df = df
-            else:
-                base_df = base_df.merge(df, on=["__partition__"])
-
         # Group the resulting MetaParitions by partition keys
-        merged_partitions = base_df.groupby(dataset_factory.partition_keys)
-        merged_partitions = merged_partitions["__partition__"].unique()
-        for row, labels in merged_partitions.iteritems():
+        for labels in _group_labels_by_partition_keys(
+            dataset_factory.partition_keys, dataset_factory.indices, allowed_labels
+        ):
             mps = []
             for label in labels:
-                mps.append(
-                    MetaPartition.from_partition(
-                        partition=dataset_factory.partitions[label],
-                        dataset_metadata=dataset_factory.metadata,
-                        indices=indices_to_dispatch,
-                        metadata_version=dataset_factory.metadata_version,
-                        table_meta=dataset_factory.table_meta,
-                        partition_keys=dataset_factory.partition_keys,
-                    )
-                )
+                mps.append(_to_metapartition(dataset_factory.partitions[label]))
             yield mps
+    elif dispatch_by is not None:
+        dataset_factory, groups = _group_labels_by_bounds(
+            dataset_factory,
+            dispatch_by,
+            _filter_labels(dataset_factory, allowed_labels, label_filter),
+        )
+        for _, _, labels in groups:
+            yield [
+                _to_metapartition(dataset_factory.partitions[label]) for label in labels
+            ]
     else:
-
-        if allowed_labels is not None:
-            partition_labels = allowed_labels
+        partition_labels = _filter_labels(dataset_factory, allowed_labels, label_filter)
+        mps = (
+            _to_metapartition(dataset_factory.partitions[part_label])
+            for part_label in partition_labels
+        )
+        if target_partition_size is None:
+            for mp in mps:
+                yield mp
         else:
-            partition_labels = six.iterkeys(dataset_factory.partitions)
+            mps = list(mps)
+            store = dataset_factory.store
+            sizes = map_concurrently(lambda mp: _get_partition_size(store, mp), mps)
+            if None in sizes:
+                LOGGER.warning(
+                    "The file sizes of dataset %s are not available from its store, "
+                    "partitions of unknown size are not packed.",
+                    dataset_factory.dataset_uuid,
+                )
+            for pack in _pack_metapartitions(mps, sizes, target_partition_size):
+                yield pack
+
+
+def get_dispatch_bounds(
+    dataset_factory, dispatch_by, label_filter=None, predicates=None
+):
+    """
+    Get the value ranges of the column ``dispatch_by`` of the MetaPartition lists which
+    are dispatched by :func:`dispatch_metapartitions_from_factory`.
 
-        for part_label in partition_labels:
+    The ranges are derived from the partition index if ``dispatch_by`` is a partition
+    key, or from a :class:`~kartothek.core.index.MinMaxIndex` otherwise. Partitions
+    whose ranges overlap are dispatched together.
+
+    Returns
+    -------
+    List[Tuple[Any, Any]]
+        The sorted, non-overlapping ``(min, max)`` ranges of the dispatched lists.
+    """
+    if predicates is not None:
+        dataset_factory, allowed_labels = _allowed_labels_by_predicates(
+            predicates, dataset_factory
+        )
+    else:
+        allowed_labels = None
+    _, groups = _group_labels_by_bounds(
+        dataset_factory,
+        dispatch_by,
+        _filter_labels(dataset_factory, allowed_labels, label_filter),
+    )
+    return [(lower, upper) for lower, upper, _ in groups]
+
+
+def _filter_labels(dataset_factory, allowed_labels, label_filter):
+    if allowed_labels is not None:
+        partition_labels = allowed_labels
+    else:
+        partition_labels = six.iterkeys(dataset_factory.partitions)
+    if label_filter is not None:
+        partition_labels = (label for label in partition_labels if label_filter(label))
+    return partition_labels
 
-            if label_filter is not None:
-                if not label_filter(part_label):
-                    continue
 
-            part = dataset_factory.partitions[part_label]
+def _group_labels_by_bounds(dataset_factory, column, labels):
+    """
+    Group the partition labels into sorted groups with non-overlapping value ranges
+    of ``column``.
+
+    Returns
+    -------
+    dataset_factory: kartothek.core.factory.DatasetFactory
+        The factory holding the loaded index.
+    groups: List[Tuple[Any, Any, List[str]]]
+        ``(min, max, labels)`` of every group.
+    """
+    if column in dataset_factory.partition_keys:
+        dataset_factory = dataset_factory.load_partition_indices()
+        bounds = {
+            label: (value, value)
+            for value, index_labels in six.iteritems(
+                dataset_factory.indices[column].index_dct
+            )
+            for label in index_labels
+        }
+    elif isinstance(dataset_factory.indices.get(column), MinMaxIndex):
+        dataset_factory = dataset_factory.load_index(column)
+        bounds = {}
+        for label, (min_, max_, null_count) in six.iteritems(
+            dataset_factory.indices[column].ranges
+        ):
+            if min_ is not None and null_count == 0:
+                bounds[label] = (min_, max_)
+    else:
+        raise ValueError(
+            "Cannot dispatch by `{}`. The column needs to be a partition key or "
+            "have a min/max index.".format(column)
+        )
 
-            yield MetaPartition.from_partition(
-                partition=part,
-                dataset_metadata=dataset_factory.metadata,
-                indices=indices_to_dispatch,
-                metadata_version=dataset_factory.metadata_version,
-                table_meta=dataset_factory.table_meta,
-                partition_keys=dataset_factory.partition_keys,
+    ranges = []
+    for label in labels:
+        if label not in bounds:
+            raise ValueError(
+                "Partition `{}` has no value range for `{}`. Null values are not "
+                "supported.".format(label, column)
             )
+        lower, upper = bounds[label]
+        ranges.append((lower, upper, label))
+    ranges.sort(key=lambda range_: range_[:2])
+
+    groups = []
+    for lower, upper, label in ranges:
+        if groups and lower <= groups[-1][1]:
+            groups[-1][1] = max(groups[-1][1], upper)
+            groups[-1][2].append(label)
+        else:
+            groups.append([lower, upper, [label]])
+    return dataset_factory, [tuple(group) for group in groups]
+
+
+def _get_file_size(store, key):
+    """
+    Get the size of a file from the metadata of the store, without reading it.
+
+    Returns ``None`` if the store does not provide the size.
+    """
+    # Unwrap store decorators, e.g. caches
+    while hasattr(store, "_dstore"):
+        store = store._dstore
+    if isinstance(store, FilesystemStore):
+        return os.path.getsize(store._build_filename(key))
+    if BotoStore is not None and isinstance(store, BotoStore):
+        boto_key = store.bucket.get_key(store.prefix + key)
+        if boto_key is None:
+            raise KeyError(key)
+        return boto_key.size
+    if AzureBlockBlobStore is not None and isinstance(store, AzureBlockBlobStore):
+        blob = store.block_blob_service.get_blob_properties(store.container, key)
+        return blob.properties.content_length
+
+    # Other stores, e.g. in-memory ones, may support seeking to the end
+    fd = store.open(key)
+    try:
+        fd.seek(0, 2)
+        return fd.tell()
+    except (AttributeError, NotImplementedError, io.UnsupportedOperation):
+        return None
+    finally:
+        fd.close()
+
+
+def _get_partition_size(store, mp):
+    sizes = [_get_file_size(store, key) for key in six.itervalues(mp.files)]
+    if None in sizes:
+        return None
+    return sum(sizes)
+
+
+def _pack_metapartitions(mps, sizes, target_size):
+    """
+    Pack consecutive MetaPartitions into lists whose total size does not exceed
+    ``target_size``. MetaPartitions which are larger than ``target_size`` on their
+    own are packed alone.
+
+    Parameters
+    ----------
+    mps: List[MetaPartition]
+    sizes: List[Optional[int]]
+        The size of every MetaPartition. MetaPartitions of unknown size (``None``)
+        are packed alone.
+    target_size: int
+
+    Returns
+    -------
+    List[List[MetaPartition]]
+    """
+    packs = []
+    current = []
+    current_size = 0
+    for mp, size in zip(mps, sizes):
+        if size is None:
+            if current:
+                packs.append(current)
+                current = []
+                current_size = 0
+            packs.append([mp])
+            continue
+        if current and current_size + size > target_size:
+            packs.append(current)
+            current = []
+            current_size = 0
+        current.append(mp)
+        current_size += size
+    if current:
+        packs.append(current)
+    return packs
 
 
 def _allowed_labels_by_predicates(predicates, dataset_factory):
@@ -121,15 +472,23 @@ def _allowed_labels_by_predicates(predicates, dataset_factory):
     for column in columns:
         if column in dataset_factory.indices:
             dataset_factory = dataset_factory.load_index(column)
+    composite_indices = [
+        name
+        for name, index in six.iteritems(dataset_factory.indices)
+        if isinstance(index, CompositeSecondaryIndex) and set(index.columns) <= columns
+    ]
+    for name in composite_indices:
+        dataset_factory = dataset_factory.load_index(name)
 
     # Narrow down predicates to the columns that have an index.
     # The remaining parts of the predicate are filtered during
     # load_dataframes.
     filtered_predicates = []
     for predicate in predicates:
+        composite_columns = _composite_index_columns(predicate, dataset_factory.indices)
         new_predicate = []
         for col, op, val in predicate:
-            if col in dataset_factory.indices:
+            if col in dataset_factory.indices or col in composite_columns:
                 new_predicate.append((col, op, val))
         filtered_predicates.append(new_predicate)
 
@@ -148,11 +507,34 @@ def _allowed_labels_by_predicates(predicates, dataset_factory):
     return dataset_factory, allowed_labels
 
 
+def _applicable_composite_indices(conjunction, indices):
+    """
+    Return all composite indices whose columns are fully covered by the conjunction
+    """
+    conjunction_columns = {col for col, _, _ in conjunction}
+    return [
+        index
+        for index in six.itervalues(indices)
+        if isinstance(index, CompositeSecondaryIndex)
+        and set(index.columns) <= conjunction_columns
+    ]
+
+
+def _composite_index_columns(conjunction, indices):
+    columns = set()
+    for index in _applicable_composite_indices(conjunction, indices):
+        columns.update(index.columns)
+    return columns
+
+
 def _allowed_labels_by_conjunction(conjunction, indices):
     """
     Returns all partition labels which are allowed by the given conjunction (AND)
     of literals based on the indices
 
+    Literals on columns which are covered by a composite index are evaluated on
+    this index as a whole.
+
     Parameters
     ----------
     conjunction: list of tuple
@@ -164,7 +546,19 @@ def _allowed_labels_by_conjunction(conjunction, indices):
     set: allowed labels
     """
     allowed_by_conjunction = None
-    for col, op, val in conjunction:
+    remaining = list(conjunction)
+    for index in _applicable_composite_indices(conjunction, indices):
+        covered = [literal for literal in conjunction if literal[0] in index.columns]
+        allowed_labels = index.eval_conjunction(covered)
+        if allowed_by_conjunction is not None:
+            allowed_by_conjunction &= allowed_labels
+        else:
+            allowed_by_conjunction = allowed_labels
+        remaining = [
+            literal for literal in remaining if literal[0] not in index.columns
+        ]
+
+    for col, op, val in remaining:
         allowed_labels = indices[col].eval_operator(op, val)
         if allowed_by_conjunction is not None:
             allowed_by_conjunction &= allowed_labels
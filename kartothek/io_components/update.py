@@ -28,6 +28,7 @@ def update_dataset_from_partitions(
     delete_scope,
     metadata,
     metadata_merger,
+    checkpoint_interval=None,
 ):
     store = _instantiate_store(store_factory)
 
@@ -52,6 +53,7 @@ def update_dataset_from_partitions(
         metadata_merger=metadata_merger,
         update_dataset=ds_factory,
         remove_partitions=remove_partitions,
+        checkpoint_interval=checkpoint_interval,
     )
 
     return new_dataset
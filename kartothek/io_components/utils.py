@@ -8,6 +8,7 @@ import inspect
 import logging
 
 import decorator
+import numpy as np
 import pandas as pd
 import six
 
@@ -108,11 +109,21 @@ def _instantiate_store(store):
         return store
 
 
+def _index_declaration(index):
+    # composite indices are declared as tuple of columns
+    return tuple(index) if isinstance(index, (tuple, list)) else index
+
+
 def _ensure_compatible_indices(dataset, secondary_indices):
     if dataset:
-        ds_secondary_indices = list(dataset.secondary_indices.keys())
-
-        if secondary_indices and set(ds_secondary_indices) != set(secondary_indices):
+        ds_secondary_indices = [
+            _index_declaration(getattr(index, "columns", column))
+            for column, index in six.iteritems(dataset.secondary_indices)
+        ]
+
+        if secondary_indices and set(ds_secondary_indices) != set(
+            _index_declaration(index) for index in secondary_indices
+        ):
             raise ValueError(
                 "Incorrect indices provided for dataset.\n"
                 "Expected: {}\n"
@@ -123,6 +134,21 @@ def _ensure_compatible_indices(dataset, secondary_indices):
         return secondary_indices
 
 
+def _ensure_compatible_minmax_indices(dataset, minmax_indices):
+    if dataset:
+        ds_minmax_indices = list(dataset.minmax_indices.keys())
+
+        if minmax_indices and set(ds_minmax_indices) != set(minmax_indices):
+            raise ValueError(
+                "Incorrect min/max indices provided for dataset.\n"
+                "Expected: {}\n"
+                "But got: {}".format(ds_minmax_indices, minmax_indices)
+            )
+        return ds_minmax_indices
+    else:
+        return minmax_indices
+
+
 def validate_partition_keys(
     dataset_uuid,
     store,
@@ -158,7 +184,12 @@ def validate_partition_keys(
     return ds_factory, ds_metadata_version, partition_on
 
 
-_ARGS_TO_TYPE = {"partition_on": list, "delete_scope": list, "secondary_indices": list}
+_ARGS_TO_TYPE = {
+    "partition_on": list,
+    "delete_scope": list,
+    "secondary_indices": list,
+    "minmax_indices": list,
+}
 
 
 def normalize_arg(arg_name, old_value):
@@ -223,68 +254,132 @@ def extract_duplicates(lst):
     return [item for item, count in collections.Counter(lst).items() if count > 1]
 
 
-def align_categories(dfs, categoricals):
+def _categories_of(ser):
+    if pd.api.types.is_categorical(ser):
+        return ser.cat.categories
+    return pd.Index(ser.dropna().unique())
+
+
+def _recode_categorical(ser, cat_dtype):
+    """
+    Convert ``ser`` to ``cat_dtype``, remapping the codes of a categorical instead
+    of encoding its values again.
+    """
+    if not pd.api.types.is_categorical(ser):
+        return pd.Series(
+            pd.Categorical(ser, dtype=cat_dtype), index=ser.index, name=ser.name
+        )
+    # The equality of unordered dtypes ignores the order of the categories
+    if not ser.cat.ordered and ser.cat.categories.equals(cat_dtype.categories):
+        return ser
+    codes = ser.cat.codes.values
+    indexer = cat_dtype.categories.get_indexer(ser.cat.categories)
+    if len(indexer):
+        # Missing values keep the code -1
+        codes = np.where(codes == -1, -1, indexer.take(codes))
+    cat = pd.Categorical.from_codes(codes, categories=cat_dtype.categories)
+    return pd.Series(cat, index=ser.index, name=ser.name)
+
+
+def align_categories(dfs, categoricals, categories=None):
     """
     Takes a list of dataframes with categorical columns and determines the superset
     of categories. All specified columns will then be cast to the same `pd.CategoricalDtype`
 
+    The codes of categorical columns are remapped to the common categories, the
+    values are not encoded again.
+
     Parameters
     ----------
     dfs: List[pd.DataFrame]
         A list of dataframes for which the categoricals should be aligned
     categoricals: List[str]
         Columns holding categoricals which should be aligned
+    categories: Dict[str, Iterable], optional
+        Known categories of the columns, e.g. the values of an index. They are used
+        as the first categories of the column, followed by any other values found
+        in the dataframes.
     Returns
     -------
     List[pd.DataFrame]
         A list with aligned dataframes
     """
+    if categories is None:
+        categories = {}
     col_dtype = {}
 
     for column in categoricals:
         position_largest_df = None
-        categories = set()
-        largest_df_categories = set()
+        largest_df_categories = None
+        all_categories = []
         for ix, df in enumerate(dfs):
             ser = df[column]
             if not pd.api.types.is_categorical(ser):
-                cats = ser.unique()
                 LOGGER.info(
                     "Encountered non-categorical type where categorical was expected\n"
                     "Found at index position {ix} for column {col}\n"
                     "Dtypes: {dtypes}".format(ix=ix, col=column, dtypes=df.dtypes)
                 )
             else:
-                cats = ser.cat.categories
                 length = len(df)
                 if position_largest_df is None or length > position_largest_df[0]:
                     position_largest_df = (length, ix)
-                if position_largest_df[1] == ix:
-                    largest_df_categories = cats
-            categories.update(cats)
-
-        # use the categories of the largest DF as a baseline to avoid having
-        # to rewrite its codes. Append the remainder and sort it for reproducibility
-        categories = list(largest_df_categories) + sorted(
-            set(categories) - set(largest_df_categories)
-        )
-        cat_dtype = pd.api.types.CategoricalDtype(categories)
-        col_dtype[column] = cat_dtype
+                    largest_df_categories = ser.cat.categories
+            cats = _categories_of(ser)
+            # The categories of most frames are usually identical
+            if not any(cats.equals(other) for other in all_categories[-1:]):
+                all_categories.append(cats)
+
+        if largest_df_categories is None:
+            largest_df_categories = pd.Index([])
+        base_categories = largest_df_categories
+        known_categories = categories.get(column)
+        if known_categories is not None:
+            known_categories = pd.Index(known_categories)
+            if (
+                len(largest_df_categories) == 0
+                or known_categories.dtype == largest_df_categories.dtype
+            ):
+                base_categories = known_categories
+            else:
+                LOGGER.info(
+                    "Ignoring known categories of column {col} with dtype {dtype}, "
+                    "the data has dtype {data_dtype}".format(
+                        col=column,
+                        dtype=known_categories.dtype,
+                        data_dtype=largest_df_categories.dtype,
+                    )
+                )
+
+        # use the categories of the largest DF (or the known categories) as a
+        # baseline to avoid having to rewrite its codes. Append the remainder and
+        # sort it for reproducibility
+        remainder = [
+            cats for cats in all_categories if not cats.equals(base_categories)
+        ]
+        if remainder:
+            remainder = remainder[0].append(remainder[1:]).unique()
+            remainder = remainder[~remainder.isin(base_categories)]
+            try:
+                remainder = remainder.sort_values()
+            except TypeError:
+                pass
+            if len(base_categories):
+                base_categories = base_categories.append(remainder)
+            else:
+                base_categories = remainder
+        col_dtype[column] = pd.api.types.CategoricalDtype(base_categories)
 
     return_dfs = []
     for df in dfs:
-        try:
-            new_df = df.astype(col_dtype, copy=False)
-        except ValueError as verr:
-            cat_types = {
-                col: dtype.categories.dtype for col, dtype in col_dtype.items()
-            }
-            # Should be fixed by pandas>=0.24.0
-            if "buffer source array is read-only" in str(verr):
-                new_df = df.astype(cat_types)
-                new_df = new_df.astype(col_dtype)
-            else:
-                raise verr
+        new_df = df
+        for column, cat_dtype in six.iteritems(col_dtype):
+            original = df[column]
+            ser = _recode_categorical(original, cat_dtype)
+            if ser is not original:
+                if new_df is df:
+                    new_df = df.copy(deep=False)
+                new_df[column] = ser
         return_dfs.append(new_df)
     return return_dfs
 
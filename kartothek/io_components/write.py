@@ -1,19 +1,32 @@
 # -*- coding: utf-8 -*-
 
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 import six
 
 from kartothek.core import naming
+from kartothek.core.commit_log import (
+    create_commit_log,
+    delete_commits,
+    needs_checkpoint,
+    render_commit,
+)
 from kartothek.core.common_metadata import (
+    make_meta,
     read_schema_metadata,
     store_schema_metadata,
     validate_compatible,
     validate_shared_columns,
 )
 from kartothek.core.dataset import DatasetMetadataBuilder
-from kartothek.core.index import ExplicitSecondaryIndex, PartitionIndex
+from kartothek.core.index import (
+    CompositeSecondaryIndex,
+    ExplicitSecondaryIndex,
+    MinMaxIndex,
+    PartitionIndex,
+)
+from kartothek.core.manifest import delete_stale_manifests
 from kartothek.core.partition import Partition
 from kartothek.io_components.metapartition import (
     SINGLE_TABLE,
@@ -102,6 +115,7 @@ def store_dataset_from_partitions(
     update_dataset=None,
     remove_partitions=None,
     metadata_storage_format=naming.DEFAULT_METADATA_STORAGE_FORMAT,
+    checkpoint_interval=None,
 ):
     store = _instantiate_store(store)
 
@@ -156,18 +170,110 @@ def store_dataset_from_partitions(
     dataset_builder = update_indices(
         dataset_builder, store, partition_list, remove_partitions
     )
+
+    commit_log = dataset_builder.commit_log
+    new_commit_log = False
+    if checkpoint_interval is not None:
+        if commit_log is None:
+            # Remove leftovers of an overwritten dataset, no header references them
+            delete_commits(store, dataset_uuid)
+            commit_log = create_commit_log(checkpoint_interval)
+            new_commit_log = True
+        else:
+            commit_log["checkpoint_interval"] = checkpoint_interval
+        dataset_builder.commit_log = commit_log
+
+    if commit_log is not None and update_dataset:
+        previous_snapshot = commit_log["snapshot"]
+        # The header of a dataset without a log does not reference the log yet,
+        # the commit enabling it therefore needs to be a snapshot.
+        write_snapshot = new_commit_log or needs_checkpoint(commit_log)
+        commit_log["commit"] += 1
+        if not write_snapshot:
+            store.put(
+                *render_commit(
+                    commit=commit_log["commit"],
+                    dataset_builder=dataset_builder,
+                    add_partitions=_partitions_from_mps(partition_list),
+                    remove_partitions=remove_partitions,
+                )
+            )
+            return dataset_builder.to_dataset()
+        commit_log["snapshot"] = commit_log["commit"]
+
+    _store_dataset_header(store, dataset_builder, metadata_storage_format)
+    if commit_log is not None and update_dataset:
+        # Keep the commits of the previous snapshot for readers which are still
+        # replaying them.
+        delete_commits(store, dataset_uuid, up_to=previous_snapshot)
+    dataset = dataset_builder.to_dataset()
+    return dataset
+
+
+def store_empty_dataset_header(
+    store,
+    dataset_uuid,
+    table_meta,
+    partition_on=None,
+    metadata=None,
+    metadata_storage_format=naming.DEFAULT_METADATA_STORAGE_FORMAT,
+    metadata_version=naming.DEFAULT_METADATA_VERSION,
+):
+    """
+    Store the schemas and the header of a dataset without any partitions.
+
+    An existing header of the dataset is overwritten.
+    """
+    store = _instantiate_store(store)
+
+    for table, schema in six.iteritems(table_meta):
+        table_meta[table] = make_meta(schema, origin=table, partition_keys=partition_on)
+        store_schema_metadata(
+            schema=table_meta[table],
+            dataset_uuid=dataset_uuid,
+            store=store,
+            table=table,
+        )
+    dataset_builder = DatasetMetadataBuilder(
+        uuid=dataset_uuid,
+        metadata_version=metadata_version,
+        partition_keys=partition_on,
+        explicit_partitions=False,
+        table_meta=table_meta,
+    )
+    if metadata:
+        for key, value in six.iteritems(metadata):
+            dataset_builder.add_metadata(key, value)
+    _store_dataset_header(store, dataset_builder, metadata_storage_format)
+    return dataset_builder.to_dataset()
+
+
+def _store_dataset_header(store, dataset_builder, metadata_storage_format):
     if metadata_storage_format.lower() == "json":
         store.put(*dataset_builder.to_json())
     elif metadata_storage_format.lower() == "msgpack":
         store.put(*dataset_builder.to_msgpack())
+    elif metadata_storage_format.lower() == "manifest":
+        store_manifest_metadata(store, dataset_builder)
     else:
         raise ValueError(
             "Unkown metadata storage format encountered: {}".format(
                 metadata_storage_format
             )
         )
-    dataset = dataset_builder.to_dataset()
-    return dataset
+
+
+def store_manifest_metadata(store, dataset_builder):
+    """
+    Store the dataset metadata with the partitions in a manifest, see
+    :meth:`~kartothek.core.dataset.DatasetMetadataBuilder.to_manifest`, and delete
+    the stale manifests.
+    """
+    objects = dataset_builder.to_manifest()
+    for key, value in objects:
+        store.put(key, value)
+    if len(objects) > 1:
+        delete_stale_manifests(store, dataset_builder.uuid, keep=objects[0][0])
 
 
 def update_metadata(dataset_builder, metadata_merger, add_partitions, dataset_metadata):
@@ -187,16 +293,22 @@ def update_metadata(dataset_builder, metadata_merger, add_partitions, dataset_me
     return dataset_builder
 
 
-def update_partitions(dataset_builder, add_partitions, remove_partitions):
-
-    for mp in add_partitions:
+def _partitions_from_mps(mps):
+    partitions = OrderedDict()
+    for mp in mps:
         for sub_mp_dct in mp.metapartitions:
             # label is None in case of an empty partition
             if sub_mp_dct["label"] is not None:
-                partition = Partition(
+                partitions[sub_mp_dct["label"]] = Partition(
                     label=sub_mp_dct["label"], files=sub_mp_dct["files"]
                 )
-                dataset_builder.add_partition(sub_mp_dct["label"], partition)
+    return partitions
+
+
+def update_partitions(dataset_builder, add_partitions, remove_partitions):
+
+    for label, partition in six.iteritems(_partitions_from_mps(add_partitions)):
+        dataset_builder.add_partition(label, partition)
 
     for partition_name in remove_partitions:
         del dataset_builder.partitions[partition_name]
@@ -228,7 +340,13 @@ def update_indices(dataset_builder, store, add_partitions, remove_partitions):
         store=store, dataset_uuid=dataset_builder.uuid, indices=dataset_indices
     )
     for column, filename in six.iteritems(index_filenames):
-        dataset_builder.add_external_index(column, filename)
+        index = dataset_indices[column]
+        if isinstance(index, MinMaxIndex):
+            dataset_builder.add_external_minmax_index(column, filename)
+        elif isinstance(index, CompositeSecondaryIndex):
+            dataset_builder.add_external_composite_index(index.columns, filename)
+        else:
+            dataset_builder.add_external_index(column, filename)
 
     return dataset_builder
 
@@ -6,6 +6,7 @@ import pyarrow as pa
 from kartothek.core.common_metadata import SchemaWrapper
 
 ARROW_LARGER_EQ_0130 = LooseVersion(pa.__version__) >= "0.13.0"
+ARROW_LARGER_EQ_0160 = LooseVersion(pa.__version__) >= "0.16.0"
 
 
 def _fix_pyarrow_0130_table(table):
@@ -179,6 +179,66 @@ class ParquetSerializer(DataFrameSerializer):
         else:
             return df
 
+    @staticmethod
+    def restore_table(store, key, columns=None):
+        """
+        Load the columns of a Parquet file as a :class:`pyarrow.Table`.
+
+        Contrary to :meth:`restore_dataframe`, the data is not converted to pandas
+        and the pandas metadata of the file is ignored, e.g. the stored index is
+        not part of the returned table.
+        """
+        if columns is None:
+            reader = pa.BufferReader(store.get(key))
+        elif HAVE_BOTO and isinstance(store, BotoStore):
+            # See restore_dataframe
+            reader = pa.BufferReader(store.get(key))
+        else:
+            reader = BlockBuffer(store.open(key), 4 * 1024 * 1024)
+        try:
+            table = pq.read_table(reader, columns=columns, use_pandas_metadata=False)
+        finally:
+            reader.close()
+
+        table = _fix_pyarrow_07992_table(table)
+        table = _fix_pyarrow_0130_table(table)
+
+        if columns is not None:
+            missing_columns = set(columns) - set(table.schema.names)
+            if missing_columns:
+                raise ValueError(
+                    u"Columns cannot be found in stored dataframe: {missing}".format(
+                        missing=u", ".join(sorted(missing_columns))
+                    )
+                )
+        return table
+
+    @staticmethod
+    def restore_row_groups(store, key, columns=None, date_as_object=False):
+        """
+        Iterate over the row groups of a Parquet file as DataFrames.
+
+        Only a single row group is held in memory at a time. The index of the
+        stored DataFrame is not restored.
+        """
+        reader = _open_parquet_reader(store, key)
+        try:
+            parquet_file = ParquetFile(reader)
+            if columns is not None:
+                missing_columns = set(columns) - set(parquet_file.schema.names)
+                if missing_columns:
+                    raise ValueError(
+                        u"Columns cannot be found in stored dataframe: {missing}".format(
+                            missing=u", ".join(sorted(missing_columns))
+                        )
+                    )
+            for row_group in range(parquet_file.num_row_groups):
+                yield _read_row_group(
+                    parquet_file, row_group, columns, date_as_object=date_as_object
+                )
+        finally:
+            reader.close()
+
     def store(self, store, key_prefix, df):
         key = "{}.parquet".format(key_prefix)
         if isinstance(df, pa.Table):
@@ -200,6 +260,22 @@ class ParquetSerializer(DataFrameSerializer):
         return key
 
 
+def _open_parquet_reader(store, key):
+    if HAVE_BOTO and isinstance(store, BotoStore):
+        # See restore_dataframe
+        return pa.BufferReader(store.get(key))
+    return BlockBuffer(store.open(key), 4 * 1024 * 1024)
+
+
+def _read_row_group(parquet_file, row_group, columns, date_as_object=False):
+    table = parquet_file.read_row_group(row_group, columns=columns)
+    table = _fix_pyarrow_07992_table(table)
+    table = _fix_pyarrow_0130_table(table)
+    df = table.to_pandas(date_as_object=date_as_object)
+    df.columns = df.columns.map(ensure_unicode_string_type)
+    return df
+
+
 def _columns_for_pushdown(columns, predicates):
     if columns is None:
         return
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import simplejson
+
+from kartothek.core.commit_log import (
+    create_commit_log,
+    delete_commits,
+    list_commits,
+    needs_checkpoint,
+    replay_commits,
+)
+from kartothek.core.dataset import DatasetMetadataBuilder
+from kartothek.core.partition import Partition
+
+
+def test_create_commit_log_raises():
+    with pytest.raises(ValueError):
+        create_commit_log(0)
+
+
+def test_needs_checkpoint():
+    commit_log = create_commit_log(2, commit=4)
+    assert not needs_checkpoint(commit_log)
+    commit_log["commit"] = 5
+    assert needs_checkpoint(commit_log)
+
+
+def _put_commit(store, commit, **kwargs):
+    dct = {
+        "commit": commit,
+        "add_partitions": {},
+        "remove_partitions": [],
+        "metadata": {},
+        "partition_keys": None,
+    }
+    dct.update(kwargs)
+    store.put(
+        "uuid.by-dataset-metadata.commit.{:012d}.json".format(commit),
+        simplejson.dumps(dct).encode("utf-8"),
+    )
+
+
+def test_replay_commits(store):
+    builder = DatasetMetadataBuilder("uuid")
+    builder.add_partition("part_1", Partition("part_1", {"core": "part_1.parquet"}))
+    builder.commit_log = create_commit_log(10, commit=1)
+    key, snapshot = builder.to_json()
+    store.put(key, snapshot)
+
+    # commits covered by the snapshot are ignored
+    _put_commit(store, 1, add_partitions={"old": {"files": {"core": "old.parquet"}}})
+    _put_commit(
+        store,
+        2,
+        add_partitions={"part_2": {"files": {"core": "part_2.parquet"}}},
+        metadata={"update": 2},
+    )
+    _put_commit(store, 3, remove_partitions=["part_1"], metadata={"update": 3})
+    store.put("uuid.by-dataset-metadata.commit.unrelated.json", b"{}")
+
+    dct = replay_commits(simplejson.loads(snapshot), store)
+    assert list(dct["partitions"]) == ["part_2"]
+    assert dct["partitions"]["part_2"] == {"files": {"core": "part_2.parquet"}}
+    assert dct["metadata"] == {"update": 3}
+    assert dct["commit_log"] == {"checkpoint_interval": 10, "snapshot": 1, "commit": 3}
+
+    assert [commit for commit, _ in list_commits(store, "uuid")] == [1, 2, 3]
+    delete_commits(store, "uuid", up_to=2)
+    assert [commit for commit, _ in list_commits(store, "uuid")] == [3]
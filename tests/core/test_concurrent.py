@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+
+from kartothek.core import _concurrent
+from kartothek.core._concurrent import (
+    iter_keys_sharded,
+    iter_prefetched,
+    map_concurrently,
+)
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 3])
+def test_map_concurrently_preserves_order(max_workers):
+    def func(item):
+        # finish in reverse order
+        time.sleep(0.001 * (10 - item))
+        return item * 2
+
+    assert map_concurrently(func, range(10), max_workers=max_workers) == [
+        item * 2 for item in range(10)
+    ]
+
+
+def test_map_concurrently_raises_first_error():
+    def func(item):
+        if item == 1:
+            time.sleep(0.05)
+            raise ValueError("first")
+        if item == 3:
+            raise KeyError("second")
+        return item
+
+    with pytest.raises(ValueError, match="first"):
+        map_concurrently(func, range(5))
+
+
+def test_map_concurrently_sequential(monkeypatch):
+    monkeypatch.setattr(_concurrent, "MAX_CONCURRENT_REQUESTS", 1)
+    threads = map_concurrently(lambda _: threading.current_thread(), range(3))
+    assert threads == [threading.current_thread()] * 3
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iter_prefetched(prefetch):
+    consumed = []
+
+    def items():
+        for item in range(10):
+            consumed.append(item)
+            yield item
+
+    def func(item):
+        # finish in reverse order
+        time.sleep(0.001 * (10 - item))
+        return item * 2
+
+    result = []
+    for value in iter_prefetched(func, items(), prefetch):
+        # Only the items which are prefetched are consumed
+        assert len(consumed) <= min(len(result) + prefetch + 1, 10)
+        result.append(value)
+    assert result == [item * 2 for item in range(10)]
+
+
+def test_iter_prefetched_raises_in_order():
+    def func(item):
+        if item == 2:
+            raise ValueError("two")
+        if item == 3:
+            raise KeyError("three")
+        return item
+
+    it = iter_prefetched(func, range(5), prefetch=3)
+    assert next(it) == 0
+    assert next(it) == 1
+    with pytest.raises(ValueError, match="two"):
+        next(it)
+
+
+def test_iter_prefetched_stop_early():
+    calls = []
+
+    def func(item):
+        calls.append(item)
+        return item
+
+    it = iter_prefetched(func, range(100), prefetch=2)
+    assert next(it) == 0
+    it.close()
+    time.sleep(0.01)
+    assert len(calls) <= 3
+
+
+@pytest.mark.parametrize("depth", [0, 1, 2, 3])
+def test_iter_keys_sharded(store, depth):
+    keys = [
+        "uuid/core/_common_metadata",
+        "uuid/core/p=1/a=1/part.parquet",
+        "uuid/core/p=1/a=2/part.parquet",
+        "uuid/core/p=10/part.parquet",
+        "uuid/core/p=1.parquet",
+        "uuid/helper/part.parquet",
+        "uuid/indices/p/index.parquet",
+        "uuid2/core/part.parquet",
+    ]
+    for key in keys:
+        store.put(key, b"")
+
+    result = iter_keys_sharded(store, ["uuid/core/", "uuid/indices/"], depth=depth)
+    assert list(result) == sorted(
+        key
+        for key in keys
+        if key.startswith("uuid/core/") or key.startswith("uuid/indices/")
+    )
@@ -467,3 +467,43 @@ def test_load_missing(store):
     assert exc.value.args == (
         "Dataset does not exist. Tried not_there.by-dataset-metadata.json and not_there.by-dataset-metadata.msgpack.zstd",
     )
+
+
+def test_load_partition_indices_quoted_values(store):
+    meta_dct = {
+        "dataset_metadata_version": 4,
+        "dataset_uuid": "uuid",
+        "partitions": {
+            "part_1": {"files": {"core": "uuid/core/loc=a%2Fb/day=1/part_1.parquet"}},
+            "part_2": {"files": {"core": "uuid/core/loc=a%2Fb/day=2/part_2.parquet"}},
+            "part_3": {"files": {"core": "uuid/core/loc=c/day=1/part_3.parquet"}},
+        },
+    }
+    dmd = DatasetMetadata.load_from_dict(meta_dct, store, load_schema=False)
+    dmd = dmd.copy(
+        table_meta={
+            "core": make_meta(pd.DataFrame({"loc": ["a"], "day": ["1"]}), origin="core")
+        }
+    )
+    loaded = dmd.load_partition_indices()
+
+    assert sorted(loaded.indices["loc"].index_dct["a/b"]) == ["part_1", "part_2"]
+    assert loaded.indices["loc"].index_dct["c"] == ["part_3"]
+    assert sorted(loaded.indices["day"].index_dct["1"]) == ["part_1", "part_3"]
+    # the decoded partition keys are kept and shared with copies of the same partitions
+    assert dmd._partition_key_columns is not None
+    assert dmd.copy()._partition_key_columns is dmd._partition_key_columns
+
+
+def test_load_partition_indices_inconsistent_depth(store):
+    meta_dct = {
+        "dataset_metadata_version": 4,
+        "dataset_uuid": "uuid",
+        "partitions": {
+            "part_1": {"files": {"core": "uuid/core/loc=a/day=1/part_1.parquet"}},
+            "part_2": {"files": {"core": "uuid/core/loc=c/part_2.parquet"}},
+        },
+    }
+    dmd = DatasetMetadata.load_from_dict(meta_dct, store, load_schema=False)
+    with pytest.raises(RuntimeError, match="Depth of filename indices"):
+        dmd.load_partition_indices()
@@ -13,7 +13,13 @@ import six
 from hypothesis import assume, given
 from pandas.testing import assert_series_equal
 
-from kartothek.core.index import ExplicitSecondaryIndex, merge_indices
+from kartothek.core.index import (
+    CompositeSecondaryIndex,
+    ExplicitSecondaryIndex,
+    MinMaxIndex,
+    SecondaryIndexBase,
+    merge_indices,
+)
 from kartothek.core.testing import get_numpy_array_strategy
 
 
@@ -620,3 +626,128 @@ def test_index_uint():
         },
     )
     assert index.dtype == "uint64"
+
+
+@pytest.fixture
+def minmax_index():
+    return MinMaxIndex(
+        column="col",
+        ranges={
+            "part_1": (pd.Timestamp("2017-01-01"), pd.Timestamp("2017-01-10"), 0),
+            "part_2": (pd.Timestamp("2017-01-05"), pd.Timestamp("2017-01-20"), 1),
+            "part_3": (pd.Timestamp("2017-02-01"), pd.Timestamp("2017-02-01"), 0),
+            "part_4": (None, None, 3),
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "op, value, expected",
+    [
+        ("==", pd.Timestamp("2017-01-07"), {"part_1", "part_2"}),
+        ("==", pd.Timestamp("2017-01-15"), {"part_2"}),
+        ("==", pd.Timestamp("2017-01-25"), set()),
+        ("<", pd.Timestamp("2017-01-05"), {"part_1"}),
+        ("<=", pd.Timestamp("2017-01-05"), {"part_1", "part_2"}),
+        (">", pd.Timestamp("2017-01-20"), {"part_3"}),
+        (">=", pd.Timestamp("2017-01-20"), {"part_2", "part_3"}),
+        ("!=", pd.Timestamp("2017-02-01"), {"part_1", "part_2", "part_4"}),
+        (
+            "in",
+            [pd.Timestamp("2017-01-01"), pd.Timestamp("2017-02-01")],
+            {"part_1", "part_3"},
+        ),
+    ],
+)
+def test_minmax_index_eval_operator(minmax_index, op, value, expected):
+    assert minmax_index.dtype == pa.timestamp("ns")
+    assert minmax_index.eval_operator(op, value) == expected
+
+
+def test_minmax_index_update_remove(minmax_index):
+    new_index = MinMaxIndex(
+        column="col",
+        ranges={"part_5": (pd.Timestamp("2018-01-01"), pd.Timestamp("2018-01-02"), 0)},
+    )
+    updated = minmax_index.update(new_index)
+    assert updated.eval_operator(">", pd.Timestamp("2017-12-31")) == {"part_5"}
+    assert "part_5" not in minmax_index.ranges
+
+    removed = updated.remove_partitions(["part_1", "part_5"])
+    assert set(removed.ranges) == {"part_2", "part_3", "part_4"}
+    assert removed.index_storage_key is None
+
+
+def test_minmax_index_store_and_load(store, minmax_index):
+    storage_key = minmax_index.store(store=store, dataset_uuid="uuid")
+    assert storage_key.endswith(".by-dataset-minmax-index.parquet")
+
+    external_index = MinMaxIndex(column="col", index_storage_key=storage_key)
+    assert not external_index.loaded
+    loaded_index = external_index.load(store)
+    assert loaded_index.loaded
+    assert loaded_index.dtype == pa.timestamp("ns")
+    assert loaded_index.ranges == minmax_index.ranges
+
+
+def test_minmax_index_no_values():
+    index = MinMaxIndex(column="col", ranges={"part_1": (None, None, 2)})
+    assert index.dtype is None
+    assert index.eval_operator("==", 1) == set()
+    assert index.eval_operator("!=", 1) == {"part_1"}
+
+
+@pytest.fixture
+def composite_index():
+    return CompositeSecondaryIndex(
+        columns=["country", "product"],
+        index_dct={
+            ("DE", 42): ["part_1"],
+            ("DE", 43): ["part_1", "part_2"],
+            ("FR", 42): ["part_3"],
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "conjunction, expected",
+    [
+        ([("country", "==", "DE"), ("product", "==", 42)], {"part_1"}),
+        ([("country", "==", "FR"), ("product", "==", 43)], set()),
+        ([("country", "!=", "FR"), ("product", ">=", 43)], {"part_1", "part_2"}),
+        (
+            [("country", "in", ["DE", "FR"]), ("product", "==", 42)],
+            {"part_1", "part_3"},
+        ),
+    ],
+)
+def test_composite_index_eval_conjunction(composite_index, conjunction, expected):
+    assert composite_index.column == "country&product"
+    assert composite_index.dtypes == [pa.string(), pa.int64()]
+    assert composite_index.eval_conjunction(conjunction) == expected
+
+
+def test_composite_index_store_and_load(store, composite_index):
+    storage_key = composite_index.store(store=store, dataset_uuid="uuid")
+
+    external_index = CompositeSecondaryIndex(
+        columns=["country", "product"], index_storage_key=storage_key
+    )
+    loaded_index = external_index.load(store)
+    assert loaded_index.dtypes == composite_index.dtypes
+    assert loaded_index.index_dct == composite_index.index_dct
+    assert loaded_index.query(("DE", 43)) == ["part_1", "part_2"]
+
+    updated_index = loaded_index.remove_partitions(["part_1"])
+    assert updated_index.index_dct == {("DE", 43): ["part_2"], ("FR", 42): ["part_3"]}
+    assert updated_index.index_storage_key is None
+
+
+def test_composite_index_is_no_explicit_index(composite_index):
+    assert isinstance(composite_index, SecondaryIndexBase)
+    assert not isinstance(composite_index, ExplicitSecondaryIndex)
+    single_index = ExplicitSecondaryIndex(
+        column=composite_index.column, index_dct={"DE": ["part_1"]}
+    )
+    assert composite_index != single_index
+    assert single_index != composite_index
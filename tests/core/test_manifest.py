@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import pytest
+
+from kartothek.core.manifest import PartitionManifest
+from kartothek.core.partition import Partition
+
+
+@pytest.fixture
+def partitions():
+    return OrderedDict(
+        [
+            (
+                "P=1/L=%C3%96/part_1",
+                Partition(
+                    "P=1/L=%C3%96/part_1",
+                    files={
+                        "core": "uuid/core/P=1/L=%C3%96/part_1.parquet",
+                        "helper": "uuid/helper/P=1/L=%C3%96/part_1.parquet",
+                    },
+                ),
+            ),
+            (
+                "P=2/L=a/part_1",
+                Partition(
+                    "P=2/L=a/part_1", files={"core": "uuid/core/P=2/L=a/part_1.parquet"}
+                ),
+            ),
+            (
+                "P=1/L=a/part_2",
+                Partition(
+                    "P=1/L=a/part_2", files={"core": "uuid/core/P=1/L=a/part_2.parquet"}
+                ),
+            ),
+        ]
+    )
+
+
+def test_manifest_mapping(partitions):
+    manifest = PartitionManifest.from_partitions(partitions, ["P", "L"])
+
+    assert len(manifest) == 3
+    assert list(manifest) == list(partitions)
+    assert manifest.tables == ["core", "helper"]
+    assert "P=2/L=a/part_1" in manifest
+    assert "P=3/L=a/part_1" not in manifest
+    assert manifest["P=1/L=%C3%96/part_1"] == partitions["P=1/L=%C3%96/part_1"]
+    # partitions without a file for a table don't reference it
+    assert manifest["P=2/L=a/part_1"].files == {
+        "core": "uuid/core/P=2/L=a/part_1.parquet"
+    }
+    assert dict(manifest) == dict(partitions)
+    with pytest.raises(KeyError):
+        manifest["P=3/L=a/part_1"]
+
+
+def test_manifest_partition_key_columns(partitions):
+    manifest = PartitionManifest.from_partitions(partitions, ["P", "L"])
+
+    assert manifest.partition_key_columns() == {
+        "P": {"1": ["P=1/L=%C3%96/part_1", "P=1/L=a/part_2"], "2": ["P=2/L=a/part_1"]},
+        "L": {u"Ö": ["P=1/L=%C3%96/part_1"], "a": ["P=2/L=a/part_1", "P=1/L=a/part_2"]},
+    }
+
+
+def test_manifest_roundtrip(store, partitions):
+    manifest = PartitionManifest.from_partitions(partitions, ["P", "L"])
+    manifest.store(store, "uuid.manifest")
+
+    loaded = PartitionManifest.load(store, "uuid.manifest")
+    assert loaded == manifest
+    assert list(loaded) == list(partitions)
+    assert loaded.partition_key_columns() == manifest.partition_key_columns()
+
+
+def test_manifest_empty(store):
+    manifest = PartitionManifest.from_partitions({})
+    manifest.store(store, "uuid.manifest")
+
+    loaded = PartitionManifest.load(store, "uuid.manifest")
+    assert len(loaded) == 0
+    assert loaded.tables == []
+
+
+def test_manifest_not_aligned():
+    with pytest.raises(ValueError, match="not aligned"):
+        PartitionManifest(["a", "b"], {"core": ["a.parquet"]})
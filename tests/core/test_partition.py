@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import pickle
+
 import pytest
 
-from kartothek.core.partition import Partition
+from kartothek.core.partition import CopyOnWritePartitions, LazyPartitions, Partition
 
 
 def test_roundtrip():
@@ -36,3 +38,75 @@ def test_eq():
     assert Partition(label="label", files={"some": "file"}) == Partition(
         label="label", files={"some": "file"}
     )
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(protocol):
+    partition = Partition(label="label", files={"some": "file"})
+    assert not hasattr(partition, "__dict__")
+    assert pickle.loads(pickle.dumps(partition, protocol=protocol)) == partition
+
+
+def _raw_partitions():
+    return {
+        "P=1/part_1": {"files": {"core": "uuid/core/P=1/part_1.parquet"}},
+        "P=10/part_1": {"files": {"core": "uuid/core/P=10/part_1.parquet"}},
+        "P=2/part_1": {"files": {"core": "uuid/core/P=2/part_1.parquet"}},
+    }
+
+
+def test_lazy_partitions():
+    partitions = LazyPartitions(_raw_partitions())
+
+    assert len(partitions) == 3
+    assert list(partitions) == list(_raw_partitions())
+    assert "P=2/part_1" in partitions
+    assert partitions["P=2/part_1"] == Partition(
+        "P=2/part_1", files={"core": "uuid/core/P=2/part_1.parquet"}
+    )
+    with pytest.raises(KeyError):
+        partitions["P=3/part_1"]
+    assert partitions.labels_with_prefix("P=1") == ["P=1/part_1", "P=10/part_1"]
+    assert partitions.labels_with_prefix("P=1/") == ["P=1/part_1"]
+    assert partitions.labels_with_prefix("P=3/") == []
+
+
+def test_lazy_partitions_raise_on_erroneous_input():
+    with pytest.raises(ValueError):
+        LazyPartitions({"label": "some_not_supported_external_ref"})
+
+
+def test_copy_on_write_partitions():
+    base = LazyPartitions(_raw_partitions())
+    partitions = CopyOnWritePartitions(base)
+
+    new_partition = Partition("P=3/part_1", files={"core": "new.parquet"})
+    partitions["P=3/part_1"] = new_partition
+    del partitions["P=10/part_1"]
+    replaced = Partition("P=1/part_1", files={"core": "replaced.parquet"})
+    partitions["P=1/part_1"] = replaced
+
+    assert list(partitions) == ["P=1/part_1", "P=2/part_1", "P=3/part_1"]
+    assert len(partitions) == 3
+    assert partitions["P=1/part_1"] == replaced
+    assert partitions["P=3/part_1"] == new_partition
+    assert "P=10/part_1" not in partitions
+    with pytest.raises(KeyError):
+        partitions["P=10/part_1"]
+    with pytest.raises(KeyError):
+        del partitions["P=10/part_1"]
+    assert partitions.labels_with_prefix("P=") == [
+        "P=1/part_1",
+        "P=2/part_1",
+        "P=3/part_1",
+    ]
+
+    # the underlying mapping is left untouched
+    assert len(base) == 3
+    assert "P=10/part_1" in base
+    assert "P=3/part_1" not in base
+
+    # re-adding a removed partition appends it
+    partitions["P=10/part_1"] = base["P=10/part_1"]
+    assert list(partitions) == ["P=1/part_1", "P=2/part_1", "P=3/part_1", "P=10/part_1"]
+    assert len(partitions) == 4
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+from functools import partial
+
+import pandas as pd
+import pandas.testing as pdt
+import storefact
+
+from kartothek.core import store_cache
+from kartothek.core.store_cache import (
+    CacheInfo,
+    DiskCacheStore,
+    DiskCacheStoreFactory,
+    is_immutable_key,
+)
+from kartothek.io.eager import read_table, store_dataframes_as_dataset
+
+
+def _cached_files(cache_dir):
+    return sorted(os.listdir(cache_dir))
+
+
+def test_is_immutable_key():
+    assert is_immutable_key("uuid/table/part.parquet")
+    assert is_immutable_key("uuid/indices/x/2019.by-dataset-index.parquet")
+    assert not is_immutable_key("uuid/table/_common_metadata")
+    assert not is_immutable_key("uuid.by-dataset-metadata.json")
+    assert not is_immutable_key("uuid.by-dataset-metadata.partitions.parquet")
+
+
+def test_disk_cache_store_get(store, tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    store.put("uuid/table/part.parquet", b"data")
+    store.put("uuid.by-dataset-metadata.json", b"{}")
+    cached_store = DiskCacheStore(store, cache_dir, max_bytes=100)
+
+    assert cached_store.get("uuid/table/part.parquet") == b"data"
+    assert cached_store.get("uuid/table/part.parquet") == b"data"
+    assert cached_store.get("uuid.by-dataset-metadata.json") == b"{}"
+    assert cached_store.cache_info() == CacheInfo(hits=1, misses=1, evictions=0)
+    assert len(_cached_files(cache_dir)) == 1
+
+    # The cache directory is shared with other stores
+    other_store = DiskCacheStore(store, cache_dir, max_bytes=100)
+    with other_store.open("uuid/table/part.parquet") as fp:
+        fp.seek(2)
+        assert fp.read() == b"ta"
+    assert other_store.cache_info() == CacheInfo(hits=1, misses=0, evictions=0)
+
+    # Stores are passed through
+    assert "uuid/table/part.parquet" in cached_store
+    assert sorted(cached_store.keys()) == sorted(store.keys())
+
+    cached_store.delete("uuid/table/part.parquet")
+    assert _cached_files(cache_dir) == []
+    assert "uuid/table/part.parquet" not in store
+
+
+def test_disk_cache_store_evicts_least_recently_used(store, tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    for name in ["a", "b", "c"]:
+        store.put("{}.parquet".format(name), b"x" * 10)
+    store.put("large.parquet", b"x" * 30)
+    cached_store = DiskCacheStore(store, cache_dir, max_bytes=25)
+
+    cached_store.get("a.parquet")
+    path_a = cached_store._path("a.parquet")
+    os.utime(path_a, (0, 0))
+    cached_store.get("b.parquet")
+    path_b = cached_store._path("b.parquet")
+    os.utime(path_b, (1, 1))
+    # Accessing `a` makes it the most recently used file
+    cached_store.get("a.parquet")
+    cached_store.get("c.parquet")
+
+    assert cached_store.cache_info() == CacheInfo(hits=1, misses=3, evictions=1)
+    assert os.path.exists(path_a)
+    assert not os.path.exists(path_b)
+
+    # Objects which exceed the budget are not cached
+    assert cached_store.get("large.parquet") == b"x" * 30
+    assert len(_cached_files(cache_dir)) == 2
+
+
+def test_disk_cache_store_factory_read(store, tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    store_factory = partial(storefact.get_store_from_url, "hfs://" + store.root)
+    df = pd.DataFrame({"P": [1, 1, 2], "x": [1, 2, 3]})
+    store_dataframes_as_dataset(
+        dfs=[df], store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+
+    cached_store_factory = DiskCacheStoreFactory(
+        store_factory, cache_dir=cache_dir, max_bytes=10 ** 6
+    )
+    cached_store_factory = pickle.loads(pickle.dumps(cached_store_factory))
+    for _ in range(2):
+        result = read_table(
+            dataset_uuid="uuid",
+            store=cached_store_factory,
+            table="table",
+            columns=["x"],
+            predicates=[[("x", ">", 1)]],
+        )
+        pdt.assert_frame_equal(
+            result.sort_values("x").reset_index(drop=True), pd.DataFrame({"x": [2, 3]})
+        )
+    # Both partition files are cached
+    assert len(_cached_files(cache_dir)) == 2
+    # The counters are shared by all stores of the factory
+    assert cached_store_factory.cache_info() == CacheInfo(hits=2, misses=2, evictions=0)
+
+
+def test_disk_cache_store_separates_stores(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    first = storefact.get_store_from_url("hfs://{}".format(tmpdir.join("a")))
+    second = storefact.get_store_from_url("hfs://{}".format(tmpdir.join("b")))
+    first.put("uuid/table/part.parquet", b"first")
+    second.put("uuid/table/part.parquet", b"second")
+
+    for store, data in [(first, b"first"), (second, b"second"), (first, b"first")]:
+        cached_store = DiskCacheStore(store, cache_dir, max_bytes=100)
+        assert cached_store.get("uuid/table/part.parquet") == data
+    assert len(_cached_files(cache_dir)) == 2
+
+
+def test_disk_cache_store_skips_unidentified_stores(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    store = storefact.get_store_from_url("hmemory://")
+    store.put("uuid/table/part.parquet", b"data")
+
+    cached_store = DiskCacheStore(store, cache_dir, max_bytes=100)
+    assert cached_store.get("uuid/table/part.parquet") == b"data"
+    assert cached_store.get("uuid/table/part.parquet") == b"data"
+    assert _cached_files(cache_dir) == []
+
+
+def test_disk_cache_store_put_invalidates(store, tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    cached_store = DiskCacheStore(store, cache_dir, max_bytes=100)
+    cached_store.put("uuid/table/part.parquet", b"old")
+    assert cached_store.get("uuid/table/part.parquet") == b"old"
+
+    cached_store.put("uuid/table/part.parquet", b"new")
+    assert _cached_files(cache_dir) == []
+    assert cached_store.get("uuid/table/part.parquet") == b"new"
+
+
+def test_disk_cache_store_tracks_size(store, tmpdir, monkeypatch):
+    cache_dir = tmpdir.join("cache").strpath
+    for name in range(20):
+        store.put("{}.parquet".format(name), b"x" * 10)
+    cached_store = DiskCacheStore(store, cache_dir, max_bytes=100)
+
+    listings = []
+    listdir = os.listdir
+
+    def _listdir(path):
+        listings.append(path)
+        return listdir(path)
+
+    monkeypatch.setattr(store_cache.os, "listdir", _listdir)
+    for name in range(20):
+        cached_store.get("{}.parquet".format(name))
+
+    # The directory is only listed when it exceeds the budget and is then shrunk
+    # below the budget
+    assert cached_store.cache_info() == CacheInfo(hits=0, misses=20, evictions=10)
+    assert len(listings) == 5
+    assert len(_cached_files(cache_dir)) == 10
+    assert cached_store._directory.size == 100
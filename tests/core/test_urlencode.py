@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kartothek.core.urlencode import (
+    decode_key,
+    quote,
+    quote_array,
+    quote_indices,
+    unquote,
+    unquote_array,
+    unquote_indices,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("abc", "abc"),
+        (u"ÖŒå", "%C3%96%C5%92%C3%A5"),
+        (b"a b", "a%20b"),
+        (1, "1"),
+        (1.0, "1.0"),
+        (True, "True"),
+        (datetime.date(2019, 1, 1), "2019-01-01"),
+        (pd.Timestamp("2019-01-01"), "2019-01-01%2000%3A00%3A00"),
+    ],
+)
+def test_quote(value, expected):
+    assert quote(value) == expected
+    # the second call is served from the cache
+    assert quote(value) == expected
+    if not isinstance(value, bytes):
+        assert unquote(expected) == str(value)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        ["a", "b", "a", u"ÖŒå", "a/b"],
+        [1, 2, 2, 3],
+        np.array([1.5, 2.5, 1.5]),
+        [0.0, -0.0, 1.0, -0.0, np.nan],
+        [1, 1.0, True, "1"],
+        ["a", None, np.nan, "a"],
+        pd.Series(pd.to_datetime(["2019-01-01", "2019-01-02", "2019-01-01"])),
+    ],
+)
+def test_quote_array(values):
+    expected = [quote(value) for value in pd.Series(values, dtype=object)]
+    result = quote_array(values)
+    assert isinstance(result, np.ndarray)
+    assert list(result) == expected
+    assert list(unquote_array(result)) == [unquote(value) for value in expected]
+
+
+def test_quote_array_multidimensional():
+    with pytest.raises(ValueError):
+        quote_array(np.array([["a"], ["b"]], dtype=object))
+
+
+def test_roundtrip_indices():
+    indices = [(u"ÖŒå", "a=b"), ("col", 1)]
+    quoted = quote_indices(indices)
+    assert quoted == ["%C3%96%C5%92%C3%A5=a%3Db", "col=1"]
+    assert unquote_indices(quoted) == [(u"ÖŒå", "a=b"), ("col", "1")]
+    assert decode_key("uuid/table/{}/label.parquet".format("/".join(quoted))) == (
+        "uuid",
+        "table",
+        [(u"ÖŒå", "a=b"), ("col", "1")],
+        "label.parquet",
+    )
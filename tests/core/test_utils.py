@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+from simplekv.decorator import PrefixDecorator
+from storefact import get_store_from_url
+
+from kartothek.core.utils import store_identity
+
+
+def test_store_identity_filesystem(tmpdir):
+    url = "hfs://{}".format(tmpdir)
+    assert store_identity(get_store_from_url(url)) == store_identity(
+        get_store_from_url(url)
+    )
+    assert store_identity(get_store_from_url(url)) != store_identity(
+        get_store_from_url("hfs://{}".format(tmpdir.join("other")))
+    )
+
+
+def test_store_identity_decorator(tmpdir):
+    store = get_store_from_url("hfs://{}".format(tmpdir))
+    assert store_identity(PrefixDecorator("a/", store)) == store_identity(
+        PrefixDecorator("a/", store)
+    )
+    assert store_identity(PrefixDecorator("a/", store)) != store_identity(
+        PrefixDecorator("b/", store)
+    )
+    assert store_identity(PrefixDecorator("a/", store)) != store_identity(store)
+
+
+def test_store_identity_memory():
+    store = get_store_from_url("memory://")
+    assert store_identity(store) is None
+    assert store_identity(PrefixDecorator("a/", store)) is None
@@ -1,9 +1,15 @@
 from functools import partial
 
+import dask
 import pandas as pd
+import pandas.testing as pdt
 import pytest
 
-from kartothek.io.dask.dataframe import read_dataset_as_ddf
+from kartothek.io.dask._optimize import _load_ddf_partition
+from kartothek.io.dask.dataframe import optimize_kartothek_reads, read_dataset_as_ddf
+from kartothek.io.eager import store_dataframes_as_dataset
+from kartothek.io.iter import store_dataframes_as_dataset__iter
+from kartothek.io_components import metapartition
 from kartothek.io.testing.read import *  # noqa
 
 
@@ -75,3 +81,279 @@ def test_load_dataframe_categoricals_with_index(dataset_with_index_factory):
         label_filter=None,
         dates_as_object=False,
     )
+
+
+@pytest.mark.parametrize("target_partition_size", [1, 10 ** 9])
+def test_read_dataset_as_ddf_target_partition_size(
+    store_factory, target_partition_size
+):
+    dfs = [pd.DataFrame({"P": [i] * 3, "x": range(3)}) for i in range(4)]
+    expected = pd.concat(dfs).reset_index(drop=True)
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+
+    ddf = read_dataset_as_ddf(
+        dataset_uuid="uuid",
+        store=store_factory,
+        table="table",
+        target_partition_size=target_partition_size,
+    )
+    # Partitions larger than the target size are read on their own, everything
+    # else is packed together
+    assert ddf.npartitions == (4 if target_partition_size == 1 else 1)
+    result = ddf.compute().sort_values(["P", "x"]).reset_index(drop=True)
+    pdt.assert_frame_equal(result, expected, check_like=True)
+
+
+def test_read_dataset_as_ddf_target_partition_size_concat_raises(store_factory):
+    store_dataframes_as_dataset(
+        dfs=[pd.DataFrame({"P": [1], "x": [1]})],
+        store=store_factory,
+        dataset_uuid="uuid",
+        partition_on=["P"],
+    )
+    with pytest.raises(ValueError, match="target_partition_size"):
+        read_dataset_as_ddf(
+            dataset_uuid="uuid",
+            store=store_factory,
+            table="table",
+            target_partition_size=1,
+            concat_partitions_on_primary_index=True,
+        )
+
+
+def test_read_dataset_as_ddf_dask_index_on_partition_key(store_factory):
+    dfs = [pd.DataFrame({"P": [i % 3] * 2, "x": [i, i]}) for i in range(6)]
+    expected = pd.concat(dfs).set_index("P").sort_index()
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+
+    ddf = read_dataset_as_ddf(
+        dataset_uuid="uuid", store=store_factory, table="table", dask_index_on="P"
+    )
+    assert ddf.known_divisions
+    assert ddf.divisions == (0, 1, 2, 2)
+    result = ddf.compute()
+    pdt.assert_frame_equal(
+        result.sort_values("x").sort_index(kind="mergesort"),
+        expected.sort_values("x").sort_index(kind="mergesort"),
+    )
+
+    ddf = read_dataset_as_ddf(
+        dataset_uuid="uuid",
+        store=store_factory,
+        table="table",
+        dask_index_on="P",
+        predicates=[[("P", ">", 0)]],
+    )
+    assert ddf.divisions == (1, 2, 2)
+
+
+def test_read_dataset_as_ddf_dask_index_on_minmax_index(store_factory):
+    dfs = [
+        pd.DataFrame({"x": [5, 1]}),
+        pd.DataFrame({"x": [10, 12]}),
+        pd.DataFrame({"x": [4, 7]}),
+    ]
+    store_dataframes_as_dataset__iter(
+        dfs, store=store_factory, dataset_uuid="uuid", minmax_indices=["x"]
+    )
+
+    ddf = read_dataset_as_ddf(
+        dataset_uuid="uuid", store=store_factory, table="table", dask_index_on="x"
+    )
+    # The first and the last partition overlap and are read together
+    assert ddf.divisions == (1, 10, 12)
+    assert ddf.npartitions == 2
+    result = ddf.compute()
+    assert list(result.index) == [1, 4, 5, 7, 10, 12]
+
+
+def test_read_dataset_as_ddf_categoricals_minmax_index(store_factory):
+    store_dataframes_as_dataset__iter(
+        [pd.DataFrame({"x": [1, 2], "y": ["a", "b"]})],
+        store=store_factory,
+        dataset_uuid="uuid",
+        minmax_indices=["x"],
+    )
+
+    ddf = read_dataset_as_ddf(
+        dataset_uuid="uuid", store=store_factory, table="table", categoricals=["x", "y"]
+    )
+    result = ddf.compute()
+    assert result["x"].dtype == "category"
+    assert list(result["x"]) == [1, 2]
+
+
+def test_read_dataset_as_ddf_dask_index_on_raises(store_factory):
+    store_dataframes_as_dataset(
+        dfs=[pd.DataFrame({"x": [1]})], store=store_factory, dataset_uuid="uuid"
+    )
+    with pytest.raises(ValueError, match="Cannot dispatch by `x`"):
+        read_dataset_as_ddf(
+            dataset_uuid="uuid", store=store_factory, table="table", dask_index_on="x"
+        )
+
+
+def _optimized_reads(ddf):
+    return _collect_reads(
+        optimize_kartothek_reads(ddf.__dask_graph__(), ddf.__dask_keys__())
+    )
+
+
+def _collect_reads(dsk):
+    reads = []
+
+    def _collect(task):
+        if isinstance(task, tuple) and task and task[0] is _load_ddf_partition:
+            reads.append(task)
+        elif isinstance(task, (tuple, list)):
+            for arg in task:
+                _collect(arg)
+
+    for task in dsk.values():
+        _collect(task)
+    return reads
+
+
+@pytest.fixture()
+def pushdown_dataset(store_factory):
+    dfs = [
+        pd.DataFrame(
+            {"P": [i % 2] * 3, "x": [i, i + 1, i + 2], "s": ["a", "b", "c"], "y": 1.0}
+        )
+        for i in range(4)
+    ]
+    expected = pd.concat(dfs).reset_index(drop=True)[["P", "s", "x", "y"]]
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+    return (
+        read_dataset_as_ddf(dataset_uuid="uuid", store=store_factory, table="table"),
+        expected,
+    )
+
+
+def _compute(ddf, check_index=False):
+    with dask.config.set(dataframe_optimize=optimize_kartothek_reads):
+        result = ddf.compute()
+    expected = ddf.compute()
+    if not check_index:
+        # Filtered partitions may have a different index, as for ``predicates``
+        result = result.reset_index(drop=True)
+        expected = expected.reset_index(drop=True)
+    if isinstance(result, pd.Series):
+        pdt.assert_series_equal(result, expected)
+    else:
+        pdt.assert_frame_equal(result, expected)
+    return result
+
+
+def _assert_same_rows(result, expected):
+    result = result.sort_values(list(result.columns)).reset_index(drop=True)
+    expected = expected.sort_values(list(expected.columns)).reset_index(drop=True)
+    pdt.assert_frame_equal(result, expected)
+
+
+def test_read_dataset_as_ddf_pushdown_filter_and_columns(pushdown_dataset):
+    ddf, expected = pushdown_dataset
+    ddf = ddf[(ddf.x > 3) & (1 == ddf.P)][["x", "s"]]
+
+    reads = _optimized_reads(ddf)
+    assert len(reads) == ddf.npartitions
+    for read in reads:
+        assert read[3] == ["s", "x"]
+        assert read[5] == [("x", ">", 3), ("P", "==", 1)]
+
+    _assert_same_rows(
+        _compute(ddf), expected[(expected.x > 3) & (expected.P == 1)][["x", "s"]]
+    )
+
+
+def test_read_dataset_as_ddf_pushdown_chained_filters(pushdown_dataset):
+    ddf, expected = pushdown_dataset
+    ddf = ddf[ddf.s != "a"]
+    ddf = ddf[ddf.x <= 3]
+
+    for read in _optimized_reads(ddf):
+        assert read[5] == [("s", "!=", "a"), ("x", "<=", 3)]
+
+    _assert_same_rows(_compute(ddf), expected[(expected.s != "a") & (expected.x <= 3)])
+
+
+def test_read_dataset_as_ddf_pushdown_columns_only(pushdown_dataset):
+    ddf, expected = pushdown_dataset
+    ddf = ddf.x + ddf.y
+
+    for read in _optimized_reads(ddf):
+        assert read[3] == ["x", "y"]
+        assert read[5] is None
+
+    result = _compute(ddf)
+    assert sorted(result) == sorted(expected.x + expected.y)
+
+
+def test_read_dataset_as_ddf_no_pushdown(pushdown_dataset):
+    ddf, expected = pushdown_dataset
+    # kartothek does not compare integer columns with floats
+    filtered = ddf[ddf.x > 2.5]
+    # The whole DataFrame is computed and cannot be pruned
+    combined = ddf[ddf.x > ddf.y]
+
+    for read in _optimized_reads(filtered) + _optimized_reads(combined):
+        assert read[3] == ["P", "s", "x", "y"]
+        assert read[5] is None
+
+    _assert_same_rows(_compute(filtered), expected[expected.x > 2.5])
+    _assert_same_rows(_compute(combined), expected[expected.x > expected.y])
+
+
+def test_read_dataset_as_ddf_pushdown_is_opt_in(pushdown_dataset):
+    ddf, _ = pushdown_dataset
+    assert dask.config.get("dataframe_optimize", None) is None
+    ddf = ddf[ddf.x > 3]
+    assert all(
+        read[5] is None
+        for read in _collect_reads(
+            ddf.__dask_optimize__(ddf.__dask_graph__(), ddf.__dask_keys__())
+        )
+    )
+
+
+def test_read_dataset_as_ddf_pushdown_prunes_partitions(pushdown_dataset, monkeypatch):
+    ddf, expected = pushdown_dataset
+    ddf = ddf[ddf.P == 1]
+
+    loaded = []
+    restore_dataframe = metapartition.restore_dataframe
+
+    def _restore_dataframe(key, *args, **kwargs):
+        loaded.append(key)
+        return restore_dataframe(key, *args, **kwargs)
+
+    monkeypatch.setattr(metapartition, "restore_dataframe", _restore_dataframe)
+    with dask.config.set(dataframe_optimize=optimize_kartothek_reads):
+        result = ddf.compute(scheduler="sync")
+    # The files of the partitions with P=0 are not read
+    assert len(loaded) == 2
+    assert all("P=1" in key for key in loaded)
+    _assert_same_rows(result, expected[expected.P == 1])
+
+
+def test_read_dataset_as_ddf_pushdown_dask_index_on(store_factory):
+    dfs = [pd.DataFrame({"x": [3, 1, 2, 1], "y": [1, 2, 3, 4]})] * 2
+    store_dataframes_as_dataset__iter(
+        dfs, store=store_factory, dataset_uuid="uuid", minmax_indices=["x"]
+    )
+    ddf = read_dataset_as_ddf(
+        dataset_uuid="uuid", store=store_factory, table="table", dask_index_on="x"
+    )
+    ddf = ddf[ddf.y > 1]
+    for read in _optimized_reads(ddf):
+        assert read[5] == [("y", ">", 1)]
+    # The index is given by the data and does not change
+    result = _compute(ddf, check_index=True)
+    assert list(result.index) == [1, 1, 1, 1, 2, 2]
+    assert list(result.y) == [2, 4, 2, 4, 3, 3]
@@ -0,0 +1,169 @@
+import dask
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from kartothek.io.dask.delayed import join_datasets_as_delayed
+from kartothek.io.eager import read_table, store_dataframes_as_dataset
+from kartothek.serialization import ParquetSerializer
+
+
+@pytest.fixture
+def joined_datasets(store_factory):
+    rng = np.random.RandomState(0)
+    left = pd.DataFrame(
+        {"P": rng.randint(0, 3, 200), "k": rng.randint(0, 50, 200), "a": rng.rand(200)}
+    ).sort_values("k")
+    right = pd.DataFrame(
+        {"P": rng.randint(1, 4, 100), "k": rng.randint(0, 50, 100), "b": rng.rand(100)}
+    ).sort_values("k")
+    # Several partitions per partition key value, each with several row groups
+    store_dataframes_as_dataset(
+        dfs=[left.iloc[:100], left.iloc[100:]],
+        store=store_factory,
+        dataset_uuid="left",
+        partition_on=["P"],
+        df_serializer=ParquetSerializer(chunk_size=7),
+    )
+    store_dataframes_as_dataset(
+        dfs=[right],
+        store=store_factory,
+        dataset_uuid="right",
+        partition_on=["P"],
+        df_serializer=ParquetSerializer(chunk_size=5),
+    )
+    return left, right
+
+
+def _sorted(df):
+    columns = ["P", "k", "a", "b"]
+    return df[columns].sort_values(columns).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+def test_join_datasets(store_factory, joined_datasets, how):
+    left, right = joined_datasets
+
+    dfs = join_datasets_as_delayed(
+        "left",
+        "right",
+        store_factory,
+        on="k",
+        left_table="table",
+        right_table="table",
+        how=how,
+    )
+    dfs = dask.compute(dfs)[0]
+
+    for df in dfs:
+        assert df["k"].is_monotonic_increasing
+        assert df["P"].nunique() <= 1
+    expected = pd.merge(left, right, on=["P", "k"], how=how)
+    pdt.assert_frame_equal(
+        _sorted(pd.concat(dfs, ignore_index=True)), _sorted(expected)
+    )
+
+
+def test_join_datasets_store(store_factory, joined_datasets):
+    left, right = joined_datasets
+
+    dataset = join_datasets_as_delayed(
+        "left",
+        "right",
+        store_factory,
+        on="k",
+        left_table="table",
+        right_table="table",
+        right_columns=["k", "b"],
+        chunk_size=20,
+        output_dataset_uuid="joined",
+    )
+    dataset = dataset.compute()
+
+    assert dataset.partition_keys == ["P"]
+    result = read_table("joined", store_factory, table="table")
+    expected = pd.merge(left, right, on=["P", "k"])
+    pdt.assert_frame_equal(_sorted(result), _sorted(expected))
+
+
+def test_join_datasets_different_partition_keys(store_factory, joined_datasets):
+    store_dataframes_as_dataset(
+        dfs=[pd.DataFrame({"Q": [1], "k": [1]})],
+        store=store_factory,
+        dataset_uuid="other",
+        partition_on=["Q"],
+    )
+    with pytest.raises(ValueError, match="same partition keys"):
+        join_datasets_as_delayed(
+            "left",
+            "other",
+            store_factory,
+            on="k",
+            left_table="table",
+            right_table="table",
+        )
+
+
+@pytest.mark.parametrize("how", ["left", "right", "outer"])
+def test_join_datasets_store_unmatched_rows(store_factory, how):
+    left = pd.DataFrame(
+        {"P": [1, 1, 2, 2], "k": [1, 2, 1, 2], "a": [1, 2, 3, 4], "flag": True}
+    )
+    right = pd.DataFrame(
+        {"P": [1, 1, 2], "k": [1, 2, 3], "b": [10, 20, 30], "ok": [True, False, True]}
+    )
+    for uuid, df in [("left", left), ("right", right)]:
+        store_dataframes_as_dataset(
+            dfs=[df],
+            store=store_factory,
+            dataset_uuid=uuid,
+            partition_on=["P"],
+            df_serializer=ParquetSerializer(chunk_size=1),
+        )
+
+    dataset = join_datasets_as_delayed(
+        "left",
+        "right",
+        store_factory,
+        on="k",
+        left_table="table",
+        right_table="table",
+        how=how,
+        output_dataset_uuid="joined",
+    ).compute()
+
+    assert dataset.partition_keys == ["P"]
+    columns = ["P", "k", "a", "flag", "b", "ok"]
+    result = read_table("joined", store_factory, table="table")[columns]
+    expected = pd.merge(left, right, on=["P", "k"], how=how)[columns]
+    pdt.assert_frame_equal(
+        result.sort_values(["P", "k"]).reset_index(drop=True),
+        expected.sort_values(["P", "k"]).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_join_datasets_store_empty(store_factory):
+    for uuid, df in [
+        ("left", pd.DataFrame({"P": [1], "k": [1], "a": [1]})),
+        ("right", pd.DataFrame({"P": [2], "k": [1], "b": [1]})),
+    ]:
+        store_dataframes_as_dataset(
+            dfs=[df], store=store_factory, dataset_uuid=uuid, partition_on=["P"]
+        )
+
+    dataset = join_datasets_as_delayed(
+        "left",
+        "right",
+        store_factory,
+        on="k",
+        left_table="table",
+        right_table="table",
+        output_dataset_uuid="joined",
+    ).compute()
+
+    assert dataset.partition_keys == ["P"]
+    result = read_table("joined", store_factory, table="table")
+    assert len(result) == 0
+    assert sorted(result.columns) == ["P", "a", "b", "k"]
@@ -1,7 +1,10 @@
 import dask
+import numpy as np
+import pandas as pd
 import pytest
 
 from kartothek.io.dask.delayed import merge_datasets_as_delayed
+from kartothek.io.eager import store_dataframes_as_dataset
 from kartothek.io.testing.merge import *  # noqa
 
 
@@ -13,3 +16,65 @@ def _merge_datasets(*args, **kwargs):
 @pytest.fixture
 def bound_merge_datasets(request):
     return _merge_datasets
+
+
+def test_merge_datasets_columns_and_predicates(store_factory):
+    store_dataframes_as_dataset(
+        dfs=[
+            {"data": {"core": pd.DataFrame({"P": [1, 2, 3], "x": [1, 2, 3], "y": 0})}}
+        ],
+        store=store_factory,
+        dataset_uuid="left",
+        partition_on=["P"],
+    )
+    store_dataframes_as_dataset(
+        dfs=[
+            {
+                "data": {
+                    "helper": pd.DataFrame({"P": [1, 2, 3], "info": ["a", "b", "c"]})
+                }
+            }
+        ],
+        store=store_factory,
+        dataset_uuid="right",
+        partition_on=["P"],
+    )
+
+    mps = _merge_datasets(
+        left_dataset_uuid="left",
+        right_dataset_uuid="right",
+        store=store_factory,
+        merge_tasks=[
+            {
+                "left": "core",
+                "right": "helper",
+                "merge_kwargs": {"how": "left"},
+                "output_label": "merged",
+            }
+        ],
+        match_how=lambda left, right: left.split("/")[0] == right.split("/")[0],
+        columns={"core": ["P", "x"]},
+        categoricals={"helper": ["info"]},
+        left_predicates=[[("P", "!=", 2)]],
+        right_predicates=[[("info", "!=", "c")]],
+    )
+
+    # The partitions with P=2 are not loaded
+    assert len(mps) == 2
+    for mp in mps:
+        assert pd.api.types.is_categorical_dtype(mp.data["merged"]["info"])
+    result = pd.concat([mp.data["merged"] for mp in mps]).sort_values("P")
+    assert list(result.columns) == ["P", "x", "info"]
+    assert result["P"].tolist() == [1, 3]
+    assert result["info"].astype(object).tolist() == ["a", np.nan]
+
+
+def test_merge_datasets_with_itself_different_predicates(store_factory):
+    with pytest.raises(ValueError):
+        merge_datasets_as_delayed(
+            left_dataset_uuid="uuid",
+            right_dataset_uuid="uuid",
+            store=store_factory,
+            merge_tasks=[],
+            left_predicates=[[("P", "==", 1)]],
+        )
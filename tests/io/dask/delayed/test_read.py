@@ -1,5 +1,6 @@
 from functools import partial
 
+import dask
 import pytest
 
 from kartothek.io.dask.delayed import (
@@ -8,6 +9,7 @@ from kartothek.io.dask.delayed import (
     read_table_as_delayed,
 )
 from kartothek.io.testing.read import *  # noqa
+from kartothek.io_components.read import DispatchMetadata
 
 
 @pytest.fixture(params=["dataframe", "metapartition", "table"])
@@ -32,3 +34,19 @@ def _load_dataframes(output_type, *args, **kwargs):
 @pytest.fixture()
 def bound_load_dataframes(output_type):
     return partial(_load_dataframes, output_type)
+
+
+def test_read_dataset_as_delayed_shares_dispatch_metadata(dataset, store_session):
+    tasks = read_dataset_as_delayed_metapartitions(
+        dataset_uuid=dataset.uuid, store=lambda: store_session
+    )
+    graph = dask.delayed(tasks).__dask_graph__()
+    snapshots = [
+        value for value in graph.values() if isinstance(value, DispatchMetadata)
+    ]
+    assert len(snapshots) == 1
+    assert set(snapshots[0].table_meta) == {"core", "helper"}
+
+    mps = dask.compute(*tasks)
+    assert [mp.label for mp in mps] == ["cluster_1", "cluster_2"]
+    assert all(set(mp.table_meta) == {"core", "helper"} for mp in mps)
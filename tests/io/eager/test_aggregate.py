@@ -0,0 +1,169 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as pdt
+import pytest
+
+import kartothek.io_components.aggregate as aggregate
+from kartothek.io.eager import aggregate_table
+from kartothek.io.iter import store_dataframes_as_dataset__iter
+from kartothek.serialization import ParquetSerializer, filter_df_from_predicates
+
+AGGREGATIONS = {
+    "rows": (None, "count"),
+    "first_event": ("event_time", "min"),
+    "last_event": ("event_time", "max"),
+    "x_count": ("x", "count"),
+    "x_min": ("x", "min"),
+    "x_sum": ("x", "sum"),
+    "g_sum": ("g", "sum"),
+    "country_max": ("country", "max"),
+    "s_min": ("s", "min"),
+    "f_max": ("f", "max"),
+    "day_max": ("day", "max"),
+}
+
+
+@pytest.fixture
+def events(store_factory):
+    rng = np.random.RandomState(0)
+    n = 400
+    event_time = pd.Timestamp("2019-01-01") + pd.to_timedelta(
+        np.sort(rng.randint(0, 10 ** 6, n)), unit="s"
+    )
+    df = pd.DataFrame(
+        {
+            "country": rng.choice(["DE", "FR", "US"], n),
+            "event_time": event_time,
+            "day": event_time.date,
+            "x": rng.randint(0, 100, n).astype(float),
+            "g": np.repeat(np.arange(10), n // 10),
+            "f": rng.rand(n),
+            "s": rng.choice(["a", "b", "c"], n),
+        }
+    )
+    df.loc[::7, "x"] = np.nan
+    store_dataframes_as_dataset__iter(
+        [df.iloc[i : i + 100] for i in range(0, n, 100)],
+        store=store_factory,
+        dataset_uuid="events",
+        partition_on=["country"],
+        secondary_indices=["s"],
+        df_serializer=ParquetSerializer(chunk_size=10),
+    )
+    return df
+
+
+@pytest.fixture
+def row_group_reads(monkeypatch):
+    reads = []
+    read_row_group = aggregate._read_row_group
+
+    def _read_row_group(*args, **kwargs):
+        reads.append(args[1])
+        return read_row_group(*args, **kwargs)
+
+    monkeypatch.setattr(aggregate, "_read_row_group", _read_row_group)
+    return reads
+
+
+def _expected(df, group_by, predicates):
+    # Dates are read as timestamps unless `dates_as_object` is requested
+    df = df.assign(day=pd.to_datetime(df["day"]))
+    if predicates is not None:
+        df = filter_df_from_predicates(df, predicates)
+    grouped = df.assign(_all=0).groupby(group_by or ["_all"])
+    expected = pd.DataFrame(
+        {
+            name: grouped.size() if column is None else getattr(grouped[column], func)()
+            for name, (column, func) in AGGREGATIONS.items()
+        }
+    ).reset_index()
+    if not group_by:
+        expected = expected.drop(columns="_all")
+    return expected
+
+
+@pytest.mark.parametrize(
+    "group_by", [None, ["country"], ["g"], ["country", "s"]], ids=str
+)
+@pytest.mark.parametrize(
+    "predicates",
+    [
+        None,
+        [[("event_time", ">=", pd.Timestamp("2019-01-05"))]],
+        [[("country", "==", "DE"), ("g", "<", 4)], [("s", "==", "b")]],
+        [[("x", ">", 50.0)]],
+        [[("g", "==", 3)]],
+        [[("day", "<", datetime.date(2019, 1, 3))]],
+    ],
+    ids=str,
+)
+def test_aggregate_table(store_factory, events, group_by, predicates):
+    result = aggregate_table(
+        AGGREGATIONS,
+        "events",
+        store_factory,
+        table="table",
+        group_by=group_by,
+        predicates=predicates,
+    )
+    expected = _expected(events, group_by, predicates)
+    pdt.assert_frame_equal(result, expected[list(result.columns)], check_dtype=False)
+
+
+def test_aggregate_table_from_metadata(store_factory, events, row_group_reads):
+    aggregations = {"rows": (None, "count"), "last_event": ("event_time", "max")}
+
+    result = aggregate_table(
+        aggregations, "events", store_factory, table="table", group_by="country"
+    )
+    assert row_group_reads == []
+    expected = _expected(events, ["country"], None)
+    pdt.assert_frame_equal(result, expected[list(result.columns)], check_dtype=False)
+
+    # Only the row groups which are cut by the predicate are read, one per country
+    predicates = [[("event_time", ">=", pd.Timestamp("2019-01-05"))]]
+    result = aggregate_table(
+        aggregations,
+        "events",
+        store_factory,
+        table="table",
+        group_by="country",
+        predicates=predicates,
+    )
+    assert len(row_group_reads) == 3
+    expected = _expected(events, ["country"], predicates)
+    pdt.assert_frame_equal(result, expected[list(result.columns)], check_dtype=False)
+
+
+def test_aggregate_table_empty(store_factory, events):
+    predicates = [[("g", ">", 100)]]
+
+    result = aggregate_table(
+        AGGREGATIONS, "events", store_factory, table="table", predicates=predicates
+    )
+    assert len(result) == 1
+    assert result.loc[0, "rows"] == 0
+    assert pd.isnull(result.loc[0, "last_event"])
+
+    result = aggregate_table(
+        AGGREGATIONS,
+        "events",
+        store_factory,
+        table="table",
+        group_by=["country"],
+        predicates=predicates,
+    )
+    assert len(result) == 0
+    assert list(result.columns) == ["country"] + sorted(AGGREGATIONS)
+
+
+@pytest.mark.parametrize(
+    "aggregations",
+    [{}, {"x": ("x", "median")}, {"x": (None, "max")}, {"x": ("unknown", "max")}],
+)
+def test_aggregate_table_invalid(store_factory, events, aggregations):
+    with pytest.raises(ValueError):
+        aggregate_table(aggregations, "events", store_factory, table="table")
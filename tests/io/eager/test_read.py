@@ -1,4 +1,5 @@
 import datetime
+import logging
 
 import numpy as np
 import pandas as pd
@@ -10,8 +11,10 @@ from kartothek.io.eager import (
     read_dataset_as_dataframes,
     read_dataset_as_metapartitions,
     read_table,
+    store_dataframes_as_dataset,
 )
 from kartothek.io.testing.read import *  # noqa
+from kartothek.serialization import ParquetSerializer
 
 
 def _read_table(*args, **kwargs):
@@ -148,3 +151,151 @@ def test_read_table_simple_list_for_cols_cats(dataset, store_session):
     expected_df = expected_df.astype("category")
 
     pdt.assert_frame_equal(df, expected_df, check_dtype=False, check_like=True)
+
+
+@pytest.mark.parametrize("concat_partitions_on_primary_index", [False, True])
+def test_read_dataset_as_metapartitions_concurrency(
+    store_factory, concat_partitions_on_primary_index
+):
+    dfs = [pd.DataFrame({"P": [i % 5], "x": [i]}) for i in range(20)]
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+
+    sequential = read_dataset_as_metapartitions(
+        dataset_uuid="uuid",
+        store=store_factory,
+        concat_partitions_on_primary_index=concat_partitions_on_primary_index,
+    )
+    concurrent = read_dataset_as_metapartitions(
+        dataset_uuid="uuid",
+        store=store_factory,
+        concat_partitions_on_primary_index=concat_partitions_on_primary_index,
+        concurrency=4,
+    )
+    assert [mp.label for mp in concurrent] == [mp.label for mp in sequential]
+    for left, right in zip(concurrent, sequential):
+        pdt.assert_frame_equal(left.data["table"], right.data["table"])
+
+
+def test_read_table_concurrency(store_factory):
+    dfs = [pd.DataFrame({"P": [i % 5], "x": [i]}) for i in range(20)]
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+
+    pdt.assert_frame_equal(
+        read_table(
+            dataset_uuid="uuid", store=store_factory, table="table", concurrency=4
+        ),
+        read_table(dataset_uuid="uuid", store=store_factory, table="table"),
+    )
+
+
+@pytest.mark.parametrize("dates_as_object", [False, True])
+def test_read_table_arrow_matches_pandas(store_factory, dates_as_object):
+    dfs = [
+        pd.DataFrame(
+            {
+                "P": [1, 1, 2],
+                "L": ["b", "a", "c"],
+                "D": [datetime.date(2019, 1, day) for day in (1, 2, 3)],
+                "x": [1.0, 2.0, 3.0],
+            }
+        ),
+        # Columns which only hold nulls are stored with the null type
+        pd.DataFrame(
+            {"P": [3], "L": ["a"], "D": [datetime.date(2019, 2, 1)], "x": [None]}
+        ),
+    ]
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+    kwargs = dict(
+        dataset_uuid="uuid",
+        store=store_factory,
+        table="table",
+        categoricals=["L", "P"],
+        dates_as_object=dates_as_object,
+    )
+
+    result = read_table(**kwargs)
+    # Predicates are not supported by the Arrow path
+    expected = read_table(predicates=[[("L", "!=", "z")]], **kwargs)
+
+    assert list(result["L"].cat.categories) == ["a", "b", "c"]
+    assert list(result["P"].cat.categories) == [1, 2, 3]
+    assert list(result.columns) == list(expected.columns)
+    pdt.assert_frame_equal(
+        result.sort_values("D").reset_index(drop=True),
+        expected.sort_values("D").reset_index(drop=True),
+        check_categorical=False,
+    )
+    assert np.isnan(result.loc[result["P"] == 3, "x"]).all()
+
+
+def test_read_table_concat_partitions_on_primary_index(store_factory):
+    dfs = [pd.DataFrame({"P": [1, 2], "x": [i, i + 10]}) for i in range(3)]
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+
+    result = read_table(
+        dataset_uuid="uuid",
+        store=store_factory,
+        table="table",
+        concat_partitions_on_primary_index=True,
+    )
+
+    # The partitions of a primary index value are concatenated into one block
+    assert result["P"].tolist() in ([1, 1, 1, 2, 2, 2], [2, 2, 2, 1, 1, 1])
+    assert sorted(result["x"]) == [0, 1, 2, 10, 11, 12]
+
+
+def test_read_table_categories_from_partition_keys(store_factory):
+    dfs = [pd.DataFrame({"P": [p], "L": ["x"], "x": [p]}) for p in [3, 1, 2]]
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P", "L"]
+    )
+
+    for predicates in [None, [[("x", "==", 2)]]]:
+        df = read_table(
+            dataset_uuid="uuid",
+            store=store_factory,
+            table="table",
+            categoricals=["P"],
+            label_filter=lambda label: "P=2" in label,
+            predicates=predicates,
+        )
+        assert df["P"].tolist() == [2]
+        # The categories of the dataset are used, not only those of the partitions read
+        assert list(df["P"].cat.categories) == [1, 2, 3]
+
+
+def test_read_table_arrow_fallback_on_differing_schemas(store_factory, caplog):
+    dfs = [
+        pd.DataFrame({"P": [1], "x": np.array([1], dtype=np.int8)}),
+        pd.DataFrame({"P": [2], "x": np.array([2], dtype=np.int64)}),
+    ]
+    store_dataframes_as_dataset(
+        dfs=dfs, store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+
+    with caplog.at_level(logging.INFO, logger="kartothek.io.eager"):
+        result = read_table(dataset_uuid="uuid", store=store_factory, table="table")
+
+    assert "falling back" in caplog.text
+    assert sorted(result["x"]) == [1, 2]
+
+
+def test_read_table_arrow_does_not_swallow_errors(store_factory, monkeypatch):
+    store_dataframes_as_dataset(
+        dfs=[pd.DataFrame({"x": [1]})], store=store_factory, dataset_uuid="uuid"
+    )
+
+    def _raise(*args, **kwargs):
+        raise ValueError("broken")
+
+    monkeypatch.setattr(ParquetSerializer, "restore_table", _raise)
+    with pytest.raises(ValueError, match="broken"):
+        read_table(dataset_uuid="uuid", store=store_factory, table="table")
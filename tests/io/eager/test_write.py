@@ -113,6 +113,24 @@ def test_create_dataset_header(store, metadata_storage_format, frozen_time):
     read_schema_metadata(dataset_uuid=new_dataset.uuid, store=store, table="table")
 
 
+def test_create_dataset_header_manifest(store, frozen_time):
+    table_meta = {"table": make_meta(pd.DataFrame({"col": [1]}), origin="1")}
+    new_dataset = create_empty_dataset_header(
+        store=store,
+        table_meta=table_meta,
+        dataset_uuid="new_dataset_uuid",
+        metadata_storage_format="manifest",
+        metadata_version=4,
+    )
+
+    loaded = DatasetMetadata.load_from_store(store=store, uuid="new_dataset_uuid")
+    assert loaded == new_dataset
+    assert loaded.metadata_version == 4
+    assert loaded.partitions == {}
+
+    read_schema_metadata(dataset_uuid=new_dataset.uuid, store=store, table="table")
+
+
 def test_store_dataframes_as_dataset_no_pipeline_partition_on(store):
     df = pd.DataFrame(
         {"P": np.arange(0, 10), "L": np.arange(0, 10), "TARGET": np.arange(10, 20)}
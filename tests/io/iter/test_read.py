@@ -24,9 +24,14 @@ def _load_dataframes(output_type, *args, **kwargs):
     return list(func(*args, **kwargs))
 
 
+@pytest.fixture(params=[0, 2])
+def prefetch(request):
+    return request.param
+
+
 @pytest.fixture()
-def bound_load_dataframes(output_type):
-    return partial(_load_dataframes, output_type)
+def bound_load_dataframes(output_type, prefetch):
+    return partial(_load_dataframes, output_type, prefetch=prefetch)
 
 
 def _load_metapartitions(*args, **kwargs):
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from kartothek.io_components.aggregate import PartialAggregates, aggregates_to_dataframe
+
+AGGREGATIONS = [
+    ("rows", None, "count"),
+    ("x_min", "x", "min"),
+    ("x_max", "x", "max"),
+    ("x_sum", "x", "sum"),
+]
+
+
+def _partial(groups):
+    partial = PartialAggregates([func for _, _, func in AGGREGATIONS])
+    for group, values in groups.items():
+        partial.add_group(group)
+        for position, value in enumerate(values):
+            partial.add(group, position, value)
+    return partial
+
+
+def test_partial_aggregates_update():
+    left = _partial({("a",): [2, 1, 5, 6], ("b",): [1, np.nan, np.nan, 0]})
+    right = _partial({("b",): [3, 4, 7, 18], ("c",): [1, None, None, 0]})
+
+    result = aggregates_to_dataframe(left.update(right), AGGREGATIONS, ["g"])
+
+    expected = pd.DataFrame(
+        {
+            "g": ["a", "b", "c"],
+            "rows": [2, 4, 1],
+            "x_min": [1, 4, np.nan],
+            "x_max": [5, 7, np.nan],
+            "x_sum": [6, 18, 0],
+        }
+    )
+    pdt.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_aggregates_to_dataframe_without_groups():
+    partial = PartialAggregates([func for _, _, func in AGGREGATIONS])
+
+    result = aggregates_to_dataframe(partial, AGGREGATIONS)
+
+    expected = pd.DataFrame(
+        {"rows": [0], "x_min": [np.nan], "x_max": [np.nan], "x_sum": [0]}
+    )
+    pdt.assert_frame_equal(result, expected, check_dtype=False)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+from functools import partial
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+from storefact import get_store_from_url
+
+from kartothek.io.eager import read_table, store_dataframes_as_dataset
+from kartothek.io_components.cache import (
+    CacheInfo,
+    DataFrameCache,
+    _cache_key,
+    get_dataframe_cache,
+    invalidate_dataframes,
+    set_dataframe_cache,
+)
+from kartothek.io_components.gc import delete_files
+
+
+@pytest.fixture
+def dataframe_cache():
+    cache = DataFrameCache(max_bytes=10 ** 6)
+    previous = set_dataframe_cache(cache)
+    yield cache
+    set_dataframe_cache(previous)
+
+
+def test_dataframe_cache_lru():
+    df = pd.DataFrame({"x": range(10)}, index=pd.RangeIndex(10))
+    size = df.memory_usage(index=True, deep=True).sum()
+    cache = DataFrameCache(max_bytes=2 * size)
+
+    cache.put(("store", "a"), df)
+    cache.put(("store", "b"), df)
+    pdt.assert_frame_equal(cache.get(("store", "a")), df)
+    # `b` is the least recently used entry
+    cache.put(("store", "c"), df)
+    assert cache.get(("store", "b")) is None
+    assert cache.get(("store", "a")) is not None
+    assert cache.get(("store", "c")) is not None
+    assert cache.cache_info() == CacheInfo(
+        hits=3, misses=1, size=2 * size, max_bytes=2 * size
+    )
+
+    # DataFrames exceeding the budget are not cached
+    cache.put(("store", "large"), pd.concat([df] * 3))
+    assert cache.get(("store", "large")) is None
+
+    cache.clear()
+    assert cache.get(("store", "a")) is None
+
+
+def test_dataframe_cache_invalidate():
+    df = pd.DataFrame({"x": [1, 2]})
+    cache = DataFrameCache(max_bytes=10 ** 6)
+    cache.put(("store", "a", ("x",)), df)
+    cache.put(("store", "a", None), df)
+    cache.put(("store", "b", None), df)
+    cache.put(("other", "a", None), df)
+
+    cache.invalidate(("store", "a"))
+    assert cache.get(("store", "a", ("x",))) is None
+    assert cache.get(("store", "a", None)) is None
+    assert cache.get(("store", "b", None)) is not None
+    assert cache.get(("other", "a", None)) is not None
+    size = df.memory_usage(index=True, deep=True).sum()
+    assert cache.cache_info().size == 2 * size
+
+
+def test_dataframe_cache_returns_copies():
+    df = pd.DataFrame({"x": [1, 2]})
+    cache = DataFrameCache(max_bytes=10 ** 6)
+    cache.put(("store", "a"), df)
+    df["x"] = 0
+    cached = cache.get(("store", "a"))
+    cached["x"] = 5
+    pdt.assert_frame_equal(cache.get(("store", "a")), pd.DataFrame({"x": [1, 2]}))
+
+
+def test_cache_key_normalizes_predicates():
+    key = _cache_key(
+        "store",
+        "part.parquet",
+        ["x", "y"],
+        None,
+        [[("x", ">", 1), ("y", "in", [1, 2])], [("x", "==", 0)]],
+        False,
+    )
+    assert key == _cache_key(
+        "store",
+        "part.parquet",
+        ("x", "y"),
+        None,
+        [[("x", "==", 0)], [("y", "in", [1, 2]), ("x", ">", 1)]],
+        False,
+    )
+    assert key != _cache_key(
+        "store", "part.parquet", ["x", "y"], None, [[("x", "==", 0)]], False
+    )
+    assert key != _cache_key(
+        "other",
+        "part.parquet",
+        ["x", "y"],
+        None,
+        [[("x", ">", 1), ("y", "in", [1, 2])], [("x", "==", 0)]],
+        False,
+    )
+
+
+def test_read_table_with_dataframe_cache(store_factory, dataframe_cache):
+    df = pd.DataFrame({"P": [1, 1, 2], "x": [1, 2, 3]})
+    store_dataframes_as_dataset(
+        dfs=[df], store=store_factory, dataset_uuid="uuid", partition_on=["P"]
+    )
+    assert get_dataframe_cache() is dataframe_cache
+
+    first = read_table(dataset_uuid="uuid", store=store_factory, table="table")
+    assert dataframe_cache.cache_info().hits == 0
+    first["x"] = 0
+
+    second = read_table(dataset_uuid="uuid", store=store_factory, table="table")
+    assert dataframe_cache.cache_info().hits == 2
+    pdt.assert_frame_equal(
+        second.sort_values("x").reset_index(drop=True), df, check_like=True
+    )
+
+    # Other columns are separate entries
+    read_table(dataset_uuid="uuid", store=store_factory, table="table", columns=["x"])
+    assert dataframe_cache.cache_info().hits == 2
+
+
+def test_dataframe_cache_separates_stores(tmpdir, dataframe_cache):
+    # Both datasets use the same uuid and labels, i.e. the same storage keys
+    first_store = partial(get_store_from_url, "hfs://{}".format(tmpdir.join("a")))
+    second_store = partial(get_store_from_url, "hfs://{}".format(tmpdir.join("b")))
+    for store, value in [(first_store, 1), (second_store, 2)]:
+        store_dataframes_as_dataset(
+            dfs=[
+                {
+                    "label": "cluster_1",
+                    "data": [("table", pd.DataFrame({"x": [value]}))],
+                }
+            ],
+            store=store,
+            dataset_uuid="uuid",
+        )
+
+    for store, value in [(first_store, 1), (second_store, 2), (first_store, 1)]:
+        df = read_table(dataset_uuid="uuid", store=store, table="table")
+        assert df["x"].tolist() == [value]
+    assert dataframe_cache.cache_info().hits == 1
+
+
+def test_dataframe_cache_invalidated_on_overwrite(store_factory, dataframe_cache):
+    def _store(value):
+        store_dataframes_as_dataset(
+            dfs=[
+                {
+                    "label": "cluster_1",
+                    "data": [("table", pd.DataFrame({"x": [value]}))],
+                }
+            ],
+            store=store_factory,
+            dataset_uuid="uuid",
+            overwrite=True,
+        )
+
+    _store(1)
+    assert read_table(dataset_uuid="uuid", store=store_factory, table="table")[
+        "x"
+    ].tolist() == [1]
+    _store(2)
+    assert read_table(dataset_uuid="uuid", store=store_factory, table="table")[
+        "x"
+    ].tolist() == [2]
+    assert dataframe_cache.cache_info().hits == 0
+
+
+def test_dataframe_cache_invalidated_on_delete(store_factory, dataframe_cache):
+    store_dataframes_as_dataset(
+        dfs=[pd.DataFrame({"x": [1]})], store=store_factory, dataset_uuid="uuid"
+    )
+    read_table(dataset_uuid="uuid", store=store_factory, table="table")
+    keys = [key for key in store_factory().keys() if key.endswith(".parquet")]
+    assert dataframe_cache.cache_info().size > 0
+
+    delete_files(keys, store_factory)
+    assert dataframe_cache.cache_info().size == 0
+
+    # Deleting files which are not cached is a no-op
+    invalidate_dataframes(store_factory(), keys)
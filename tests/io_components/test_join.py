@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from kartothek.io_components.join import merge_sorted_chunks, sort_merge_join
+
+
+def _chunks(df, sizes):
+    chunks = []
+    start = 0
+    for size in sizes:
+        chunks.append(df.iloc[start : start + size].reset_index(drop=True))
+        start += size
+    chunks.append(df.iloc[start:].reset_index(drop=True))
+    return chunks
+
+
+@pytest.fixture
+def left():
+    rng = np.random.RandomState(42)
+    return pd.DataFrame({"k": np.sort(rng.randint(0, 30, 100)), "a": np.arange(100)})
+
+
+@pytest.fixture
+def right():
+    rng = np.random.RandomState(7)
+    return pd.DataFrame({"k": np.sort(rng.randint(10, 40, 50)), "b": np.arange(50)})
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+@pytest.mark.parametrize(
+    "left_sizes, right_sizes", [([], []), ([7] * 14, [3] * 16), ([1, 0, 60], [49])]
+)
+def test_sort_merge_join(left, right, how, left_sizes, right_sizes):
+    result = list(
+        sort_merge_join(
+            _chunks(left, left_sizes),
+            _chunks(right, right_sizes),
+            on="k",
+            left_empty_df=left.iloc[:0],
+            right_empty_df=right.iloc[:0],
+            how=how,
+        )
+    )
+    result = pd.concat(result, ignore_index=True)
+    assert result["k"].is_monotonic_increasing
+
+    expected = pd.merge(left, right, on="k", how=how)[list(result.columns)]
+    columns = ["k", "a", "b"]
+    pdt.assert_frame_equal(
+        result.sort_values(columns).reset_index(drop=True),
+        expected.sort_values(columns).reset_index(drop=True),
+    )
+
+
+def test_sort_merge_join_empty(left, right):
+    result = list(
+        sort_merge_join(
+            [left.iloc[:0]],
+            [right],
+            on="k",
+            left_empty_df=left.iloc[:0],
+            right_empty_df=right.iloc[:0],
+        )
+    )
+    assert len(result) == 1
+    assert len(result[0]) == 0
+    assert list(result[0].columns) == ["k", "a", "b"]
+
+
+def test_sort_merge_join_unsorted(left, right):
+    with pytest.raises(ValueError, match="sorted"):
+        list(
+            sort_merge_join(
+                [left.iloc[::-1]],
+                [right],
+                on="k",
+                left_empty_df=left.iloc[:0],
+                right_empty_df=right.iloc[:0],
+            )
+        )
+
+
+def test_merge_sorted_chunks(left):
+    streams = [
+        _chunks(left.iloc[::2].reset_index(drop=True), [5] * 5),
+        _chunks(left.iloc[1::2].reset_index(drop=True), [20]),
+    ]
+
+    chunks = list(merge_sorted_chunks(streams, "k", left.iloc[:0]))
+
+    result = pd.concat(chunks, ignore_index=True)
+    assert len(chunks) > 1
+    assert result["k"].is_monotonic_increasing
+    pdt.assert_frame_equal(
+        result.sort_values(["k", "a"]).reset_index(drop=True),
+        left.sort_values(["k", "a"]).reset_index(drop=True),
+    )
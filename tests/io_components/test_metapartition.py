@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 
+import pickle
 import string
 from collections import OrderedDict
 from datetime import date, datetime
@@ -629,6 +630,19 @@ def test_copy():
     assert new_mp.dataset_metadata == {"new": "metadata"}
 
 
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(protocol):
+    mp = MetaPartition(
+        label="label_1",
+        files={"core": "file"},
+        data={"core": pd.DataFrame({"test": [1, 2, 3]})},
+        dataset_metadata={"dataset": "metadata"},
+        partition_keys=["P"],
+    )
+    assert not hasattr(mp, "__dict__")
+    assert pickle.loads(pickle.dumps(mp, protocol=protocol)) == mp
+
+
 def test_nested_copy():
     mp = MetaPartition(
         label="label_1",
@@ -237,3 +237,56 @@ def test_merge_metapartitions():
 
     assert merged_mp.label == "cluster_1"
     assert len(merged_mp.data) == 3
+
+
+def _store_labels(labels, dataset_uuid, store):
+    store_dataset_from_partitions(
+        partition_list=[
+            MetaPartition(label=label, metadata_version=4) for label in labels
+        ],
+        dataset_uuid=dataset_uuid,
+        store=store,
+    )
+
+
+def test_align_datasets_prefix__similar_labels(store):
+    _store_labels(["cluster_1", "cluster_10"], "left", store)
+    _store_labels(
+        ["cluster_1_a", "cluster_10_b", "cluster_10_a", "cluster_1_b"], "right", store
+    )
+
+    aligned = [
+        [mp.label for mp in mp_list]
+        for mp_list in align_datasets(
+            left_dataset_uuid="left",
+            right_dataset_uuid="right",
+            store=store,
+            match_how="prefix",
+        )
+    ]
+    # cluster_10 is matched first and its partitions are not available to cluster_1
+    assert aligned == [
+        ["cluster_10", "cluster_10_b", "cluster_10_a"],
+        ["cluster_1", "cluster_1_a", "cluster_1_b"],
+    ]
+
+
+def test_align_datasets_exact__lookup(store):
+    _store_labels(["a", "b", "c"], "left", store)
+    _store_labels(["c", "a", "b"], "right", store)
+
+    aligned = [
+        [mp.label for mp in mp_list]
+        for mp_list in align_datasets(
+            left_dataset_uuid="left", right_dataset_uuid="right", store=store
+        )
+    ]
+    assert sorted(aligned) == [["a", "a"], ["b", "b"], ["c", "c"]]
+
+    _store_labels(["a", "d"], "missing", store)
+    with pytest.raises(RuntimeError, match="No matching partition"):
+        list(
+            align_datasets(
+                left_dataset_uuid="left", right_dataset_uuid="missing", store=store
+            )
+        )
@@ -1,10 +1,24 @@
+import io
+import pickle
 import types
 from collections import OrderedDict
 
+import pandas as pd
+import pyarrow as pa
 import pytest
 
 from kartothek.io_components.metapartition import MetaPartition
-from kartothek.io_components.read import dispatch_metapartitions
+from kartothek.core.factory import DatasetFactory
+from kartothek.core.index import PartitionIndex
+from kartothek.io_components.read import (
+    DispatchMetadata,
+    _get_file_size,
+    _group_labels_by_partition_keys,
+    _pack_metapartitions,
+    dispatch_metapartitions,
+    dispatch_metapartitions_from_factory,
+)
+from kartothek.io_components.write import store_dataset_from_partitions
 
 
 def test_dispatch_metapartitions(dataset, store_session):
@@ -59,6 +73,25 @@ def test_dispatch_metapartitions_without_dataset_metadata(dataset, store_session
     assert mp.dataset_metadata == {}
 
 
+def test_dispatch_metapartitions_without_dispatch_metadata(dataset, store_session):
+    factory = DatasetFactory(dataset.uuid, lambda: store_session)
+    mps = list(dispatch_metapartitions_from_factory(factory, dispatch_metadata=False))
+    assert [mp.label for mp in mps] == ["cluster_1", "cluster_2"]
+    for mp in mps:
+        assert mp.table_meta == {}
+        assert mp.dataset_metadata == {}
+        assert mp.files
+
+    dispatch_metadata = pickle.loads(
+        pickle.dumps(DispatchMetadata.from_factory(factory))
+    )
+    with pytest.raises(AttributeError):
+        dispatch_metadata.table_meta = {}
+    expected = list(dispatch_metapartitions_from_factory(factory))
+    assert dispatch_metadata.attach(mps) == expected
+    assert dispatch_metadata.attach(mps[0]) == expected[0]
+
+
 @pytest.mark.parametrize("predicates", [[], [[]]])
 def test_dispatch_metapartition_undefined_behaviour(dataset, store_session, predicates):
     with pytest.raises(ValueError) as exc:
@@ -109,3 +142,126 @@ def test_dispatch_metapartitions_query_no_effect(
     )
     partitions = list(generator)
     assert len(partitions) == 2
+
+
+@pytest.mark.parametrize(
+    "predicates, expected",
+    [
+        ([[("TS", ">=", pd.Timestamp("2019-01-03"))]], ["cluster_2"]),
+        ([[("TS", "==", pd.Timestamp("2019-01-02"))]], ["cluster_1"]),
+        ([[("TS", "<", pd.Timestamp("2018-01-01"))]], []),
+        ([[("TS", ">", pd.Timestamp("2019-01-02")), ("P", "==", 4)]], ["cluster_2"]),
+    ],
+)
+def test_dispatch_metapartitions_query_minmax_index(store, predicates, expected):
+    mps = []
+    for label, values in [
+        ("cluster_1", ["2019-01-01", "2019-01-02"]),
+        ("cluster_2", ["2019-01-03", "2019-01-04"]),
+    ]:
+        mp = MetaPartition(
+            label=label,
+            data={"core": pd.DataFrame({"P": [1, 4], "TS": pd.to_datetime(values)})},
+            metadata_version=4,
+        )
+        mp = mp.build_indices(columns=["P"], minmax_columns=["TS"])
+        mps.append(mp.store_dataframes(store=store, dataset_uuid="uuid"))
+    store_dataset_from_partitions(mps, store=store, dataset_uuid="uuid")
+
+    partitions = list(dispatch_metapartitions("uuid", store, predicates=predicates))
+    assert sorted(mp.label for mp in partitions) == expected
+
+
+@pytest.mark.parametrize(
+    "predicates, expected",
+    [
+        ([[("country", "==", "DE"), ("product", "==", 42)]], ["cluster_1"]),
+        ([[("country", "==", "FR"), ("product", "==", 43)]], ["cluster_2"]),
+        ([[("country", "==", "FR"), ("product", "==", 40)]], []),
+        (
+            [
+                [("country", "==", "DE"), ("product", "==", 42)],
+                [("country", "==", "FR"), ("product", "==", 42)],
+            ],
+            ["cluster_1", "cluster_3"],
+        ),
+        # a single column is not covered by the composite index
+        ([[("country", "==", "FR")]], ["cluster_1", "cluster_2", "cluster_3"]),
+    ],
+)
+def test_dispatch_metapartitions_query_composite_index(store, predicates, expected):
+    mps = []
+    for label, country, product in [
+        ("cluster_1", ["DE", "DE"], [42, 43]),
+        ("cluster_2", ["DE", "FR"], [43, 43]),
+        ("cluster_3", ["FR", "DE"], [42, 40]),
+    ]:
+        mp = MetaPartition(
+            label=label,
+            data={"core": pd.DataFrame({"country": country, "product": product})},
+            metadata_version=4,
+        )
+        mp = mp.build_indices(columns=[("country", "product")])
+        mps.append(mp.store_dataframes(store=store, dataset_uuid="uuid"))
+    dataset = store_dataset_from_partitions(mps, store=store, dataset_uuid="uuid")
+    assert list(dataset.secondary_indices.keys()) == ["country&product"]
+
+    partitions = list(dispatch_metapartitions("uuid", store, predicates=predicates))
+    assert sorted(mp.label for mp in partitions) == expected
+
+
+def test_group_labels_by_partition_keys():
+    indices = {
+        "P": PartitionIndex(
+            "P", {2: ["P=2/L=a/x", "P=2/L=b/y"], 1: ["P=1/L=a/z"]}, dtype=pa.int64()
+        ),
+        "L": PartitionIndex(
+            "L",
+            {"b": ["P=2/L=b/y"], "a": ["P=1/L=a/z", "P=2/L=a/x", "P=3/L=a/w"]},
+            dtype=pa.string(),
+        ),
+    }
+    assert _group_labels_by_partition_keys(["P", "L"], indices) == [
+        ["P=1/L=a/z"],
+        ["P=2/L=a/x"],
+        ["P=2/L=b/y"],
+    ]
+    assert _group_labels_by_partition_keys(["L"], indices) == [
+        ["P=1/L=a/z", "P=2/L=a/x", "P=3/L=a/w"],
+        ["P=2/L=b/y"],
+    ]
+    assert _group_labels_by_partition_keys(
+        ["P", "L"], indices, allowed_labels={"P=2/L=a/x", "P=2/L=b/y"}
+    ) == [["P=2/L=a/x"], ["P=2/L=b/y"]]
+
+
+@pytest.mark.parametrize(
+    "sizes, expected",
+    [
+        ([1, 1, 1, 1], [["a", "b", "c", "d"]]),
+        ([3, 2, 2, 4], [["a"], ["b", "c"], ["d"]]),
+        ([10, 1, 10, 1], [["a"], ["b"], ["c"], ["d"]]),
+        ([1, None, 1, 1], [["a"], ["b"], ["c", "d"]]),
+    ],
+)
+def test_pack_metapartitions(sizes, expected):
+    packs = _pack_metapartitions(["a", "b", "c", "d"], sizes, target_size=4)
+    assert packs == expected
+
+
+def test_get_file_size(store):
+    store.put("a/b.parquet", b"12345")
+    assert _get_file_size(store, "a/b.parquet") == 5
+
+    class _Reader(object):
+        def seek(self, offset, whence=0):
+            raise io.UnsupportedOperation("seek")
+
+        def close(self):
+            pass
+
+    class _Store(object):
+        def open(self, key):
+            return _Reader()
+
+    assert _get_file_size(_Store(), "a/b.parquet") is None
@@ -160,6 +160,46 @@ def test_align_categories():
         pdt.assert_series_equal(out_dfs[2][col_name], expected_3)
 
 
+def test_align_categories_remaps_codes():
+    df1 = pd.DataFrame({"col": pd.Categorical(["b", None, "a"]), "x": [1, 2, 3]})
+    df2 = pd.DataFrame({"col": pd.Categorical(["c", "b"], categories=["c", "b"])})
+    df3 = pd.DataFrame({"col": ["d", None]})
+
+    out_dfs = align_categories([df1, df2, df3], categoricals=["col"])
+
+    expected_categories = ["a", "b", "c", "d"]
+    for out_df, values in zip(out_dfs, [["b", None, "a"], ["c", "b"], ["d", None]]):
+        pdt.assert_series_equal(
+            out_df["col"],
+            pd.Series(
+                pd.Categorical(values, categories=expected_categories), name="col"
+            ),
+        )
+    # The input is not modified and aligned frames are not copied
+    assert list(df2["col"].cat.categories) == ["c", "b"]
+    assert df3["col"].dtype == object
+    assert align_categories(out_dfs, categoricals=["col"])[0] is out_dfs[0]
+
+
+def test_align_categories_known_categories():
+    df1 = pd.DataFrame({"col": pd.Categorical(["a", "c"])})
+    df2 = pd.DataFrame({"col": pd.Categorical(["e"])})
+
+    out_dfs = align_categories(
+        [df1, df2], categoricals=["col"], categories={"col": ["c", "b", "a"]}
+    )
+    assert list(out_dfs[0]["col"]) == ["a", "c"]
+    assert list(out_dfs[1]["col"]) == ["e"]
+    for out_df in out_dfs:
+        assert list(out_df["col"].cat.categories) == ["c", "b", "a", "e"]
+
+    # Known categories of a different type are ignored
+    out_dfs = align_categories(
+        [df1, df2], categoricals=["col"], categories={"col": [1]}
+    )
+    assert list(out_dfs[0]["col"].cat.categories) == ["a", "c", "e"]
+
+
 def test_sort_cateogrical():
     values = ["f", "a", "b", "z", "e"]
     categories = ["e", "z", "b", "a", "f"]